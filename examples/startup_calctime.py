@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+# Obergrenze für die Importzeit des Pakets samt Konfiguration und Dichteberechnung in s
+time_limit: float = 1.0
+
+nProcesses = 5  # Anzahl an Prozessen zur Mittelung der Rechenzeit
+
+# Wird in einem neuen Prozess ausgeführt, damit bereits geladene Module die Messung nicht verfälschen
+script: str = """
+import time
+start = time.perf_counter()
+import sys
+import latticegeometrylib
+from latticegeometrylib.Miscellaneous import Size, vertices
+from latticegeometrylib.CellConfiguration import CellConfiguration
+config = CellConfiguration( vertices( Size( 10., 10., 10. ) ) )
+config.insert( [ [ 1, 7, { 'diameter': 1. } ], [ 4, 8, { 'diameter': 1. } ],
+                 [ 3, 5, { 'diameter': 1. } ], [ 2, 6, { 'diameter': 1. } ] ] )
+config.relative_density()
+elapsed = time.perf_counter() - start
+loaded = [ name for name in ( 'cadquery', 'OCP' ) if name in sys.modules ]
+print( elapsed, ','.join( loaded ) )
+"""
+
+times: list[ float ] = []
+
+for i in range( nProcesses ):
+    output = subprocess.run( [ sys.executable, "-c", script ], capture_output = True, text = True, check = True )
+    elapsed, loaded = ( output.stdout.strip().split( " " ) + [ "" ] )[ :2 ]
+
+    if loaded:
+        raise SystemExit( f"Beim Import wurden B-Rep-Bibliotheken geladen: { loaded }" )
+
+    times.append( float( elapsed ) )
+
+average: float = sum( times ) / len( times )
+print( f"Mittlere Zeit für Import, Konfiguration und Dichteberechnung: { average:.3f} s" )
+
+if average > time_limit:
+    raise SystemExit( f"Die Importzeit überschreitet die Obergrenze von { time_limit } s." )
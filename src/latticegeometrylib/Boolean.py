@@ -0,0 +1,263 @@
+from typing import Callable
+import numpy as np
+from cadquery import Shape, Compound, Workplane, Plane, Vector
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Common, BRepAlgoAPI_Fuse
+from OCP.BRepCheck import BRepCheck_Analyzer
+from OCP.TopTools import TopTools_ListOfShape
+
+FUZZY: tuple[ float, ... ] = ( 1e-5, 1e-4, 1e-3 )
+
+
+def valid( shape: Shape ) -> bool:
+    """
+    Prüft die Topologie und Geometrie eines Körpers mit BRepCheck
+
+    :param shape: Körper
+    :return: True, wenn der Körper gültig ist
+    """
+    return BRepCheck_Analyzer( shape.wrapped ).IsValid()
+
+
+def _boolean( builder: BRepAlgoAPI_Common | BRepAlgoAPI_Fuse, arguments: list[ Shape ], tools: list[ Shape ],
+              fuzzy: float = 0., check: bool = True ) -> Shape | None:
+    """
+    Führt eine boolesche Operation aus und prüft deren Ergebnis
+
+    :param builder: Operation
+    :param arguments: Argumente der Operation
+    :param tools: Werkzeuge der Operation
+    :param fuzzy: unscharfe Toleranz der Operation, bei 0 exakt
+    :param check: steuert, ob das Ergebnis mit BRepCheck geprüft wird
+    :return: Ergebnis oder None, wenn die Operation fehlschlägt oder ein ungültiges Ergebnis liefert
+    """
+    first, second = TopTools_ListOfShape(), TopTools_ListOfShape()
+    for shape in arguments:
+        first.Append( shape.wrapped )
+    for shape in tools:
+        second.Append( shape.wrapped )
+
+    builder.SetArguments( first )
+    builder.SetTools( second )
+    builder.SetRunParallel( True )
+    if fuzzy > 0.:
+        builder.SetFuzzyValue( fuzzy )
+
+    try:
+        builder.Build()
+        if not builder.IsDone():
+            return None
+        result = Shape.cast( builder.Shape() )
+    except Exception:
+        return None
+    if result.isNull():
+        return None
+    return result if not check or valid( result ) else None
+
+
+def _merge( first: Shape, second: Shape, fuzzy: tuple[ float, ... ], check: bool ) -> Shape | None:
+    """
+    Vereinigt zwei Körper, bei Fehlschlag mit steigender unscharfer Toleranz
+
+    :param first: erster Körper
+    :param second: zweiter Körper
+    :param fuzzy: aufsteigende unscharfe Toleranzen der Wiederholungen
+    :param check: steuert, ob das Ergebnis mit BRepCheck geprüft wird
+    :return: Ergebnis oder None, wenn alle Versuche fehlschlagen
+    """
+    for tolerance in ( 0., ) + tuple( fuzzy ):
+        fused = _boolean( BRepAlgoAPI_Fuse(), [ first ], [ second ], tolerance, check )
+        if fused is not None:
+            return fused
+    return None
+
+
+def _isolate( count: int, attempt: Callable[ [ list[ int ], float, bool ], bool ], chunk: int | None,
+              fuzzy: tuple[ float, ... ], fallback: bool ) -> dict:
+    """
+    Verarbeitet Körper blockweise. Schlägt ein Block fehl, wird dieser halbiert, bis einzelne Körper übrig bleiben.
+    Diese werden mit steigender unscharfer Toleranz und zuletzt mit ihrem Ersatzkörper wiederholt.
+
+    :param count: Anzahl der Körper
+    :param attempt: Versuch der Operation für die Indizes eines Blocks mit gegebener Toleranz, auf Wunsch mit dem
+                    Ersatzkörper. Gibt an, ob der Versuch gelungen ist.
+    :param chunk: Anzahl der Körper je Block, standardmäßig alle in einem Block
+    :param fuzzy: aufsteigende unscharfe Toleranzen der Wiederholungen
+    :param fallback: steuert, ob Ersatzkörper versucht werden
+    :return: Bericht mit der Anzahl der Blöcke unter chunks und der geteilten Blöcke unter split, den Indizes der mit
+             Toleranz gelungenen Körper unter fuzzy mit deren Toleranzen unter tolerances, der mit Ersatzkörper
+             gelungenen unter fallback sowie der fehlgeschlagenen unter failed
+    """
+    size = count if chunk is None else max( int( chunk ), 1 )
+    pending = [ list( range( start, min( start + size, count ) ) ) for start in range( 0, count, max( size, 1 ) ) ]
+    report: dict = { "chunks": len( pending ), "split": 0, "fuzzy": [], "tolerances": [], "fallback": [],
+                     "failed": [] }
+
+    pending.reverse()
+    while pending:
+        batch = pending.pop()
+        if attempt( batch, 0., False ):
+            continue
+        if len( batch ) > 1:
+            report[ "split" ] += 1
+            pending += [ batch[ len( batch ) // 2: ], batch[ : len( batch ) // 2 ] ]
+            continue
+
+        tolerance = next( ( value for value in fuzzy if attempt( batch, value, False ) ), None )
+        if tolerance is not None:
+            report[ "fuzzy" ].append( batch[ 0 ] )
+            report[ "tolerances" ].append( tolerance )
+        elif fallback and any( attempt( batch, value, True ) for value in ( 0., ) + tuple( fuzzy ) ):
+            report[ "fallback" ].append( batch[ 0 ] )
+        else:
+            report[ "failed" ].append( batch[ 0 ] )
+
+    for key in ( "fuzzy", "fallback", "failed" ):
+        report[ key ] = np.array( report[ key ], dtype = np.int64 )
+    report[ "tolerances" ] = np.array( report[ "tolerances" ], dtype = float )
+    return report
+
+
+def _tools( pieces: list[ Shape ], batch: list[ int ], substitute: bool,
+            fallback: Callable[ [ int ], Shape | None ] | None, substitutes: dict[ int, Shape | None ] ) -> list[ Shape ]:
+    """
+    Werkzeuge eines Versuchs, entweder die Körper des Blocks oder der einmalig erzeugte Ersatzkörper
+
+    :param pieces: Körper
+    :param batch: Indizes des Blocks
+    :param substitute: steuert, ob der Ersatzkörper verwendet wird
+    :param fallback: Ersatzkörper je Index
+    :param substitutes: bereits erzeugte Ersatzkörper
+    :return: Werkzeuge, leer, wenn es keinen Ersatzkörper gibt
+    """
+    if not substitute:
+        return [ pieces[ index ] for index in batch ]
+    if batch[ 0 ] not in substitutes:
+        substitutes[ batch[ 0 ] ] = fallback( batch[ 0 ] )
+    return [] if substitutes[ batch[ 0 ] ] is None else [ substitutes[ batch[ 0 ] ] ]
+
+
+def intersect( solid: Shape, pieces: list[ Shape ], chunk: int | None = None, fuzzy: tuple[ float, ... ] = FUZZY,
+               fallback: Callable[ [ int ], Shape | None ] | None = None ) -> tuple[ list[ Shape ], dict ]:
+    """
+    Verschneidet Körper blockweise mit einem Körper. Jedes Teilergebnis wird mit BRepCheck geprüft, sodass ein
+    fehlerhafter Körper nicht die gesamte Operation verwirft. Fehlgeschlagene Körper fehlen im Ergebnis. Ist der
+    Körper bereits ungültig, entfällt die Prüfung, da diese sonst jeden Block bis auf einzelne Körper teilt.
+
+    :param solid: Körper, mit dem verschnitten wird, etwa die Eingangsgeometrie
+    :param pieces: zu verschneidende Körper, etwa die Zellen des Gitters
+    :param chunk: Anzahl der Körper je Block, standardmäßig alle in einem Block
+    :param fuzzy: aufsteigende unscharfe Toleranzen der Wiederholungen einzelner Körper
+    :param fallback: Ersatzkörper je Index, etwa aus vieleckigen Streben, oder None, wenn es keinen gibt
+    :return: Körper des Ergebnisses und Bericht, siehe _isolate
+    """
+    results: list[ Shape ] = []
+    substitutes: dict[ int, Shape | None ] = {}
+    check = valid( solid )
+
+    def _attempt( batch: list[ int ], tolerance: float, substitute: bool ) -> bool:
+        """
+        Verschneidet einen Block und übernimmt dessen Körper bei Erfolg
+        """
+        tools = _tools( pieces, batch, substitute, fallback, substitutes )
+        if not tools:
+            return False
+        result = _boolean( BRepAlgoAPI_Common(), [ solid ], tools, tolerance, check )
+        if result is None:
+            return False
+        results.extend( result.Solids() )
+        return True
+
+    report = _isolate( len( pieces ), _attempt, chunk, fuzzy, fallback is not None )
+    return results, report
+
+
+def fuse( base: Shape, pieces: list[ Shape ], chunk: int | None = None, fuzzy: tuple[ float, ... ] = FUZZY,
+          fallback: Callable[ [ int ], Shape | None ] | None = None ) -> tuple[ Shape, dict ]:
+    """
+    Vereinigt Körper blockweise mit einem Körper. Die Körper jedes Blocks werden zunächst untereinander vereinigt
+    und jedes Teilergebnis mit BRepCheck geprüft. Die Teilergebnisse werden paarweise in einem Baum vereinigt und
+    erst zuletzt mit dem Körper, sodass dieser nicht mit jedem Block erneut verarbeitet wird. Fehlgeschlagene Körper
+    und Teilergebnisse, welche sich auch mit unscharfer Toleranz nicht vereinigen lassen, werden dem Ergebnis
+    unverändert als eigene Körper hinzugefügt. Ist der Körper bereits ungültig, entfällt die Prüfung.
+
+    :param base: Körper, mit dem vereinigt wird, etwa die Schale
+    :param pieces: zu vereinigende Körper, etwa das zurechtgeschnittene Gitter
+    :param chunk: Anzahl der Körper je Block, standardmäßig alle in einem Block
+    :param fuzzy: aufsteigende unscharfe Toleranzen der Wiederholungen einzelner Körper
+    :param fallback: Ersatzkörper je Index, etwa aus vieleckigen Streben, oder None, wenn es keinen gibt
+    :return: Ergebnis und Bericht, siehe _isolate, zusätzlich mit der Anzahl der nicht vereinigten Teilergebnisse
+             unter unmerged
+    """
+    partials: list[ Shape ] = []
+    substitutes: dict[ int, Shape | None ] = {}
+    check = valid( base )
+
+    def _attempt( batch: list[ int ], tolerance: float, substitute: bool ) -> bool:
+        """
+        Vereinigt die Körper eines Blocks untereinander und übernimmt das Teilergebnis bei Erfolg
+        """
+        tools = _tools( pieces, batch, substitute, fallback, substitutes )
+        if not tools:
+            return False
+        if len( tools ) == 1:
+            fused = tools[ 0 ] if not check or valid( tools[ 0 ] ) else None
+        else:
+            fused = _boolean( BRepAlgoAPI_Fuse(), tools[ :1 ], tools[ 1: ], tolerance, check )
+        if fused is None:
+            return False
+        partials.append( fused )
+        return True
+
+    report = _isolate( len( pieces ), _attempt, chunk, fuzzy, fallback is not None )
+
+    # Paarweise Vereinigung benachbarter Teilergebnisse, zuletzt mit dem Körper
+    detached: list[ Shape ] = []
+    while len( partials ) > 1:
+        merged: list[ Shape ] = []
+        for first, second in zip( partials[ 0::2 ], partials[ 1::2 ] ):
+            fused = _merge( first, second, fuzzy, check )
+            merged.append( first if fused is None else fused )
+            if fused is None:
+                detached.append( second )
+        partials = merged + partials[ len( merged ) * 2: ]
+
+    result = base
+    if partials:
+        fused = _merge( base, partials[ 0 ], fuzzy, check )
+        if fused is None:
+            detached.append( partials[ 0 ] )
+        else:
+            result = fused
+
+    report[ "unmerged" ] = len( detached )
+    separate = detached + [ pieces[ index ] for index in report[ "failed" ] ]
+    if separate:
+        return Compound.makeCompound( [ result ] + separate ), report
+    return result, report
+
+
+def polygonal_struts( starts: np.ndarray, ends: np.ndarray, radii: np.ndarray, sides: int = 8 ) -> Shape | None:
+    """
+    Erzeugt Streben als Prismen mit regelmäßigem Vieleck als Querschnitt statt als Zylinder. Die ebenen Mantelflächen
+    sind robuster in booleschen Operationen. Der Umkreis des Vielecks ist so gewählt, dass dessen Fläche der des
+    Kreises entspricht. Die Prismen werden vereinigt, da sich überschneidende Körper in einem Verbund als Werkzeug
+    einer booleschen Operation kein gültiges Ergebnis liefern.
+
+    :param starts: Startpunkte der Streben, Form (n, 3)
+    :param ends: Endpunkte der Streben, Form (n, 3)
+    :param radii: Radien der Streben, Form (n,)
+    :param sides: Anzahl der Seitenflächen
+    :return: vereinigte Streben oder None, wenn keine Strebe eine Länge hat
+    """
+    scale = np.sqrt( 2. * np.pi / ( sides * np.sin( 2. * np.pi / sides ) ) )
+    prisms: list[ Shape ] = []
+    for start, end, radius in zip( np.asarray( starts ).tolist(), np.asarray( ends ).tolist(),
+                                   np.asarray( radii ).tolist() ):
+        axis = Vector( *end ) - Vector( *start )
+        if axis.Length <= 0.:
+            continue
+        plane = Plane( Vector( *start ), normal = axis )
+        prisms.append( Workplane( plane ).polygon( sides, 2. * radius * scale ).extrude( axis.Length ).val() )
+    if not prisms:
+        return None
+    return prisms[ 0 ].fuse( *prisms[ 1: ] ) if len( prisms ) > 1 else prisms[ 0 ]
@@ -1,7 +1,13 @@
-from cadquery import Vector
-from typing import Any, Iterator
+from typing import Any, Iterator, TYPE_CHECKING
 from ast import literal_eval
 from copy import deepcopy
+import numpy as np
+from . import Graph
+from . import Homogenization
+StrutGraph = Graph.StrutGraph
+
+if TYPE_CHECKING:
+    from cadquery import Vector
 
 class Entity:
     """
@@ -21,9 +27,9 @@ class Entity:
             self.input = deepcopy( info )
 
         self.attributes: dict = deepcopy( info[ -1 ] )
-        self.geometry: list[ Vector ] = []
+        self.geometry: list[ "Vector" ] = []
 
-    def create( self, vertices: dict[ int, Vector ], variables: dict = {} ) -> Any:
+    def create( self, vertices: dict[ int, "Vector" ], variables: dict = {} ) -> Any:
         """
         Berechnung der Koordinaten aller Knoten des Features aus Topologie
 
@@ -48,12 +54,12 @@ class Entity:
 
             return 0.5, 0.5
 
-        def _point( config: tuple | int ) -> Vector:
+        def _point( config: tuple | int ) -> "Vector":
             """
             Berechnung der Koordinaten eines Punktes aus Topologieinformationen und Relationen zwischen zweier Punkte
 
             :param config: Index eines Eckknoten oder Tupel mit zwei Punkten und Relationen
-            :return: ein Punkt als CADQuery Vector
+            :return: ein Punkt als CADQuery Vector oder NumPy-Feld, je nach Typ der Eckknoten
             """
             if type( config ) is int:
                 return vertices[ config ]
@@ -272,6 +278,72 @@ class CellConfiguration:
             return True
         return False
 
+    def relative_density( self, exact: bool = False, tolerance: float = 1e-6 ) -> float:
+        """
+        Relative Dichte der Elementarzelle. Ohne Erstellung der Geometrie wird diese aus dem Volumen der Streben,
+        Knoten und Flächen genähert. Entitäten auf den Begrenzungsflächen der Zelle werden anteilig entsprechend der
+        Anzahl angrenzender Zellen berücksichtigt, Überschneidungen werden vernachlässigt. Verrundungen lassen sich
+        nicht abschätzen, mit diesen oder auf Wunsch wird das Volumen des Körpers der Elementarzelle bestimmt.
+
+        :param exact: steuert, ob die relative Dichte aus dem Körper der Elementarzelle berechnet wird
+        :param tolerance: Abstand, unterhalb dessen eine Entität als in der Begrenzungsfläche liegend gilt
+        :return: relative Dichte der Elementarzelle
+        """
+        if not self.initialized:
+            raise ValueError( "CellConfiguration wurde noch nicht initialisiert" )
+
+        corners = np.array( [ Graph._coordinates( self.vertices[ index ] ) for index in ( 1, 7 ) ] )
+        size = corners[ 1 ] - corners[ 0 ]
+
+        if exact or any( entity.dimension() == -1 for entity in self.entities ):
+            # CADQuery wird erst hier geladen, damit die Näherung ohne B-Rep-Bibliotheken auskommt
+            from . import Miscellaneous
+            from . import UnitaryCell
+            cell = UnitaryCell.UnitaryCell( Miscellaneous.Size( *size ) )
+            config = CellConfiguration( cell.vertices )
+            config.variables = deepcopy( self.variables )
+            for entity in self.entities:
+                config.append( deepcopy( entity.input ) )
+            cell.create( config )
+            return float( sum( solid.Volume() for solid in cell.geometry.solids().vals() ) / np.prod( size ) )
+
+        density = StrutGraph.from_configuration( self ).relative_density( size, tolerance )
+
+        nodes = [ entity for entity in self.entities if entity.dimension() == 0 ]
+        if nodes:
+            points = np.array( [ [ Graph._coordinates( entity.geometry[ 0 ] ) ] for entity in nodes ] )
+            diameters = np.array( [ entity.get( "diameter" ) for entity in nodes ], dtype = float )
+            share = Graph._shares( points, size, tolerance )
+            density += float( np.sum( share * np.pi / 6. * diameters ** 3 ) / np.prod( size ) )
+
+        for entity in self.entities:
+            if entity.dimension() != 2:
+                continue
+            points = np.array( [ Graph._coordinates( p ) for p in entity.geometry ] )
+            area = np.linalg.norm( np.sum( np.cross( points, np.roll( points, -1, axis = 0 ) ), axis = 0 ) ) / 2.
+            share = Graph._shares( points[ None ], size, tolerance )[ 0 ]
+            density += float( share * area * entity.get( "thickness" ) / np.prod( size ) )
+
+        return density
+
+    def elasticity_tensor( self, youngs_modulus: float = 1., poisson_ratio: float = 0.3,
+                           theory: str = "euler" ) -> np.ndarray:
+        """
+        Homogenisierter Elastizitätstensor der Elementarzelle ohne Erstellung der Geometrie. Die Streben werden als
+        periodisches Rahmentragwerk aus Balken mit Kreisquerschnitt berechnet.
+
+        :param youngs_modulus: Elastizitätsmodul des Werkstoffs
+        :param poisson_ratio: Querkontraktionszahl des Werkstoffs
+        :param theory: Balkentheorie, euler für Euler-Bernoulli oder timoshenko mit Schubverformung
+        :return: Elastizitätstensor in Voigt-Notation, Form (6, 6)
+        """
+        if not self.initialized:
+            raise ValueError( "CellConfiguration wurde noch nicht initialisiert" )
+
+        corners = np.array( [ Graph._coordinates( self.vertices[ index ] ) for index in ( 1, 7 ) ] )
+        return Homogenization.elasticity_tensor( StrutGraph.from_configuration( self ), corners[ 1 ] - corners[ 0 ],
+                                                 youngs_modulus, poisson_ratio, theory )
+
     def __len__( self ):
         """
         Gibt die Menge an Entitäten aus
@@ -0,0 +1,464 @@
+from io import BytesIO
+from ast import literal_eval
+from contextlib import ExitStack
+from typing import Any, TYPE_CHECKING
+import json
+import os
+import struct
+import zipfile
+import numpy as np
+
+if TYPE_CHECKING:
+    from .Generator import LatticeGenerator
+
+STAGES: tuple[ str, ... ] = ( "model", "shell", "cell", "lattice", "intersected", "unified" )
+
+
+def _archives( filepath: str ) -> dict[ str, str ]:
+    """
+    Gibt das Archiv je vollständig gespeicherter Stufe aus. Angehängte Stufen liegen jeweils in einem eigenen Archiv
+    neben dem Hauptarchiv, dessen Pfad um die Bezeichnung der Stufe erweitert ist. Eine Stufe gilt als vollständig,
+    sobald ihr Beschreibungseintrag vorhanden ist, welcher als letzter Eintrag der Stufe geschrieben wird.
+
+    :param filepath: Pfad zum Hauptarchiv
+    :return: Pfad des Archivs je gespeicherter Stufe in der Reihenfolge der Erzeugung
+    """
+    result: dict[ str, str ] = {}
+    if not os.path.exists( filepath ):
+        return result
+
+    for stage in STAGES:
+        for path in ( filepath, f"{ filepath }.{ stage }" ):
+            if not os.path.exists( path ):
+                continue
+            with zipfile.ZipFile( path, mode = 'r' ) as archive:
+                if f"stages/{ stage }.json" in archive.namelist():
+                    result[ stage ] = path
+                    break
+    return result
+
+
+def stages( filepath: str ) -> list[ str ]:
+    """
+    Gibt die vollständig gespeicherten Stufen eines Archivs und der angehängten Archive aus
+
+    :param filepath: Pfad zum Archiv
+    :return: gespeicherte Stufen in der Reihenfolge der Erzeugung
+    """
+    return list( _archives( filepath ) )
+
+
+def digest( filepath: str ) -> str | None:
+    """
+    Gibt die Prüfsumme der Auftragsbeschreibung aus, mit welcher das Archiv erstellt wurde
+
+    :param filepath: Pfad zum Archiv
+    :return: Prüfsumme oder None, wenn das Archiv kein Eingangsmodell oder keine Prüfsumme enthält
+    """
+    paths = _archives( filepath )
+    if "model" not in paths:
+        return None
+    with zipfile.ZipFile( paths[ "model" ], mode = 'r' ) as archive:
+        return json.loads( archive.read( "stages/model.json" ) ).get( "digest" )
+
+
+def _write_array( archive: zipfile.ZipFile, name: str, array: np.ndarray ) -> None:
+    """
+    Schreibt ein Feld im NPY-Format unkomprimiert in das Archiv
+
+    :param archive: geöffnetes Archiv
+    :param name: Name des Eintrags
+    :param array: Feld
+    """
+    with archive.open( name, mode = 'w', force_zip64 = True ) as member:
+        np.lib.format.write_array( member, np.asanyarray( array ), allow_pickle = False )
+
+
+def _read_array( archive: zipfile.ZipFile, filepath: str, name: str, mmap: bool = True ) -> np.ndarray:
+    """
+    Liest ein Feld aus dem Archiv. Da die Einträge unkomprimiert abgelegt sind, wird das Feld direkt aus der
+    Archivdatei in den Speicher abgebildet, statt es zu kopieren.
+
+    :param archive: geöffnetes Archiv
+    :param filepath: Pfad zum Archiv
+    :param name: Name des Eintrags
+    :param mmap: steuert, ob das Feld in den Speicher abgebildet wird
+    :return: Feld, nur lesbar, wenn es abgebildet wurde
+    """
+    info = archive.getinfo( name )
+
+    if mmap and info.compress_type == zipfile.ZIP_STORED:
+        with open( filepath, mode = 'rb' ) as file:
+            file.seek( info.header_offset + 26 )
+            name_length, extra_length = struct.unpack( "<HH", file.read( 4 ) )
+            file.seek( info.header_offset + 30 + name_length + extra_length )
+            version = np.lib.format.read_magic( file )
+            header = np.lib.format.read_array_header_1_0 if version == ( 1, 0 ) \
+                else np.lib.format.read_array_header_2_0
+            shape, fortran, dtype = header( file )
+            offset = file.tell()
+
+        if len( shape ) > 0 and np.prod( shape ) > 0 and not dtype.hasobject:
+            return np.memmap( filepath, dtype = dtype, mode = 'r', offset = offset, shape = shape,
+                              order = 'F' if fortran else 'C' )
+
+    return np.lib.format.read_array( BytesIO( archive.read( name ) ), allow_pickle = False )
+
+
+def _write_shape( archive: zipfile.ZipFile, name: str, model: Any ) -> None:
+    """
+    Schreibt die Geometrie einer Workplane als binäre BREP-Datei in das Archiv
+
+    :param archive: geöffnetes Archiv
+    :param name: Name des Eintrags
+    :param model: Geometrie als CADQuery Workplane
+    """
+    from cadquery import Compound
+
+    shapes = model.vals()
+    shape = shapes[ 0 ] if len( shapes ) == 1 else Compound.makeCompound( shapes )
+    stream = BytesIO()
+    shape.exportBin( stream )
+    archive.writestr( name, stream.getvalue() )
+
+
+def _read_shape( archive: zipfile.ZipFile, name: str ) -> Any:
+    """
+    Liest eine binäre BREP-Datei aus dem Archiv
+
+    :param archive: geöffnetes Archiv
+    :param name: Name des Eintrags
+    :return: Geometrie als CADQuery Workplane
+    """
+    from cadquery import Workplane, Shape
+
+    return Workplane( obj = Shape.importBin( BytesIO( archive.read( name ) ) ) )
+
+
+def _lattice_info( lattice: Any ) -> dict:
+    """
+    :param lattice: Gitter
+    :return: Zellgröße, Periodizität und Räume des Gitters
+    """
+    return { "cell_size": list( lattice.cell_size.toTuple() ),
+             "periodicity": list( lattice.periodicity.toTuple() ),
+             "space": [ list( lattice.space.min() ), list( lattice.space.max() ) ],
+             "adjusted_space": [ list( lattice.adjusted_space.min() ), list( lattice.adjusted_space.max() ) ] }
+
+
+def _restore_lattice( lattice: Any, info: dict ) -> None:
+    """
+    Übernimmt Zellgröße, Periodizität und Räume in ein Gitter und belegt alle Zellen
+
+    :param lattice: Gitter
+    :param info: Beschreibung, siehe _lattice_info
+    """
+    from .Generator import Size, Periodicity
+
+    lattice.cell_size = Size( *info[ "cell_size" ] )
+    lattice.periodicity = Periodicity( *info[ "periodicity" ] )
+    for box, ( lower, upper ) in ( ( lattice.space, info[ "space" ] ),
+                                   ( lattice.adjusted_space, info[ "adjusted_space" ] ) ):
+        box.xmin, box.ymin, box.zmin = lower
+        box.xmax, box.ymax, box.zmax = upper
+        box.xlen, box.ylen, box.zlen = ( u - l for l, u in zip( lower, upper ) )
+    lattice.cells = np.indices( lattice.periodicity.toTuple(), dtype = np.int32 ).reshape( 3, -1 ).T
+
+
+def _write_regions( archive: zipfile.ZipFile, regions: list ) -> None:
+    """
+    Schreibt die Bereiche eines hybriden Gitters mit Konfiguration, Gitter und Beschreibung in das Archiv.
+    Auswahlfunktionen werden als Maske über die Zellen des Bereichsgitters abgelegt.
+
+    :param archive: geöffnetes Archiv
+    :param regions: Bereiche
+    """
+    from .Mesh import TriangleMesh
+
+    entries = []
+    for index, region in enumerate( regions ):
+        prefix = f"arrays/regions/{ index }"
+        entry = { "name": region.name, "tolerance": region.tolerance, "offset": region.offset,
+                  "variables": region.config.variables, "entities": [ entity.input for entity in region.config ],
+                  "box": None if region.box is None else region.box.tolist(), "solid": None,
+                  "selection": region.predicate is not None, "lattice": _lattice_info( region.lattice ) }
+
+        if isinstance( region.solid, TriangleMesh ):
+            entry[ "solid" ] = "mesh"
+            _write_array( archive, f"{ prefix }/vertices.npy", region.solid.vertices )
+            _write_array( archive, f"{ prefix }/triangles.npy", region.solid.triangles )
+        elif region.solid is not None:
+            entry[ "solid" ] = "brep"
+            _write_shape( archive, f"regions/{ index }.brep", region.solid )
+
+        if region.predicate is not None:
+            shape = region.lattice.periodicity.toTuple()
+            cells = np.indices( shape ).reshape( 3, -1 ).T
+            _write_array( archive, f"{ prefix }/selection.npy",
+                          np.asarray( region.predicate( cells ), dtype = bool ).reshape( shape ) )
+
+        for key in ( "cells", "interior", "transition" ):
+            _write_array( archive, f"{ prefix }/{ key }.npy",
+                          region.lattice.cells if key == "cells" else getattr( region, key ) )
+        entries.append( entry )
+
+    archive.writestr( "regions.txt", repr( entries ) )
+
+
+def _read_regions( archive: zipfile.ZipFile, filepath: str, mmap: bool ) -> list:
+    """
+    Liest die Bereiche eines hybriden Gitters aus dem Archiv
+
+    :param archive: geöffnetes Archiv
+    :param filepath: Pfad zum Archiv
+    :param mmap: steuert, ob Felder in den Speicher abgebildet werden
+    :return: Bereiche
+    """
+    from .Hybrid import Region, _Selection
+    from .Miscellaneous import BoundingBox
+    from .Mesh import TriangleMesh
+
+    regions = []
+    for index, entry in enumerate( literal_eval( archive.read( "regions.txt" ).decode() ) ):
+        prefix = f"arrays/regions/{ index }"
+        info = entry[ "lattice" ]
+        solid = None
+        if entry[ "solid" ] == "mesh":
+            solid = TriangleMesh( _read_array( archive, filepath, f"{ prefix }/vertices.npy", mmap ),
+                                  _read_array( archive, filepath, f"{ prefix }/triangles.npy", mmap ) )
+        elif entry[ "solid" ] == "brep":
+            solid = _read_shape( archive, f"regions/{ index }.brep" )
+        selection = _Selection( _read_array( archive, filepath, f"{ prefix }/selection.npy", False ) ) \
+            if entry[ "selection" ] else None
+
+        region = Region( entry[ "name" ], BoundingBox.from_bounds( *info[ "space" ] ), tuple( info[ "cell_size" ] ),
+                         ( True, True, True ), solid, entry[ "box" ], selection, entry[ "tolerance" ] )
+        _restore_lattice( region.lattice, info )
+        region.lattice.cells = _read_array( archive, filepath, f"{ prefix }/cells.npy", mmap )
+        region.interior = _read_array( archive, filepath, f"{ prefix }/interior.npy", mmap )
+        region.transition = _read_array( archive, filepath, f"{ prefix }/transition.npy", mmap )
+        region.offset = entry[ "offset" ]
+        region.config.variables = dict( entry[ "variables" ] )
+        for entity in entry[ "entities" ]:
+            region.config.append( entity )
+        regions.append( region )
+    return regions
+
+
+def _write_stage( archive: zipfile.ZipFile, generator: "LatticeGenerator", stage: str ) -> None:
+    """
+    Schreibt alle Einträge einer Stufe in das Archiv. Der Beschreibungseintrag der Stufe wird zuletzt geschrieben.
+
+    :param archive: geöffnetes Archiv
+    :param generator: Generator
+    :param stage: Stufe
+    """
+    info: dict = {}
+
+    if stage == "model":
+        info = { "solid": generator.geometry.has_solid_geometry, "mesh": generator.geometry.mesh is not None,
+                 "digest": generator.digest }
+        if generator.geometry.has_solid_geometry:
+            _write_shape( archive, "stages/model.brep", generator.output( "model" ) )
+        if generator.geometry.mesh is not None:
+            _write_array( archive, "arrays/model/vertices.npy", generator.geometry.mesh.vertices )
+            _write_array( archive, "arrays/model/triangles.npy", generator.geometry.mesh.triangles )
+
+    elif stage == "shell":
+        _write_shape( archive, "stages/shell.brep", generator.output( "shell" ) )
+
+    elif stage == "cell":
+        lattice = generator.lattice
+        _write_shape( archive, "stages/cell.brep", generator.output( "cell" ) )
+        archive.writestr( "config.txt", repr( {
+            "variables": generator.config.variables,
+            "entities": [ entity.input for entity in generator.config ] } ) )
+        info = dict( _lattice_info( lattice ), rotation = lattice.rotation.tolist() )
+
+    elif stage == "lattice":
+        lattice = generator.lattice
+        info = { "cell_size": list( lattice.cell_size.toTuple() ), "regions": len( generator.regions ) }
+        if lattice.space is not None:
+            info[ "space" ] = [ list( lattice.space.min() ), list( lattice.space.max() ) ]
+            info[ "adjusted_space" ] = [ list( lattice.adjusted_space.min() ), list( lattice.adjusted_space.max() ) ]
+        if generator.regions:
+            _write_regions( archive, generator.regions )
+        _write_shape( archive, "stages/lattice.brep", generator.output( "lattice" ) )
+        _write_array( archive, "arrays/lattice/cells.npy", generator.lattice.cells )
+        for key, array in generator.lattice.graph.arrays().items():
+            _write_array( archive, f"arrays/lattice/graph/{ key }.npy", array )
+        info[ "index" ] = generator.lattice.index is not None
+        if generator.lattice.index is not None:
+            for key, array in generator.lattice.index.arrays().items():
+                _write_array( archive, f"arrays/lattice/index/{ key }.npy", array )
+
+    elif stage == "intersected":
+        _write_shape( archive, "stages/intersected.brep", generator.output( "intersected" ) )
+        info = { "graph": generator.geometry.lattice_graph is not None }
+        if generator.geometry.lattice_graph is not None:
+            for key, array in generator.geometry.lattice_graph.arrays().items():
+                _write_array( archive, f"arrays/intersected/graph/{ key }.npy", array )
+
+    elif stage == "unified":
+        _write_shape( archive, "stages/unified.brep", generator.output( "unified" ) )
+
+    archive.writestr( f"stages/{ stage }.json", json.dumps( info ) )
+
+
+def _write( generator: "LatticeGenerator", filepath: str, names: list[ str ] ) -> None:
+    """
+    Schreibt die gegebenen Stufen in ein neues Archiv. Dieses wird zunächst als temporäre Datei geschrieben und
+    anschließend ersetzt, sodass ein Abbruch während des Speicherns den letzten Stand nicht beschädigt.
+
+    :param generator: Generator
+    :param filepath: Pfad zum Archiv
+    :param names: Stufen
+    """
+    temporary = f"{ filepath }.{ os.getpid() }.tmp"
+    with zipfile.ZipFile( temporary, mode = 'w', compression = zipfile.ZIP_STORED, allowZip64 = True ) as archive:
+        for name in names:
+            _write_stage( archive, generator, name )
+    os.replace( temporary, filepath )
+
+
+def save( generator: "LatticeGenerator", filepath: str, stage: str | None = None ) -> None:
+    """
+    Speichert den Zustand eines Generators in einem unkomprimierten ZIP-Archiv. Jede Stufe wird als binäre
+    BREP-Datei abgelegt, die Konfiguration der Elementarzelle als Text und die Felder des Gitters samt räumlichem
+    Index, sofern dieser erstellt wurde, im NPY-Format. Ist eine Stufe angegeben und enthält das Archiv bereits alle
+    vorhergehenden Stufen, werden nur die fehlenden Stufen jeweils in ein eigenes Archiv neben dem Hauptarchiv
+    geschrieben, ohne die gespeicherten Stufen zu kopieren. Andernfalls wird das Hauptarchiv neu geschrieben und
+    angehängte Archive werden entfernt.
+
+    :param generator: Generator
+    :param filepath: Pfad zum Archiv
+    :param stage: zuletzt abgeschlossene Stufe, standardmäßig werden alle vorhandenen Stufen neu geschrieben
+    """
+    available = generator.stages()
+    stored = stages( filepath ) if stage is not None else []
+
+    if stage in stored or any( name not in available for name in stored ):
+        stored = []
+
+    if stored:
+        for name in available:
+            if name not in stored:
+                _write( generator, f"{ filepath }.{ name }", [ name ] )
+        return
+
+    _write( generator, filepath, available )
+    for name in STAGES:
+        if os.path.exists( f"{ filepath }.{ name }" ):
+            os.remove( f"{ filepath }.{ name }" )
+
+
+def load( filepath: str, generator: "LatticeGenerator | None" = None, mmap: bool = True ) -> "LatticeGenerator":
+    """
+    Stellt den Zustand eines Generators aus einem Archiv für alle vollständig gespeicherten Stufen wieder her. Jede
+    Stufe wird für sich wiederhergestellt, sodass auch Gitter ohne Elementarzelle, wie stochastische oder hybride
+    Gitter, erhalten bleiben. Die Felder der Graphen werden, sofern möglich, direkt aus dem Archiv in den Speicher
+    abgebildet. Abgebildete Archive können, etwa unter Windows, erst nach Freigabe der Felder ersetzt werden.
+
+    :param filepath: Pfad zum Archiv
+    :param generator: Generator, in welchen geladen wird, standardmäßig ein neuer
+    :param mmap: steuert, ob Felder in den Speicher abgebildet werden
+    :return: Generator
+    """
+    from .Generator import LatticeGenerator, Geometry, Lattice, Size
+    from .Miscellaneous import BoundingBox
+    from .Graph import StrutGraph
+    from .Mesh import TriangleMesh
+    from .SpatialIndex import SpatialIndex
+
+    generator = LatticeGenerator() if generator is None else generator
+    paths = _archives( filepath )
+
+    if "model" not in paths:
+        raise ValueError( f"Das Archiv { filepath } enthält kein Eingangsmodell." )
+
+    with ExitStack() as stack:
+        archives = { path: stack.enter_context( zipfile.ZipFile( path, mode = 'r' ) ) for path in set( paths.values() ) }
+
+        def _array( stage: str, name: str ) -> np.ndarray:
+            """
+            Liest ein Feld aus dem Archiv der Stufe
+            """
+            return _read_array( archives[ paths[ stage ] ], paths[ stage ], name, mmap )
+
+        def _shape( stage: str ) -> Any:
+            """
+            Liest die Geometrie der Stufe
+            """
+            return _read_shape( archives[ paths[ stage ] ], f"stages/{ stage }.brep" )
+
+        def _info( stage: str ) -> dict:
+            """
+            Liest den Beschreibungseintrag der Stufe
+            """
+            return json.loads( archives[ paths[ stage ] ].read( f"stages/{ stage }.json" ) )
+
+        def _graph( stage: str, prefix: str ) -> StrutGraph:
+            """
+            Liest einen Graphen aus den Feldern unter dem gegebenen Präfix
+            """
+            return StrutGraph.from_arrays( { key: _array( stage, f"{ prefix }/{ key }.npy" )
+                                             for key in ( "nodes", "struts", "diameters", "cells", "trimmed",
+                                                          "complete" ) } )
+
+        info = _info( "model" )
+        generator.digest = info.get( "digest" )
+        generator.geometry = Geometry(
+            _shape( "model" ) if info.get( "solid", True ) else None,
+            TriangleMesh( _array( "model", "arrays/model/vertices.npy" ),
+                          _array( "model", "arrays/model/triangles.npy" ) ) if info.get( "mesh", False ) else None )
+
+        if "shell" in paths:
+            generator.geometry.shell( shell_geometry = _shape( "shell" ) )
+
+        if "cell" in paths:
+            info = _info( "cell" )
+            config = literal_eval( archives[ paths[ "cell" ] ].read( "config.txt" ).decode() )
+
+            generator.init_unitary_cell( tuple( info[ "cell_size" ] ), ( True, True, True ), info.get( "rotation" ) )
+            _restore_lattice( generator.lattice, info )
+
+            generator.config.variables = dict( config[ "variables" ] )
+            for entity in config[ "entities" ]:
+                generator.config.append( entity )
+
+            generator.cell.geometry = _shape( "cell" )
+            generator.cell.config = generator.config
+            generator.cell.has_cell = True
+
+        if "lattice" in paths:
+            info = _info( "lattice" )
+            lattice = generator.lattice if "cell" in paths else Lattice()
+            if "cell" not in paths:
+                lattice.cell_size = Size( *info[ "cell_size" ] )
+                if "space" in info:
+                    lattice.space = BoundingBox.from_bounds( *info[ "space" ] )
+                    lattice.adjusted_space = BoundingBox.from_bounds( *info[ "adjusted_space" ] )
+            if info.get( "regions", 0 ) > 0:
+                generator.regions = _read_regions( archives[ paths[ "lattice" ] ], paths[ "lattice" ], mmap )
+            lattice.geometry = _shape( "lattice" )
+            lattice.cells = _array( "lattice", "arrays/lattice/cells.npy" )
+            lattice.graph = _graph( "lattice", "arrays/lattice/graph" )
+            # der Index wird fortgeschrieben und daher stets kopiert
+            lattice.index = SpatialIndex.from_arrays( {
+                key: np.array( _array( "lattice", f"arrays/lattice/index/{ key }.npy" ) )
+                for key in ( "spacing", "starts", "ends", "radii", "cells", "alive", "keys", "items" ) } ) \
+                if info.get( "index", False ) else None
+            lattice.has_grid = True
+            generator.lattice = lattice
+
+        if "intersected" in paths:
+            generator.geometry.lattice_geometry = _shape( "intersected" )
+            generator.geometry.lattice_graph = _graph( "intersected", "arrays/intersected/graph" ) \
+                if _info( "intersected" )[ "graph" ] else None
+            generator.geometry.has_lattice_geometry = True
+
+        if "unified" in paths:
+            generator.geometry.union_geometry = _shape( "unified" )
+            generator.geometry.has_union_geometry = True
+
+    return generator
@@ -0,0 +1,153 @@
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+_CACHE = None
+
+
+def load( filepath: str ) -> list[ dict ]:
+    """
+    Liest eine Auftragsdatei im JSON- oder TOML-Format ein. Eine Datei enthält entweder einen einzelnen Auftrag oder
+    eine Liste von Aufträgen unter dem Eintrag jobs. Einträge außerhalb von jobs gelten als gemeinsame Vorgaben aller
+    Aufträge der Datei.
+
+    :param filepath: Pfad zur Auftragsdatei
+    :return: Aufträge der Datei
+    """
+    if filepath.lower().endswith( ".toml" ):
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+        with open( filepath, mode = 'rb' ) as file:
+            content = tomllib.load( file )
+    else:
+        with open( filepath, mode = 'r' ) as file:
+            content = json.load( file )
+
+    if type( content ) is list:
+        return content
+
+    if "jobs" not in content:
+        return [ content ]
+
+    defaults = { key: value for key, value in content.items() if key != "jobs" }
+    return [ { **defaults, **job } for job in content[ "jobs" ] ]
+
+
+def _warm( capacity: int, directory: str | None ) -> None:
+    """
+    Initialisiert einen Arbeitsprozess mit einem prozessweiten Zwischenspeicher
+
+    :param capacity: maximale Anzahl an Einträgen im Arbeitsspeicher
+    :param directory: Verzeichnis des gemeinsamen Zwischenspeichers auf der Festplatte
+    """
+    global _CACHE
+    from . import Pipeline
+    _CACHE = Pipeline.ModelCache( capacity, directory )
+
+
+def _execute( batch: list[ tuple[ int, dict, str ] ] ) -> list[ tuple[ int, dict | None, str | None ] ]:
+    """
+    Führt eine Gruppe von Aufträgen mit gemeinsamer Eingangsgeometrie nacheinander aus
+
+    :param batch: Liste aus Index, Auftrag und Basisverzeichnis
+    :return: Liste aus Index, Ergebnis und Fehlermeldung
+    """
+    from . import Pipeline
+    results = []
+    for index, spec, base in batch:
+        try:
+            results.append( ( index, Pipeline.run( spec, _CACHE, base ), None ) )
+        except Exception as exception:
+            results.append( ( index, None, f"{ type( exception ).__name__ }: { exception }" ) )
+    return results
+
+
+def _batches( jobs: list[ tuple[ int, dict, str ] ], workers: int ) -> list[ list[ tuple[ int, dict, str ] ] ]:
+    """
+    Gruppiert Aufträge nach ihrer Eingangsgeometrie, sodass diese auf demselben Arbeitsprozess ausgeführt werden.
+    Große Gruppen werden aufgeteilt, bis alle Arbeitsprozesse beschäftigt sind.
+
+    :param jobs: Liste aus Index, Auftrag und Basisverzeichnis
+    :param workers: Anzahl der Arbeitsprozesse
+    :return: Gruppen von Aufträgen
+    """
+    groups: dict[ str, list ] = {}
+    for job in jobs:
+        _, spec, base = job
+        groups.setdefault( os.path.abspath( os.path.join( base, spec.get( "input", "" ) ) ), [] ).append( job )
+
+    size = max( 1, -( -len( jobs ) // workers ) )
+    return [ group[ start: start + size ] for group in groups.values() for start in range( 0, len( group ), size ) ]
+
+
+def main( argv: list[ str ] | None = None ) -> int:
+    """
+    Einstiegspunkt des Kommandozeilenprogramms latticegen
+
+    :param argv: Argumente, standardmäßig die der Kommandozeile
+    :return: 0, wenn alle Aufträge erfolgreich waren, sonst 1
+    """
+    parser = ArgumentParser( prog = "latticegen",
+                             description = "Erzeugt Schalengeometrien mit Gitterkern aus Auftragsdateien (JSON/TOML)" )
+    parser.add_argument( "specs", nargs = "+", help = "Auftragsdateien" )
+    parser.add_argument( "-j", "--jobs", type = int, default = 1, help = "Anzahl paralleler Prozesse" )
+    parser.add_argument( "--cache", default = None,
+                         help = "Verzeichnis für Zwischenergebnisse, welche zwischen Aufträgen geteilt werden" )
+    parser.add_argument( "--capacity", type = int, default = 16, help = "Einträge im Zwischenspeicher je Prozess" )
+    parser.add_argument( "--report", default = None, help = "Pfad für einen Bericht im JSON-Format" )
+    arguments = parser.parse_args( argv )
+
+    jobs: list[ tuple[ int, dict, str ] ] = []
+    names: list[ str ] = []
+    for filepath in arguments.specs:
+        base = os.path.dirname( os.path.abspath( filepath ) )
+        for number, spec in enumerate( load( filepath ) ):
+            jobs.append( ( len( jobs ), spec, base ) )
+            names.append( spec.get( "name", f"{ filepath }[{ number }]" ) )
+
+    # parallele Aufträge dürfen weder Sicherungspunkte noch Ausgaben gegenseitig überschreiben
+    claimed: dict[ str, int ] = {}
+    for index, spec, base in jobs:
+        targets = list( spec.get( "outputs", {} ).values() )
+        for target in targets + ( [ spec[ "checkpoint" ] ] if "checkpoint" in spec else [] ):
+            target = os.path.abspath( os.path.join( base, target ) )
+            if claimed.setdefault( target, index ) != index:
+                parser.error( f"{ names[ claimed[ target ] ] } und { names[ index ] } schreiben beide { target }" )
+
+    start = perf_counter()
+    results: list[ dict ] = [ {} for _ in jobs ]
+    workers = max( 1, min( arguments.jobs, len( jobs ) ) )
+
+    with ProcessPoolExecutor( workers, initializer = _warm,
+                              initargs = ( arguments.capacity, arguments.cache ) ) as executor:
+        futures = { executor.submit( _execute, batch ): batch for batch in _batches( jobs, workers ) }
+        for future in as_completed( futures ):
+            try:
+                outcomes = future.result()
+            except Exception as exception:
+                # Ein abgebrochener Arbeitsprozess, etwa durch Speichermangel, betrifft nur die Aufträge seiner Gruppe
+                outcomes = [ ( index, None, f"{ type( exception ).__name__ }: { exception }" )
+                             for index, _, _ in futures[ future ] ]
+            for index, result, error in outcomes:
+                results[ index ] = { "name": names[ index ], "result": result, "error": error }
+                status = "Fehler: " + error if error else \
+                    f"fertig in { sum( result[ 'timings' ].values() ):.1f} s"
+                print( f"{ names[ index ] }: { status }", flush = True )
+
+    failed = sum( 1 for result in results if result[ "error" ] )
+    print( f"{ len( jobs ) - failed } von { len( jobs ) } Aufträgen erfolgreich in { perf_counter() - start:.1f} s" )
+
+    if arguments.report is not None:
+        with open( arguments.report, mode = 'w' ) as report:
+            json.dump( results, report, indent = 2 )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit( main() )
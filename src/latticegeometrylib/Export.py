@@ -0,0 +1,294 @@
+import os
+import zipfile
+import numpy as np
+from typing import IO
+from cadquery import Workplane, Compound, Shape, exporters
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.StlAPI import StlAPI_Writer
+from . import Graph
+StrutGraph = Graph.StrutGraph
+from . import Mesh
+TriangleMesh = Mesh.TriangleMesh
+
+CONTENT_TYPES: str = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    '</Types>' )
+
+# relative Sehnenabweichung bezogen auf die Wandstärke eines Körpers, Grenzen der Sehnenabweichung und Winkeltoleranz
+PRESETS: dict[ str, dict[ str, float ] ] = {
+    "draft": { "relative": 0.2, "minimum": 1e-3, "maximum": 0.5, "angular": 0.5 },
+    "standard": { "relative": 0.05, "minimum": 5e-4, "maximum": 0.1, "angular": 0.2 },
+    "fine": { "relative": 0.01, "minimum": 1e-4, "maximum": 0.02, "angular": 0.1 }
+}
+
+MESH_FORMATS: tuple[ str, ... ] = ( ".stl", ".3mf", ".amf", ".tjs" )
+
+RELATIONSHIPS: str = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    '</Relationships>' )
+
+
+def _write_rows( stream: IO[ bytes ], template: str, rows: np.ndarray, chunk: int = 65536 ) -> None:
+    """
+    Schreibt die Zeilen eines Feldes blockweise als XML-Elemente, sodass nie mehr als ein Block als Text im
+    Arbeitsspeicher vorliegt
+
+    :param stream: Ausgabestrom
+    :param template: Formatvorlage eines Elements mit Platzhaltern für die Spalten einer Zeile
+    :param rows: Feld, dessen Zeilen geschrieben werden
+    :param chunk: Anzahl der Zeilen je Block
+    """
+    for start in range( 0, len( rows ), chunk ):
+        stream.write( "".join( template.format( *row ) for row in rows[ start: start + chunk ].tolist() ).encode() )
+
+
+def _write_mesh( stream: IO[ bytes ], mesh: TriangleMesh ) -> None:
+    """
+    Schreibt die Eckpunkte und Dreiecke eines Netzes
+
+    :param stream: Ausgabestrom
+    :param mesh: Dreiecksnetz
+    """
+    stream.write( b"<vertices>" )
+    _write_rows( stream, '<vertex x="{:.6f}" y="{:.6f}" z="{:.6f}"/>', mesh.vertices )
+    stream.write( b"</vertices><triangles>" )
+    _write_rows( stream, '<triangle v1="{}" v2="{}" v3="{}"/>', mesh.triangles )
+    stream.write( b"</triangles>" )
+
+
+def write_3mf( filepath: str,
+               graph: StrutGraph,
+               shell: TriangleMesh | None = None,
+               clipping: TriangleMesh | None = None,
+               minimum_length: float = 1e-4 ) -> None:
+    """
+    Exportiert ein Gitter als Balkengitter nach der Beam-Lattice-Erweiterung des 3MF-Formats. Die Streben werden
+    als Knotenpaare mit Radien gespeichert, statt trianguliert zu werden. An der Oberfläche abgeschnittene
+    Strebenenden erhalten einen flachen Abschluss, alle übrigen einen kugelförmigen. Das XML wird blockweise direkt
+    in das Archiv geschrieben.
+
+    :param filepath: Pfad zur 3MF-Datei
+    :param graph: Graph des Gitters
+    :param shell: Schale als Dreiecksnetz, welche als zusätzliches Objekt exportiert wird
+    :param clipping: geschlossenes Dreiecksnetz, an welchem das Gitter beim Slicen abgeschnitten wird, etwa die
+                     Eingangsgeometrie für ein noch nicht zurechtgeschnittenes Gitter
+    :param minimum_length: kleinste Länge einer Strebe, kürzere Streben werden vom Slicer verworfen
+    """
+    if graph.empty():
+        raise ValueError( "Der Graph enthält keine Streben." )
+
+    radii = graph.diameters / 2.
+    caps = ( "sphere", "butt" )
+
+    identifiers: dict[ str, int ] = { "lattice": 1 }
+    if shell is not None:
+        identifiers[ "shell" ] = len( identifiers ) + 1
+    if clipping is not None:
+        identifiers[ "clipping" ] = len( identifiers ) + 1
+
+    with zipfile.ZipFile( filepath, mode = 'w', compression = zipfile.ZIP_DEFLATED ) as archive:
+        archive.writestr( "[Content_Types].xml", CONTENT_TYPES )
+        archive.writestr( "_rels/.rels", RELATIONSHIPS )
+
+        with archive.open( "3D/3dmodel.model", mode = 'w', force_zip64 = True ) as stream:
+            stream.write( b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                          b'<model unit="millimeter" xml:lang="en-US" '
+                          b'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02" '
+                          b'xmlns:b="http://schemas.microsoft.com/3dmanufacturing/beamlattice/2017/02" '
+                          b'requiredextensions="b"><resources>' )
+
+            if clipping is not None:
+                stream.write( f'<object id="{ identifiers[ "clipping" ] }" type="other"><mesh>'.encode() )
+                _write_mesh( stream, clipping )
+                stream.write( b"</mesh></object>" )
+
+            stream.write( f'<object id="{ identifiers[ "lattice" ] }" type="model"><mesh><vertices>'.encode() )
+            _write_rows( stream, '<vertex x="{:.6f}" y="{:.6f}" z="{:.6f}"/>', graph.nodes )
+            stream.write( b"</vertices><triangles/>" )
+
+            clip_attributes = "" if clipping is None else \
+                f' clippingmode="inside" clippingmesh="{ identifiers[ "clipping" ] }"'
+            stream.write( f'<b:beamlattice minlength="{ minimum_length }" radius="{ float( radii.max() ):.6f}" '
+                          f'cap="sphere"{ clip_attributes }><b:beams>'.encode() )
+            for start in range( 0, len( graph ), 65536 ):
+                rows = zip( graph.struts[ start: start + 65536 ].tolist(), radii[ start: start + 65536 ].tolist(),
+                            graph.trimmed[ start: start + 65536 ].tolist() )
+                stream.write( "".join(
+                    f'<b:beam v1="{ v1 }" v2="{ v2 }" r1="{ r:.6f}" r2="{ r:.6f}" '
+                    f'cap1="{ caps[ t1 ] }" cap2="{ caps[ t2 ] }"/>'
+                    for ( v1, v2 ), r, ( t1, t2 ) in rows ).encode() )
+            stream.write( b"</b:beams></b:beamlattice></mesh></object>" )
+
+            if shell is not None:
+                stream.write( f'<object id="{ identifiers[ "shell" ] }" type="model"><mesh>'.encode() )
+                _write_mesh( stream, shell )
+                stream.write( b"</mesh></object>" )
+
+            stream.write( b"</resources><build>" )
+            for name in ( "lattice", "shell" ):
+                if name in identifiers:
+                    stream.write( f'<item objectid="{ identifiers[ name ] }"/>'.encode() )
+            stream.write( b"</build></model>" )
+
+
+def _beam_arrays( graph: StrutGraph, regions: np.ndarray | None ) -> dict[ str, np.ndarray ]:
+    """
+    Stellt die Felder der Balkenelemente zusammen
+
+    :param graph: Graph des Gitters
+    :param regions: Index des Bereichs je Strebe, standardmäßig 0 für alle Streben
+    :return: Felder der Balkenelemente nach Bezeichnung
+    """
+    if graph.empty():
+        raise ValueError( "Der Graph enthält keine Streben." )
+    regions = np.zeros( len( graph ), dtype = np.int64 ) if regions is None else np.asarray( regions, dtype = np.int64 )
+    if regions.shape != ( len( graph ), ):
+        raise ValueError( "Für jede Strebe muss genau ein Bereich angegeben werden." )
+    return { "radius": graph.diameters / 2., "cell": graph.cells, "region": regions, "trimmed": graph.trimmed }
+
+
+def write_vtk( filepath: str, graph: StrutGraph, regions: np.ndarray | None = None, chunk: int = 1 << 20 ) -> None:
+    """
+    Exportiert ein Gitter als Balkenmodell im binären Legacy-Format von VTK (Unstructured Grid). Jede Strebe wird
+    als Linienelement zwischen zwei Knoten gespeichert, Radius, Zelle, Bereich und abgeschnittene Enden als
+    Zelldaten. Die Felder werden blockweise geschrieben.
+
+    :param filepath: Pfad zur VTK-Datei
+    :param graph: Graph des Gitters
+    :param regions: Index des Bereichs je Strebe, standardmäßig 0 für alle Streben
+    :param chunk: Anzahl der Zeilen je Block
+    """
+    arrays = _beam_arrays( graph, regions )
+    count = len( graph )
+
+    def _write( stream: IO[ bytes ], array: np.ndarray, dtype: str ) -> None:
+        """
+        Schreibt ein Feld blockweise in Big-Endian-Byte-Reihenfolge
+        """
+        for start in range( 0, len( array ), chunk ):
+            stream.write( np.ascontiguousarray( array[ start: start + chunk ], dtype = dtype ).tobytes() )
+        stream.write( b"\n" )
+
+    with open( filepath, mode = 'wb' ) as stream:
+        stream.write( b"# vtk DataFile Version 3.0\nlattice beam model\nBINARY\nDATASET UNSTRUCTURED_GRID\n" )
+        stream.write( f"POINTS { len( graph.nodes ) } double\n".encode() )
+        _write( stream, graph.nodes, ">f8" )
+
+        stream.write( f"CELLS { count } { 3 * count }\n".encode() )
+        for start in range( 0, count, chunk ):
+            struts = graph.struts[ start: start + chunk ]
+            cells = np.column_stack( ( np.full( len( struts ), 2 ), struts ) )
+            stream.write( cells.astype( ">i4" ).tobytes() )
+        stream.write( b"\n" )
+
+        stream.write( f"CELL_TYPES { count }\n".encode() )
+        _write( stream, np.broadcast_to( 3, count ), ">i4" )
+
+        stream.write( f"CELL_DATA { count }\n".encode() )
+        for name, dtype, vtk_type in ( ( "radius", ">f8", "double" ), ( "cell", ">i4", "int" ),
+                                       ( "region", ">i4", "int" ), ( "trimmed", ">u1", "unsigned_char" ) ):
+            array = arrays[ name ]
+            components = 1 if array.ndim == 1 else array.shape[ 1 ]
+            stream.write( f"SCALARS { name } { vtk_type } { components }\nLOOKUP_TABLE default\n".encode() )
+            _write( stream, array, dtype )
+
+
+def write_hdf5( filepath: str, graph: StrutGraph, regions: np.ndarray | None = None, chunk: int = 1 << 20,
+                compression: str | None = "gzip" ) -> None:
+    """
+    Exportiert ein Gitter als Balkenmodell in eine HDF5-Datei mit den Datensätzen nodes, struts, radius, cell,
+    region und trimmed. Die Datensätze werden blockweise geschrieben und gestückelt gespeichert. Benötigt h5py.
+
+    :param filepath: Pfad zur HDF5-Datei
+    :param graph: Graph des Gitters
+    :param regions: Index des Bereichs je Strebe, standardmäßig 0 für alle Streben
+    :param chunk: Anzahl der Zeilen je Block
+    :param compression: Kompressionsfilter der Datensätze oder None
+    """
+    try:
+        import h5py
+    except ImportError as error:
+        raise ImportError( "Für den Export nach HDF5 wird das Paket h5py benötigt." ) from error
+
+    arrays = { "nodes": graph.nodes, "struts": graph.struts, **_beam_arrays( graph, regions ) }
+    with h5py.File( filepath, mode = 'w' ) as file:
+        file.attrs[ "element" ] = "beam"
+        for name, array in arrays.items():
+            rows = max( 1, min( chunk, 65536, len( array ) ) )
+            dataset = file.create_dataset( name, shape = array.shape, dtype = array.dtype,
+                                           chunks = ( rows, *array.shape[ 1: ] ), compression = compression )
+            for start in range( 0, len( array ), chunk ):
+                dataset[ start: start + chunk ] = array[ start: start + chunk ]
+
+
+def deflections( shapes: list[ Shape ], preset: str = "standard" ) -> np.ndarray:
+    """
+    Wählt die Sehnenabweichung der Triangulierung je Körper nach dessen Wandstärke, genähert als doppeltes Verhältnis
+    von Volumen zu Oberfläche. Für eine Strebe entspricht dies ihrem Radius, für eine Schale ihrer Dicke.
+
+    :param shapes: Körper
+    :param preset: Toleranzvorgabe draft, standard oder fine
+    :return: Sehnenabweichung je Körper
+    """
+    if preset not in PRESETS:
+        raise ValueError( f"Unbekannte Toleranzvorgabe: { preset }" )
+    settings = PRESETS[ preset ]
+
+    thickness = np.array( [ 2. * shape.Volume() / max( shape.Area(), 1e-300 ) for shape in shapes ] )
+    return np.clip( settings[ "relative" ] * thickness, settings[ "minimum" ], settings[ "maximum" ] )
+
+
+def mesh( model: Workplane, preset: str = "standard" ) -> float:
+    """
+    Trianguliert alle Körper eines Modells mit einer Sehnenabweichung nach ihrer Wandstärke. Körper mit ähnlicher
+    Abweichung werden zu einem Verbund zusammengefasst, dessen Flächen OpenCascade parallel trianguliert. Die
+    Abweichungen werden dazu auf Stufen im Abstand des Faktors √2 abgerundet.
+
+    :param model: Modell als CADQuery Workplane
+    :param preset: Toleranzvorgabe draft, standard oder fine
+    :return: größte verwendete Sehnenabweichung
+    """
+    shapes: list[ Shape ] = [ solid for value in model.vals() for solid in value.Solids() ]
+    if not shapes:
+        raise ValueError( "Das Modell enthält keine Körper." )
+
+    levels = np.floor( 2. * np.log2( deflections( shapes, preset ) ) ) / 2.
+    for level in np.unique( levels ):
+        group = Compound.makeCompound( [ shape for shape, value in zip( shapes, levels ) if value == level ] )
+        BRepMesh_IncrementalMesh( group.wrapped, float( 2. ** level ), False, PRESETS[ preset ][ "angular" ], True )
+    return float( 2. ** levels.max() )
+
+
+def write_model( model: Workplane, filepath: str, preset: str | None = None ) -> None:
+    """
+    Exportiert ein Modell. Ohne Toleranzvorgabe oder für Formate ohne Triangulierung wie STEP wird der Export von
+    CADQuery verwendet, andernfalls werden die Körper zuvor mit angepasster Sehnenabweichung trianguliert.
+
+    :param model: Modell als CADQuery Workplane
+    :param filepath: Pfad zur Datei
+    :param preset: Toleranzvorgabe draft, standard oder fine
+    """
+    extension = os.path.splitext( filepath )[ 1 ].lower()
+    if preset is None or extension not in MESH_FORMATS:
+        exporters.export( model, filepath )
+        return
+
+    deflection = mesh( model, preset )
+    values = model.vals()
+    shape = values[ 0 ] if len( values ) == 1 else Compound.makeCompound( values )
+
+    if extension == ".stl":
+        writer = StlAPI_Writer()
+        writer.ASCIIMode = False
+        if not writer.Write( shape.wrapped, filepath ):
+            raise ValueError( f"Die Datei { filepath } konnte nicht geschrieben werden." )
+        return
+
+    # vorhandene Triangulierungen, welche feiner als die angegebene Toleranz sind, werden beibehalten
+    exporters.export( shape, filepath, tolerance = deflection, angularTolerance = PRESETS[ preset ][ "angular" ] )
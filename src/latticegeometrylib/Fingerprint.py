@@ -0,0 +1,256 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+import hashlib
+import numpy as np
+from cadquery import Workplane, Shape
+from OCP.BRepGProp import BRepGProp
+from OCP.GProp import GProp_GProps
+from OCP.TopLoc import TopLoc_Location
+from . import Graph
+StrutGraph = Graph.StrutGraph
+
+FIELDS: tuple[ str, ... ] = ( "volume", "area", "centroid", "inertia", "faces", "solids", "struts", "digest" )
+
+
+def _properties( shapes: list[ Shape ] ) -> np.ndarray:
+    """
+    Berechnet die Eigenschaften einzelner Körper mit GProp
+
+    :param shapes: Körper
+    :return: je Körper Volumen, Oberfläche, Schwerpunkt, Trägheitstensor um den Schwerpunkt zeilenweise und Anzahl
+             der Flächen, Form (n, 15)
+    """
+    rows = np.zeros( ( len( shapes ), 15 ) )
+    for row, shape in zip( rows, shapes ):
+        volume, surface = GProp_GProps(), GProp_GProps()
+        BRepGProp.VolumeProperties_s( shape.wrapped, volume )
+        BRepGProp.SurfaceProperties_s( shape.wrapped, surface )
+        center, matrix = volume.CentreOfMass(), volume.MatrixOfInertia()
+        row[ : 5 ] = volume.Mass(), surface.Mass(), center.X(), center.Y(), center.Z()
+        row[ 5: 14 ] = [ matrix.Value( i, j ) for i in ( 1, 2, 3 ) for j in ( 1, 2, 3 ) ]
+        row[ 14 ] = len( shape.Faces() )
+    return rows
+
+
+def properties( shape: Workplane | Shape, workers: int | None = None ) -> np.ndarray:
+    """
+    Berechnet die Eigenschaften aller Körper einer Geometrie. Körper, welche wie die Zellen eines Gitters verschobene
+    oder gedrehte Kopien derselben Geometrie sind, werden nur einmal berechnet und die Ergebnisse in ihre Lage
+    überführt. Die übrigen Körper werden auf Wunsch auf mehrere Prozesse verteilt.
+
+    :param shape: Geometrie
+    :param workers: Anzahl der Prozesse, standardmäßig wird im aufrufenden Prozess gerechnet
+    :return: Eigenschaften je Körper, siehe _properties
+    """
+    shapes = shape.vals() if isinstance( shape, Workplane ) else [ shape ]
+    solids: list[ Shape ] = [ solid for item in shapes if isinstance( item, Shape ) for solid in item.Solids() ]
+
+    bases: list[ Shape ] = []
+    owners: dict[ Any, int ] = {}
+    index = np.zeros( len( solids ), dtype = np.int64 )
+    rotations = np.tile( np.eye( 3 ), ( len( solids ), 1, 1 ) )
+    offsets = np.zeros( ( len( solids ), 3 ) )
+
+    for number, solid in enumerate( solids ):
+        transformation = solid.wrapped.Location().Transformation()
+        if abs( transformation.ScaleFactor() - 1. ) > 1e-12:
+            index[ number ] = len( bases )
+            bases.append( solid )
+            continue
+
+        key = solid.wrapped.TShape()
+        if key not in owners:
+            owners[ key ] = len( bases )
+            bases.append( Shape.cast( solid.wrapped.Located( TopLoc_Location() ) ) )
+        index[ number ] = owners[ key ]
+        part, translation = transformation.VectorialPart(), transformation.TranslationPart()
+        rotations[ number ] = [ [ part.Value( i, j ) for j in ( 1, 2, 3 ) ] for i in ( 1, 2, 3 ) ]
+        offsets[ number ] = translation.X(), translation.Y(), translation.Z()
+
+    if workers is not None and workers > 1 and len( bases ) > 1:
+        size = -( -len( bases ) // workers )
+        with ProcessPoolExecutor( workers ) as executor:
+            parts = list( executor.map( _properties, [ bases[ start: start + size ]
+                                                       for start in range( 0, len( bases ), size ) ] ) )
+        rows = np.concatenate( parts )
+    else:
+        rows = _properties( bases )
+
+    rows = rows[ index ]
+    rows[ :, 2: 5 ] = np.einsum( 'nij,nj->ni', rotations, rows[ :, 2: 5 ] ) + offsets
+    rows[ :, 5: 14 ] = ( rotations @ rows[ :, 5: 14 ].reshape( -1, 3, 3 ) @
+                         rotations.transpose( 0, 2, 1 ) ).reshape( -1, 9 )
+    return rows
+
+
+def combine( rows: np.ndarray ) -> tuple[ float, float, np.ndarray, np.ndarray ]:
+    """
+    Fasst die Eigenschaften einzelner Körper zusammen. Die Trägheitstensoren werden mit dem Satz von Steiner auf den
+    gemeinsamen Schwerpunkt verschoben.
+
+    :param rows: Eigenschaften je Körper, siehe _properties
+    :return: Volumen, Oberfläche, Schwerpunkt und Trägheitstensor um den Schwerpunkt
+    """
+    volume = float( rows[ :, 0 ].sum() )
+    area = float( rows[ :, 1 ].sum() )
+    if volume == 0.:
+        return volume, area, np.zeros( 3 ), np.zeros( ( 3, 3 ) )
+
+    centroid = rows[ :, 0 ] @ rows[ :, 2: 5 ] / volume
+    distance = rows[ :, 2: 5 ] - centroid
+    inertia = rows[ :, 5: 14 ].sum( axis = 0 ).reshape( 3, 3 ) + \
+        np.sum( rows[ :, 0 ] * np.einsum( 'ij,ij->i', distance, distance ) ) * np.eye( 3 ) - \
+        np.einsum( 'n,ni,nj->ij', rows[ :, 0 ], distance, distance )
+    return volume, area, centroid, inertia
+
+
+def digest( graph: StrutGraph | None, tolerance: float = 1e-6 ) -> str:
+    """
+    Prüfsumme eines Graphen, unabhängig von der Reihenfolge der Knoten und Streben und der Richtung der Streben.
+    Koordinaten und Durchmesser werden auf Vielfache der Toleranz gerundet.
+
+    :param graph: Graph
+    :param tolerance: Rasterweite der Rundung
+    :return: SHA-256-Prüfsumme als Hexadezimalzahl, leer ohne Graph
+    """
+    if graph is None or graph.empty():
+        return ""
+
+    nodes = np.round( graph.nodes / tolerance ).astype( '<i8' )
+    ends = nodes[ graph.struts ]
+    trimmed = graph.trimmed.astype( '<i8' )
+
+    # Streben vom lexikographisch kleineren zum größeren Knoten ausrichten
+    difference = ends[ :, 0 ] - ends[ :, 1 ]
+    first = np.argmax( difference != 0, axis = 1 )
+    swap = difference[ np.arange( len( difference ) ), first ] > 0
+    ends[ swap ] = ends[ swap, :: -1 ]
+    trimmed[ swap ] = trimmed[ swap, :: -1 ]
+
+    rows = np.concatenate( ( ends.reshape( -1, 6 ), np.round( graph.diameters / tolerance ).astype( '<i8' )[ :, None ],
+                             trimmed ), axis = 1 )
+    rows = rows[ np.lexsort( rows.T[ :: -1 ] ) ]
+    nodes = nodes[ np.lexsort( nodes.T[ :: -1 ] ) ]
+
+    checksum = hashlib.sha256()
+    checksum.update( np.ascontiguousarray( nodes ).tobytes() )
+    checksum.update( np.ascontiguousarray( rows ).tobytes() )
+    return checksum.hexdigest()
+
+
+class Fingerprint:
+    """
+    Kennwerte einer Geometrie und ihres Graphen zum Zwischenspeichern und zur Erkennung von Abweichungen in
+    Regressionstests
+    """
+    def __init__( self,
+                  volume: float = 0.,
+                  area: float = 0.,
+                  centroid: np.ndarray | None = None,
+                  inertia: np.ndarray | None = None,
+                  faces: int = 0,
+                  solids: int = 0,
+                  struts: int = 0,
+                  digest: str = "" ) -> None:
+        """
+        Initialisierung aus den Kennwerten
+
+        :param volume: Volumen
+        :param area: Oberfläche
+        :param centroid: Schwerpunkt
+        :param inertia: Trägheitstensor um den Schwerpunkt bei Dichte 1
+        :param faces: Anzahl der Flächen
+        :param solids: Anzahl der Körper
+        :param struts: Anzahl der Streben des Graphen
+        :param digest: Prüfsumme des Graphen
+        """
+        self.volume: float = float( volume )
+        self.area: float = float( area )
+        self.centroid: np.ndarray = np.zeros( 3 ) if centroid is None else np.asarray( centroid, dtype = float )
+        self.inertia: np.ndarray = np.zeros( ( 3, 3 ) ) if inertia is None else \
+            np.asarray( inertia, dtype = float ).reshape( 3, 3 )
+        self.faces: int = int( faces )
+        self.solids: int = int( solids )
+        self.struts: int = int( struts )
+        self.digest: str = digest
+
+    @classmethod
+    def create( cls, shape: Workplane | Shape | None = None, graph: StrutGraph | None = None,
+                workers: int | None = None, tolerance: float = 1e-6 ) -> "Fingerprint":
+        """
+        Erstellt den Fingerabdruck einer Geometrie und ihres Graphen
+
+        :param shape: Geometrie
+        :param graph: Graph der Geometrie
+        :param workers: Anzahl der Prozesse für die Eigenschaften der Körper, siehe properties
+        :param tolerance: Rasterweite der Koordinaten des Graphen, siehe digest
+        :return: Fingerabdruck
+        """
+        rows = properties( shape, workers ) if shape is not None else np.zeros( ( 0, 15 ) )
+        volume, area, centroid, inertia = combine( rows )
+        return cls( volume, area, centroid, inertia, int( rows[ :, 14 ].sum() ), len( rows ),
+                    0 if graph is None else len( graph ), digest( graph, tolerance ) )
+
+    def differences( self, other: "Fingerprint", relative: float = 1e-6, absolute: float = 1e-9 ) -> list[ str ]:
+        """
+        Vergleicht zwei Fingerabdrücke. Volumen, Oberfläche und Trägheitstensor werden relativ zu ihrem Betrag
+        verglichen, der Schwerpunkt relativ zur Kantenlänge eines Würfels gleichen Volumens. Anzahlen und Prüfsumme
+        müssen übereinstimmen.
+
+        :param other: Fingerabdruck
+        :param relative: relative Toleranz
+        :param absolute: absolute Toleranz
+        :return: Namen der abweichenden Kennwerte, siehe FIELDS
+        """
+        def _close( first: Any, second: Any, scale: float ) -> bool:
+            """
+            Prüft, ob zwei Werte innerhalb der Toleranz bezogen auf den gegebenen Betrag übereinstimmen
+            """
+            return bool( np.max( np.abs( np.subtract( first, second ) ) ) <= absolute + relative * scale )
+
+        length = np.cbrt( max( abs( self.volume ), abs( other.volume ) ) )
+        matched = { "volume": _close( self.volume, other.volume, max( abs( self.volume ), abs( other.volume ) ) ),
+                    "area": _close( self.area, other.area, max( abs( self.area ), abs( other.area ) ) ),
+                    "centroid": _close( self.centroid, other.centroid, length ),
+                    "inertia": _close( self.inertia, other.inertia,
+                                       max( np.abs( self.inertia ).max(), np.abs( other.inertia ).max() ) ) }
+        for name in ( "faces", "solids", "struts", "digest" ):
+            matched[ name ] = getattr( self, name ) == getattr( other, name )
+        return [ name for name in FIELDS if not matched[ name ] ]
+
+    def close( self, other: "Fingerprint", relative: float = 1e-6, absolute: float = 1e-9 ) -> bool:
+        """
+        :param other: Fingerabdruck
+        :param relative: relative Toleranz
+        :param absolute: absolute Toleranz
+        :return: True, wenn alle Kennwerte innerhalb der Toleranz übereinstimmen
+        """
+        return not self.differences( other, relative, absolute )
+
+    def key( self, digits: int = 9 ) -> str:
+        """
+        Schlüssel für einen Zwischenspeicher aus den auf signifikante Stellen gerundeten Kennwerten
+
+        :param digits: Anzahl der signifikanten Stellen
+        :return: SHA-256-Prüfsumme als Hexadezimalzahl
+        """
+        values = [ self.volume, self.area ] + self.centroid.tolist() + self.inertia.ravel().tolist()
+        text = ",".join( [ f"{ value + 0.:.{ digits }g}" for value in values ] +
+                         [ str( self.faces ), str( self.solids ), str( self.struts ), self.digest ] )
+        return hashlib.sha256( text.encode() ).hexdigest()
+
+    def to_dict( self ) -> dict:
+        """
+        :return: Kennwerte als JSON-kompatibles Wörterbuch, etwa als Referenz für Regressionstests
+        """
+        return { "volume": self.volume, "area": self.area, "centroid": self.centroid.tolist(),
+                 "inertia": self.inertia.tolist(), "faces": self.faces, "solids": self.solids,
+                 "struts": self.struts, "digest": self.digest }
+
+    @classmethod
+    def from_dict( cls, values: dict ) -> "Fingerprint":
+        """
+        :param values: Kennwerte, siehe to_dict
+        :return: Fingerabdruck
+        """
+        return cls( **{ name: values[ name ] for name in FIELDS if name in values } )
@@ -1,9 +1,25 @@
-from cadquery import Workplane, importers, exporters
+import os
+from typing import Callable
+import numpy as np
+from cadquery import Workplane, Compound
 from . import Geometry
 from . import Miscellaneous
 from . import UnitaryCell
 from . import Lattice
 from . import CellConfiguration
+from . import Checkpoint
+from . import Importer
+from . import Spill
+from . import Mesh
+from . import Export
+from . import Graph
+from . import Manufacturability
+from . import Preview
+from . import Hybrid
+from . import Stochastic
+from . import Boolean
+from . import Fingerprint
+from . import Mass
 
 Geometry = Geometry.Geometry
 Size = Miscellaneous.Size
@@ -14,6 +30,21 @@ UnitaryCell = UnitaryCell.UnitaryCell
 Lattice = Lattice.Lattice
 Entity = CellConfiguration.Entity
 CellConfiguration = CellConfiguration.CellConfiguration
+SpillStore = Spill.SpillStore
+TriangleMesh = Mesh.TriangleMesh
+StrutGraph = Graph.StrutGraph
+LatticePreview = Preview.LatticePreview
+Region = Hybrid.Region
+Fingerprint = Fingerprint.Fingerprint
+
+ATTRIBUTES: dict[ str, tuple[ str, str ] ] = {
+    "model": ( "geometry", "solid_geometry" ),
+    "shell": ( "geometry", "shell_geometry" ),
+    "cell": ( "cell", "geometry" ),
+    "lattice": ( "lattice", "geometry" ),
+    "intersected": ( "geometry", "lattice_geometry" ),
+    "unified": ( "geometry", "union_geometry" )
+}
 
 
 class LatticeGenerator:
@@ -21,30 +52,131 @@ class LatticeGenerator:
     Klasse zur Erzeugung einer Schalengeometrie mit Gitterjern aus
     einer Eingangsgeometrie
     """
-    def __init__( self ):
+    def __init__( self, checkpoint: str | None = None, budget: int | None = None, spill: str | None = None ):
         """
         Initialisiert einen LatticeGenerator
+
+        :param checkpoint: Pfad zu einem Archiv, in welchem der Zustand nach jeder abgeschlossenen Stufe gesichert wird
+        :param budget: Arbeitsspeicher in Byte, ab welchem abgeschlossene, nicht mehr benötigte Zwischenergebnisse
+                       auf die Festplatte ausgelagert werden. Bei 0 oder ohne Angabe bei gegebenem Verzeichnis wird
+                       stets ausgelagert. Ohne Budget und Verzeichnis wird nie ausgelagert.
+        :param spill: Verzeichnis für ausgelagerte Zwischenergebnisse, standardmäßig ein temporäres Verzeichnis
         """
         self.config = CellConfiguration()
         self.geometry = Geometry()
         self.lattice: Lattice = Lattice()
         self.cell: UnitaryCell = UnitaryCell()
+        self.checkpoint: str | None = checkpoint
+        self.digest: str | None = None
+        self.spill: SpillStore | None = None
+        self.previews: dict[ tuple, LatticePreview ] = {}
+        self.regions: list[ Region ] = []
+        self.cells: dict[ tuple, UnitaryCell ] = {}
+
+        if budget is not None or spill is not None:
+            self.spill = SpillStore( spill, budget )
+
+    def stages( self ) -> list[ str ]:
+        """
+        Gibt die abgeschlossenen Stufen des Generators aus
+
+        :return: Stufen in der Reihenfolge der Erzeugung
+        """
+        done = { "model": not self.geometry.empty(),
+                 "shell": self.geometry.has_shell_geometry,
+                 "cell": self.cell.has_cell,
+                 "lattice": self.lattice.has_grid,
+                 "intersected": self.geometry.has_lattice_geometry,
+                 "unified": self.geometry.has_union_geometry }
+        return [ stage for stage in Checkpoint.STAGES if done[ stage ] ]
+
+    def save( self, filepath: str ) -> None:
+        """
+        Speichert den Zustand aller abgeschlossenen Stufen in einem Archiv
+
+        :param filepath: Pfad zum Archiv
+        """
+        Checkpoint.save( self, filepath )
+
+    @classmethod
+    def load( cls, filepath: str, mmap: bool = True, checkpoint: str | None = None ) -> "LatticeGenerator":
+        """
+        Stellt einen Generator aus einem Archiv wieder her. Wird das Archiv auch als Sicherungspunkt angegeben, wird
+        die Erzeugung ab der ersten nicht gespeicherten Stufe fortgesetzt und weiter gesichert.
+
+        :param filepath: Pfad zum Archiv
+        :param mmap: steuert, ob die Felder der Gittergraphen direkt aus dem Archiv in den Speicher abgebildet werden
+        :param checkpoint: Pfad zu einem Archiv, in welchem jede weitere abgeschlossene Stufe gesichert wird
+        :return: Generator
+        """
+        return Checkpoint.load( filepath, cls( checkpoint ), mmap )
+
+    def output( self, stage: str ) -> Workplane | None:
+        """
+        Gibt das Ergebnis einer Stufe aus und lädt dieses, falls es ausgelagert wurde
+
+        :param stage: Stufe
+        :return: Ergebnis der Stufe als CADQuery Workplane
+        """
+        owner, attribute = ATTRIBUTES[ stage ]
+        model = getattr( getattr( self, owner ), attribute )
 
-    def import_initial_model( self, filepath: str ) -> None:
+        if model is None and self.spill is not None and stage in self.spill:
+            model = self.spill.restore( stage )
+            setattr( getattr( self, owner ), attribute, model )
+        return model
+
+    def finish_stage( self, stage: str ) -> None:
+        """
+        Schließt eine Stufe ab. Diese wird im Archiv des Sicherungspunktes gesichert, sofern dieses angegeben ist.
+        Im Modus mit Speicherbudget werden anschließend die Ergebnisse aller übrigen Stufen ausgelagert und aus dem
+        Arbeitsspeicher entfernt.
+
+        :param stage: abgeschlossene Stufe
+        """
+        if self.checkpoint is not None:
+            Checkpoint.save( self, self.checkpoint, stage )
+
+        if self.spill is None:
+            return
+
+        self.spill.discard( stage )
+        if not self.spill.exceeded():
+            return
+
+        for name in self.stages():
+            owner, attribute = ATTRIBUTES[ name ]
+            model = getattr( getattr( self, owner ), attribute )
+            if name == stage or model is None:
+                continue
+            if name not in self.spill:
+                self.spill.spill( name, model )
+            setattr( getattr( self, owner ), attribute, None )
+
+    def import_initial_model( self, filepath: str, cache: str | None = None, root: int | None = None,
+                              solid: int | None = None ) -> None:
         """
         Importfunktion für die initiale Geometrie
 
-        :param filepath: Pfad zur STEP-Datei
+        :param filepath: Pfad zur STEP-Datei oder zu einer STL-Datei, welche als Dreiecksnetz eingelesen wird
+        :param cache: Verzeichnis, in welchem das Ergebnis des Imports als binäre BREP-Datei zwischengespeichert wird
+        :param root: Index der zu importierenden Wurzel der STEP-Datei, standardmäßig alle Wurzeln
+        :param solid: Index des zu verwendenden Körpers, standardmäßig die gesamte Geometrie
         """
-        self.geometry = Geometry( importers.importStep( filepath ) )
+        if filepath.lower().endswith( ".stl" ):
+            self.set_initial_mesh( TriangleMesh.from_stl( filepath ) )
+            return
+        self.geometry = Geometry( Importer.import_step( filepath, cache, root, solid ) )
+        self.finish_stage( "model" )
 
-    def export_initial_model( self, filepath: str ) -> None:
+    def export_initial_model( self, filepath: str, preset: str | None = None ) -> None:
         """
         Exportfunktion für die initiale Geometrie
 
         :param filepath: Dateipfad der Datei
+        :param preset: Toleranzvorgabe der Triangulierung draft, standard oder fine, siehe Export.PRESETS
         """
-        exporters.export( self.get_initial_model(), filepath )
+        Export.write_model( self.get_initial_model(), filepath, preset )
 
     def set_initial_model( self, solid: Workplane ) -> None:
         """
@@ -53,6 +185,27 @@ class LatticeGenerator:
         :param solid: initiale Geometrie als CADQuery Workplane
         """
         self.geometry = Geometry( solid )
+        self.finish_stage( "model" )
+
+    def set_initial_mesh( self, mesh: TriangleMesh ) -> None:
+        """
+        Setzen der initialen Geometrie als geschlossenes Dreiecksnetz. Begrenzungsquader, Belegung der Zellen und
+        Abschneiden der Streben werden direkt auf dem Netz berechnet, die Schale muss importiert werden.
+
+        :param mesh: initiale Geometrie als Dreiecksnetz
+        """
+        self.geometry = Geometry( mesh = mesh )
+        self.finish_stage( "model" )
+
+    def get_initial_mesh( self ) -> TriangleMesh:
+        """
+        Rückgabefunktion für die initiale Geometrie als Dreiecksnetz
+
+        :return: Dreiecksnetz
+        """
+        if self.geometry.mesh is None:
+            raise ValueError( "Es ist kein Dreiecksnetz als Eingangsmodell verfügbar." )
+        return self.geometry.mesh
 
     def get_initial_model( self ) -> Workplane:
         """
@@ -62,7 +215,7 @@ class LatticeGenerator:
         """
         if not self.geometry.has_solid_geometry:
             raise ValueError( "Es ist kein Eingangsmodell verfügbar." )
-        return self.geometry.solid_geometry
+        return self.output( "model" )
 
     def delete_initial_model( self ) -> None:
         """
@@ -80,25 +233,32 @@ class LatticeGenerator:
         :param inner_thickness: Aufdickung nach Innen gegenüber Oberfläche
         :param outer_thickness: Aufdickung nach außen gegenüber Oberfläche
         """
-        if not self.geometry.has_solid_geometry:
+        if self.geometry.empty():
             raise ValueError( "Es ist kein Eingangsmodell verfügbar." )
+        self.output( "model" )
         self.geometry.shell( inner_thickness, outer_thickness )
+        self.finish_stage( "shell" )
 
-    def import_shell( self, filepath: str ) -> None:
+    def import_shell( self, filepath: str, cache: str | None = None, root: int | None = None,
+                      solid: int | None = None ) -> None:
         """
         Importfunktion zum setzen der Schalengeometrie
 
         :param filepath: Dateipfad zur STEP-Datei
+        :param cache: Verzeichnis, in welchem das Ergebnis des Imports als binäre BREP-Datei zwischengespeichert wird
+        :param root: Index der zu importierenden Wurzel der STEP-Datei, standardmäßig alle Wurzeln
+        :param solid: Index des zu verwendenden Körpers, standardmäßig die gesamte Geometrie
         """
-        self.geometry.shell( importers.importStep( filepath ) )
+        self.set_shell( Importer.import_step( filepath, cache, root, solid ) )
 
-    def export_shell( self, filepath: str ) -> None:
+    def export_shell( self, filepath: str, preset: str | None = None ) -> None:
         """
         Exportfunktion für die Schalengeometrie
 
         :param filepath: Dateipfad für die CAD-Datei
+        :param preset: Toleranzvorgabe der Triangulierung draft, standard oder fine, siehe Export.PRESETS
         """
-        exporters.export( self.get_shell(), filepath )
+        Export.write_model( self.get_shell(), filepath, preset )
 
     def set_shell( self, shell: Workplane ) -> None:
         """
@@ -107,6 +267,7 @@ class LatticeGenerator:
         :param shell: Schalengeometrie als CADQuery Workplane
         """
         self.geometry.shell( shell_geometry = shell )
+        self.finish_stage( "shell" )
 
     def get_shell( self ) -> Workplane:
         """
@@ -116,31 +277,36 @@ class LatticeGenerator:
         """
         if not self.geometry.has_shell_geometry:
             raise ValueError( "Es ist kein Schalenobjekt vorhanden." )
-        return self.geometry.shell_geometry
+        return self.output( "shell" )
 
     def delete_shell(self):
         """
         Löscht die Schalengeometrie
         """
-        self.geometry.shell = None
-        self.geometry.has_shell = False
+        self.geometry.shell_geometry = None
+        self.geometry.has_shell_geometry = False
+        self.geometry.shell_cache = {}
         self.delete_intersected_lattice()
 
     def init_unitary_cell( self,
                            length: tuple[ float, float, float ],
                            strict: tuple[ bool, bool, bool ]
-                           = ( False, False, False ) ) -> None:
+                           = ( False, False, False ),
+                           rotation: np.ndarray | None = None ) -> None:
         """
         Initialisiert die Elementarzellgeometrie und das Gitter
 
         :param length: Bevorzugte Abmessungen der Elementarzelle
         :param strict: Einstellung, ob die gegebenen Abmessungen genau
                        eingehalten werden sollen
+        :param rotation: Drehmatrix, deren Spalten die Achsen des Gitters sind, etwa aus Miscellaneous.rotation.
+                         Das Gitter füllt dann den in diesem System orientierten Begrenzungsquader.
         """
-        if not self.geometry.has_solid_geometry:
+        if self.geometry.empty():
             raise ValueError( "Es ist kein Eingangsmodell verfügbar." )
 
-        self.lattice = Lattice( self.geometry.bounding_box(), Size( *length ), Switch( *strict ) )
+        self.output( "model" )
+        self.lattice = Lattice( self.geometry.bounding_box( rotation ), Size( *length ), Switch( *strict ), rotation )
         self.cell = UnitaryCell( self.lattice.cell_size )
         self.config = CellConfiguration( self.cell.vertices )
 
@@ -178,6 +344,65 @@ class LatticeGenerator:
                 "Es ist noch keine Einheitszelle initialisiert." )
         self.config.insert( entities )
 
+    def add_region( self,
+                    name: str,
+                    entities: str | list,
+                    length: tuple[ float, float, float ],
+                    strict: tuple[ bool, bool, bool ] = ( False, False, False ),
+                    solid: Workplane | TriangleMesh | None = None,
+                    box: tuple[ tuple[ float, float, float ], tuple[ float, float, float ] ] | None = None,
+                    cells: Callable[ [ np.ndarray ], np.ndarray ] | None = None,
+                    tolerance: float = 1e-2 ) -> Region:
+        """
+        Fügt einen Bereich mit eigener Elementarzelle und Zellgröße hinzu. Sind Bereiche vorhanden, wird mit
+        create_lattice ein hybrides Gitter aus allen Bereichen statt des Gitters der Elementarzelle erstellt. Gehört
+        ein Punkt mehreren Bereichen an, gilt der zuerst hinzugefügte.
+
+        :param name: eindeutige Bezeichnung des Bereichs
+        :param entities: Liste mit Informationen zu Entitäten der Elementarzelle des Bereichs
+        :param length: bevorzugte Abmessungen der Elementarzelle
+        :param strict: Einstellung, ob die gegebenen Abmessungen genau eingehalten werden sollen
+        :param solid: Körper des Bereichs als B-Rep oder geschlossenes Dreiecksnetz
+        :param box: kleinste und größte Koordinaten des Bereichs als Quader
+        :param cells: Auswahlfunktion, welche für Zellindizes des Bereichsgitters der Form (c, 3) ein boolesches Feld
+                      ausgibt. Ohne Körper, Quader und Auswahlfunktion umfasst der Bereich alle übrigen Zellen.
+        :param tolerance: lineare Toleranz der Triangulierung eines Körpers als B-Rep
+        :return: Bereich
+        """
+        if self.geometry.empty():
+            raise ValueError( "Es ist kein Eingangsmodell verfügbar." )
+        if any( region.name == name for region in self.regions ):
+            raise ValueError( f"Es ist bereits ein Bereich mit der Bezeichnung { name } vorhanden." )
+
+        self.output( "model" )
+        region = Region( name, self.geometry.bounding_box(), length, strict, solid, box, cells, tolerance )
+        region.config.insert( entities )
+        self.regions.append( region )
+        self.lattice.reset()
+        self.delete_intersected_lattice()
+        return region
+
+    def get_region( self, name: str ) -> Region:
+        """
+        Rückgabefunktion für einen Bereich
+
+        :param name: Bezeichnung des Bereichs
+        :return: Bereich
+        """
+        for region in self.regions:
+            if region.name == name:
+                return region
+        raise ValueError( f"Es ist kein Bereich mit der Bezeichnung { name } vorhanden." )
+
+    def delete_regions( self ) -> None:
+        """
+        Löscht alle Bereiche und die zwischengespeicherten Elementarzellen der Bereiche
+        """
+        self.regions = []
+        self.cells = {}
+        self.lattice.reset()
+        self.delete_intersected_lattice()
+
     def delete_entities( self ) -> None:
         """
         Löscht alle Entitäten
@@ -196,14 +421,16 @@ class LatticeGenerator:
         if not self.cell.initialized:
             raise ValueError( "Es ist noch keine Einheitszelle initialisiert." )
         self.cell.create( self.config )
+        self.finish_stage( "cell" )
 
-    def export_unitary_cell( self, filepath: str ) -> None:
+    def export_unitary_cell( self, filepath: str, preset: str | None = None ) -> None:
         """
         Exportiert die Elementarzellgeometrie
 
         :param filepath: Pfad zur CAD-Datei
+        :param preset: Toleranzvorgabe der Triangulierung draft, standard oder fine, siehe Export.PRESETS
         """
-        exporters.export( self.get_unitary_cell(), filepath )
+        Export.write_model( self.get_unitary_cell(), filepath, preset )
 
     def get_unitary_cell( self ) -> Workplane:
         """
@@ -213,7 +440,7 @@ class LatticeGenerator:
         """
         if self.cell.empty():
             raise ValueError( "Es ist keine Einheitszelle vorhanden." )
-        return self.cell.geometry
+        return self.output( "cell" )
 
     def delete_unitary_cell( self ):
         """
@@ -223,21 +450,127 @@ class LatticeGenerator:
         self.lattice.reset()
         self.delete_intersected_lattice()
 
-    def create_lattice( self ) -> None:
+    def preview( self, clip: str = "box", tolerance: float = 0.5 ) -> LatticePreview:
         """
-        Erstellt das Gitter aus der Elementarzelle.
+        Erstellt eine Vorschau des Gitters direkt aus der Konfiguration der Elementarzelle, ohne die Geometrie der
+        Elementarzelle oder des Gitters zu erzeugen. Die Vorschau wird je Zellgröße, Zellbesetzung und Beschnitt
+        zwischengespeichert, sodass nach Änderungen an Entitäten nur diese neu berechnet werden.
+
+        :param clip: box schneidet die Streben am Begrenzungsquader der Eingangsgeometrie ab, mesh verwirft
+                     zusätzlich Zellen, welche ein grobes Dreiecksnetz der Eingangsgeometrie nicht berühren
+        :param tolerance: lineare Toleranz der Triangulierung der Eingangsgeometrie für mesh
+        :return: Vorschau mit Strecken, Instanzmatrizen und Röhren der Streben
         """
+        if clip not in ( "box", "mesh" ):
+            raise ValueError( "Der Beschnitt der Vorschau muss box oder mesh sein." )
+        if not self.cell.initialized:
+            raise ValueError( "Es ist noch keine Einheitszelle initialisiert." )
+
+        self.output( "model" )
+        size = np.array( self.lattice.cell_size.toTuple() )
+        bounds = self.geometry.bounding_box()
+        key = ( clip, tolerance, tuple( size ), bounds.min(), bounds.max(), hash( self.lattice.cells.tobytes() ),
+                hash( self.lattice.rotation.tobytes() ) )
+        if key not in self.previews:
+            mesh = None
+            if clip == "mesh":
+                mesh = self.geometry.mesh
+                if mesh is None:
+                    mesh = TriangleMesh.from_workplane( self.output( "model" ), tolerance )
+            self.previews = { key: LatticePreview( self.lattice.centers(), bounds.min(), bounds.max(), mesh, size,
+                                                   self.lattice.rotation ) }
+
+        preview = self.previews[ key ]
+        preview.update( self.config )
+        return preview
+
+    def create_lattice( self, sparse: bool = False, combine: bool = False ) -> None:
+        """
+        Erstellt das Gitter aus der Elementarzelle oder, falls Bereiche vorhanden sind, das hybride Gitter aus den
+        Elementarzellen aller Bereiche, siehe Hybrid.create
+
+        :param sparse: steuert, ob nur Zellen erzeugt werden, welche die Eingangsgeometrie berühren
+        :param combine: steuert, ob die Übergangszellen eines hybriden Gitters in einer Operation vereinigt werden
+        """
+        if self.regions:
+            self.output( "model" )
+            for region in self.regions:
+                if sparse:
+                    region.lattice.occupy( self.geometry.input() )
+                else:
+                    region.lattice.cells = np.indices( region.lattice.periodicity.toTuple(),
+                                                       dtype = np.int32 ).reshape( 3, -1 ).T
+            self.lattice = Hybrid.create( self.regions, self.cells, combine )
+            self.finish_stage( "lattice" )
+            return
+
         if self.cell.empty():
             raise ValueError( "Es ist keine Einheitszelle vorhanden." )
+        if sparse:
+            self.output( "model" )
+            self.lattice.occupy( self.geometry.input() )
+        self.output( "cell" )
         self.lattice.create( self.cell )
+        self.finish_stage( "lattice" )
+
+    def create_stochastic_lattice( self,
+                                   spacing: float,
+                                   diameter: float,
+                                   kind: str = "voronoi",
+                                   grading: Callable[ [ np.ndarray ], np.ndarray ] | None = None,
+                                   minimum_length: float = 0.,
+                                   maximum_length: float | None = None,
+                                   count: int | None = None,
+                                   seed: int | None = None,
+                                   solids: bool = False,
+                                   tolerance: float = 1e-2 ) -> None:
+        """
+        Erstellt statt eines periodischen Gitters ein stochastisches, schaumartiges Gitter. Die Saatpunkte werden mit
+        Mindestabstand innerhalb der Eingangsgeometrie verteilt, die Streben sind die Kanten des Voronoi-Diagramms
+        oder der Delaunay-Tetraedrisierung, siehe Stochastic.create. Das Gitter wird wie ein periodisches Gitter
+        zurechtgeschnitten, mit der Schale vereinigt und exportiert.
+
+        :param spacing: Mindestabstand der Saatpunkte bei einer relativen Dichte von 1
+        :param diameter: Durchmesser der Streben
+        :param kind: voronoi oder delaunay
+        :param grading: Funktion, welche für Punkte der Form (n, 3) die relative Dichte der Saatpunkte in (0, 1]
+                        ausgibt
+        :param minimum_length: kleinste Länge einer Strebe, kürzere Kanten werden zusammengezogen
+        :param maximum_length: größte Länge einer Strebe, standardmäßig das Dreifache des größten Mindestabstands
+        :param count: größte Anzahl an Saatpunkten
+        :param seed: Startwert des Zufallszahlengenerators
+        :param solids: steuert, ob die Streben zusätzlich als B-Rep erzeugt werden. Ohne diese muss das Gitter mit
+                       clip zurechtgeschnitten werden.
+        :param tolerance: lineare Toleranz der Triangulierung der Eingangsgeometrie für die Innen-/Außentests
+        """
+        if self.geometry.empty():
+            raise ValueError( "Es ist kein Eingangsmodell verfügbar." )
+
+        mesh = self.geometry.mesh
+        if mesh is None:
+            mesh = TriangleMesh.from_workplane( self.output( "model" ), tolerance )
+        lower, upper = mesh.bounds()
+
+        graph = Stochastic.create( lower, upper, spacing, diameter, kind, mesh.contains, grading, minimum_length,
+                                   maximum_length, count, seed )
+
+        self.delete_lattice()
+        self.lattice = Lattice()
+        self.lattice.cell_size = Size( spacing, spacing, spacing )
+        self.lattice.graph = graph
+        self.lattice.geometry = Workplane( obj = Compound.makeCompound( Hybrid._cylinders( graph ) ) ) if solids \
+            else Workplane()
+        self.lattice.has_grid = True
+        self.finish_stage( "lattice" )
 
-    def export_lattice( self, filepath: str ) -> None:
+    def export_lattice( self, filepath: str, preset: str | None = None ) -> None:
         """
         Exportfunktion für das Gitter
 
         :param filepath: Pfad zur Datei
+        :param preset: Toleranzvorgabe der Triangulierung draft, standard oder fine, siehe Export.PRESETS
         """
-        exporters.export( self.get_lattice(), filepath )
+        Export.write_model( self.get_lattice(), filepath, preset )
 
     def get_lattice( self ) -> Workplane:
         """
@@ -247,7 +580,7 @@ class LatticeGenerator:
         """
         if self.lattice.empty():
             raise ValueError( "Es ist kein Gitter vorhanden." )
-        return self.lattice.geometry
+        return self.output( "lattice" )
 
     def delete_lattice( self ):
         """
@@ -256,18 +589,76 @@ class LatticeGenerator:
         self.lattice.reset()
         self.delete_intersected_lattice()
 
-    def intersect_lattice( self ) -> None:
+    def intersect_lattice( self, clip: bool = False, tolerance: float = 1e-2, exact: bool = False,
+                           chunk: int | None = None, fuzzy: tuple[ float, ... ] = Boolean.FUZZY,
+                           finish: bool = True ) -> dict | None:
         """
         Überschneidet das Gitter mit der Eingangsgeometrie
+
+        :param clip: steuert, ob die Streben an einem Dreiecksnetz der Eingangsgeometrie abgeschnitten werden, statt
+                     das gesamte Gitter in einer booleschen Operation zu verschneiden
+        :param tolerance: lineare Toleranz der Triangulierung der Eingangsgeometrie
+        :param exact: steuert, ob die Streben an der Oberfläche exakt mit der Eingangsgeometrie verschnitten werden
+        :param chunk: Anzahl der Zellen je Block der booleschen Operation, standardmäßig alle in einem Block
+        :param fuzzy: aufsteigende unscharfe Toleranzen, mit welchen fehlgeschlagene Zellen wiederholt werden
+        :param finish: steuert, ob die Stufe abgeschlossen wird, andernfalls muss dies über finish_stage erfolgen
+        :return: Bericht der booleschen Operation mit den Zellen, welche eine Wiederholung benötigten, siehe
+                 Geometry.fill. Beim Abschneiden None.
         """
         if self.lattice.empty():
             raise ValueError( "Es ist kein Gitter vorhanden." )
-        if not self.geometry.has_solid_geometry:
+        if self.geometry.empty():
             raise ValueError( "Es ist kein Eingangsmodell verfügbar." )
-        self.geometry.fill( self.lattice )
+        self.output( "model" )
+        if not clip:
+            self.output( "lattice" )
+            # Ein ausgelagertes oder gespeichertes Gitter ohne Körper wird als leerer Verbund wiederhergestellt
+            if len( self.lattice.geometry.solids().vals() ) == 0:
+                raise ValueError( "Das Gitter liegt nur als Graph vor und muss mit clip zurechtgeschnitten werden." )
+        report = self.geometry.fill( self.lattice, clip, tolerance, exact, chunk, fuzzy )
+        if finish:
+            self.finish_stage( "intersected" )
+        return report
+
+    def remove_fragments( self, anchored: bool | None = None, band: float = 1e-3, exact: bool = False,
+                          remove: bool = True, tolerance: float = 1e-2, finish: bool = True ) -> dict:
+        """
+        Entfernt lose Teile des zurechtgeschnittenen Gitters, welche weder mit dem Hauptgitter noch mit der Schale
+        verbunden sind, oder meldet diese nur
+
+        :param anchored: steuert, ob Teile mit Kontakt zur Oberfläche als mit der Schale verbunden gelten,
+                         standardmäßig, wenn eine Schale vorhanden ist
+        :param band: Abstand, bis zu welchem sich zwei Körper oder ein Körper und die Schale berühren
+        :param exact: steuert, ob die Streben an der Oberfläche beim Neuaufbau exakt verschnitten werden
+        :param remove: steuert, ob lose Teile entfernt oder nur gemeldet werden
+        :param tolerance: lineare Toleranz der Triangulierung bei der Abstandsprüfung zwischen Körpern
+        :param finish: steuert, ob die Stufe nach dem Entfernen abgeschlossen wird, andernfalls muss dies über
+                       finish_stage erfolgen
+        :return: Bericht, siehe Geometry.remove_fragments
+        """
+        if not self.geometry.has_lattice_geometry:
+            raise ValueError( "Es ist kein zurechtgeschnittenes Gitter verfügbar." )
+        self.output( "intersected" )
+        if exact:
+            self.output( "model" )
+        if self.geometry.lattice_graph is None and self.geometry.has_shell_geometry:
+            self.output( "shell" )
+
+        report = self.geometry.remove_fragments( anchored, band, exact, remove, tolerance )
+        if remove and report[ "fragments" ] > 0:
+            self.delete_unified()
+            if finish:
+                self.finish_stage( "intersected" )
+        return report
 
-    def export_intersected_lattice(self, filepath: str) -> None:
-        exporters.export( self.get_intersected_lattice(), filepath )
+    def export_intersected_lattice( self, filepath: str, preset: str | None = None ) -> None:
+        """
+        Exportfunktion für das zurechtgeschnittene Gitter
+
+        :param filepath: Pfad zur Datei
+        :param preset: Toleranzvorgabe der Triangulierung draft, standard oder fine, siehe Export.PRESETS
+        """
+        Export.write_model( self.get_intersected_lattice(), filepath, preset )
 
     def get_intersected_lattice( self ) -> Workplane:
         """
@@ -275,20 +666,173 @@ class LatticeGenerator:
         """
         if not self.geometry.has_lattice_geometry:
             raise ValueError( "Es ist kein zurechtgeschnittenes Gitter verfügbar." )
-        return self.geometry.lattice_geometry
+        return self.output( "intersected" )
+
+    def get_graph( self, intersected: bool = False ) -> StrutGraph:
+        """
+        Rückgabefunktion für den Graphen des Gitters
+
+        :param intersected: steuert, ob der Graph des zurechtgeschnittenen Gitters zurückgegeben wird
+        :return: Graph des Gitters
+        """
+        graph = self.geometry.lattice_graph if intersected else self.lattice.graph
+        if graph is None or graph.empty():
+            raise ValueError( "Es ist kein Graph des Gitters vorhanden. Das Gitter muss mit clip zurechtgeschnitten "
+                              "werden." if intersected else "Es ist kein Gitter vorhanden." )
+        return graph
+
+    def check_manufacturability( self, intersected: bool = False, shell: bool = True, tolerance: float = 1e-2,
+                                 **kwargs ) -> dict:
+        """
+        Prüft die Fertigbarkeit des Gitters anhand seines Graphen, bevor die Geometrie verschnitten und verschmolzen
+        wird
+
+        :param intersected: steuert, ob der Graph des zurechtgeschnittenen Gitters geprüft wird
+        :param shell: steuert, ob die Schale, sofern vorhanden, bei der Suche nach Hohlräumen berücksichtigt wird
+        :param tolerance: lineare Toleranz der Triangulierung der Schale
+        :param kwargs: Grenzwerte der Prüfung, siehe Manufacturability.analyze
+        :return: Bericht der Prüfung
+        """
+        graph = self.get_graph( intersected )
+        mesh = None
+        if shell and self.geometry.has_shell_geometry and kwargs.get( "voids", True ):
+            self.output( "shell" )
+            mesh = self.geometry.shell_properties( tolerance )[ 3 ]
+        return Manufacturability.analyze( graph, shell = mesh, **kwargs )
+
+    def fingerprint( self, stage: str = "unified", workers: int | None = None, tolerance: float = 1e-6 ) -> Fingerprint:
+        """
+        Erstellt einen Fingerabdruck des Ergebnisses einer Stufe aus Volumen, Oberfläche, Schwerpunkt,
+        Trägheitstensor, Anzahl der Flächen und Körper sowie einer Prüfsumme des Graphen. Die Eigenschaften werden je
+        Körper berechnet, Kopien der Elementarzelle nur einmal, siehe Fingerprint.properties.
+
+        :param stage: Stufe cell, lattice, intersected oder unified
+        :param workers: Anzahl der Prozesse für die Eigenschaften der Körper
+        :param tolerance: Rasterweite der Koordinaten in der Prüfsumme des Graphen
+        :return: Fingerabdruck
+        """
+        if stage == "cell":
+            shape = self.get_unitary_cell()
+            graph = StrutGraph.from_configuration( self.cell.config )
+        elif stage == "lattice":
+            shape, graph = self.get_lattice(), self.lattice.graph
+        elif stage == "intersected":
+            shape, graph = self.get_intersected_lattice(), self.geometry.lattice_graph
+        elif stage == "unified":
+            shape, graph = self.get_unified(), self.geometry.lattice_graph
+        else:
+            raise ValueError( f"Für die Stufe { stage } kann kein Fingerabdruck erstellt werden." )
+        return Fingerprint.create( shape, graph, workers, tolerance )
+
+    def mass_properties( self, density: float = 1., samples: int = 512, check: int = 0, seed: int | None = None,
+                         tolerance: float = 1e-2 ) -> dict:
+        """
+        Masse, Volumen, Oberfläche und Schwerpunkt des fertigen Bauteils, ohne die verschmolzene Geometrie in
+        OpenCascade zu integrieren. Die Schale wird einmal ausgewertet, das Gitter analytisch aus dessen Graphen, siehe
+        Mass.union. Die Streben werden dazu an der Eingangsgeometrie abgeschnitten, ihr Anteil im Material der Schale
+        wird abgetastet. Nach einem booleschen Verschnitt werden die an den Zellgrenzen und an der Oberfläche schräg
+        geschnittenen Enden als eben angenähert.
+
+        :param density: Dichte des Werkstoffs
+        :param samples: Anzahl der Abtastpunkte je Strebe für die Überschneidungen
+        :param check: Anzahl zufällig gewählter Zellen, welche mit OpenCascade gegengeprüft werden, bei 0 keine
+        :param seed: Startwert des Zufallsgenerators der Gegenprüfung
+        :param tolerance: lineare Toleranz der Triangulierung von Schale und Eingangsgeometrie
+        :return: Volumen, Masse, Oberfläche und Schwerpunkt des Bauteils, die Anteile von Schale und Gitter unter shell
+                 und lattice, siehe Mass.lattice, sowie mit check die Gegenprüfung, siehe Mass.cross_check
+        """
+        model = self.geometry.mesh
+        if model is None and not self.geometry.empty():
+            model = TriangleMesh.from_workplane( self.output( "model" ), tolerance )
+        if self.geometry.lattice_graph is not None:
+            graph = self.geometry.lattice_graph
+        else:
+            if model is None:
+                raise ValueError( "Es ist kein Eingangsmodell verfügbar." )
+            graph = self.get_graph().clip( model )
+        if not graph.complete:
+            raise ValueError( "Die Masseeigenschaften können nur für Elementarzellen berechnet werden, welche "
+                              "ausschließlich aus Streben bestehen." )
+
+        shell: dict = { "volume": 0., "area": 0., "centroid": np.zeros( 3 ) }
+        mesh = None
+        if self.geometry.has_shell_geometry:
+            self.output( "shell" )
+            volume, area, centroid, mesh = self.geometry.shell_properties( tolerance )
+            shell = { "volume": volume, "area": area, "centroid": centroid }
+
+        # Abgeschnittene Enden liegen ohne Schale auf der Oberfläche, mit Schale wie beim Abschneiden in deren Material
+        struts = Mass.struts( graph, self.geometry.lattice_graph is not None or mesh is not None, model )
+        lattice = Mass.lattice( struts, mesh, samples )
+        volume = shell[ "volume" ] + lattice[ "volume" ]
+        centroid = ( shell[ "volume" ] * shell[ "centroid" ] + lattice[ "volume" ] * lattice[ "centroid" ] ) / volume \
+            if volume > 0. else np.zeros( 3 )
+        result = { "volume": volume, "mass": density * volume,
+                   "area": shell[ "area" ] - lattice[ "covered" ] + lattice[ "area" ], "centroid": centroid,
+                   "shell": shell, "lattice": lattice }
+        if check > 0:
+            result[ "check" ] = Mass.cross_check( struts, check, seed, samples )
+        return result
+
+    def export_beam_lattice( self, filepath: str, intersected: bool = True, shell: bool = True,
+                             tolerance: float = 1e-2 ) -> None:
+        """
+        Exportiert das Gitter als 3MF-Balkengitter direkt aus dem Graphen, ohne die Streben zu triangulieren. Ein
+        nicht zurechtgeschnittenes Gitter wird mit der Eingangsgeometrie als Schnittnetz exportiert.
+
+        :param filepath: Pfad zur 3MF-Datei
+        :param intersected: steuert, ob das zurechtgeschnittene Gitter exportiert wird
+        :param shell: steuert, ob die Schale als Dreiecksnetz mit exportiert wird
+        :param tolerance: lineare Toleranz der Triangulierung von Schale und Eingangsgeometrie
+        """
+        graph = self.get_graph( intersected )
+        shell_mesh = TriangleMesh.from_workplane( self.get_shell(), tolerance ) \
+            if shell and self.geometry.has_shell_geometry else None
+        clipping = None
+        if not intersected and not self.geometry.empty():
+            clipping = self.geometry.mesh if self.geometry.mesh is not None else \
+                TriangleMesh.from_workplane( self.get_initial_model(), tolerance )
+        Export.write_3mf( filepath, graph, shell_mesh, clipping )
+
+    def export_beam_model( self, filepath: str, intersected: bool = True ) -> None:
+        """
+        Exportiert das Gitter als Balkenmodell für eine Berechnung mit Balkenelementen. Das Format wird anhand der
+        Dateiendung gewählt, .vtk für VTK und .h5 oder .hdf5 für HDF5. Bei einem hybriden Gitter wird der Index des
+        Bereichs je Strebe mit ausgegeben.
+
+        :param filepath: Pfad zur Datei
+        :param intersected: steuert, ob das zurechtgeschnittene Gitter exportiert wird
+        """
+        graph = self.get_graph( intersected )
+        regions = Hybrid.labels( self.regions, graph.cells ) if self.regions else None
+        extension = os.path.splitext( filepath )[ 1 ].lower()
+        if extension == ".vtk":
+            Export.write_vtk( filepath, graph, regions )
+        elif extension in ( ".h5", ".hdf5" ):
+            Export.write_hdf5( filepath, graph, regions )
+        else:
+            raise ValueError( f"Unbekanntes Format für das Balkenmodell: { extension }" )
 
     def delete_intersected_lattice( self ):
         """
         Lösch das zurechtgeschnittene Gitter
         """
-        self.geometry.core = None
-        self.geometry.has_core = False
+        self.geometry.lattice_geometry = None
+        self.geometry.lattice_graph = None
+        self.geometry.has_lattice_geometry = False
         self.delete_unified()
 
-    def unify( self ) -> None:
+    def unify( self, boundary: bool = False, band: float = 1e-3, chunk: int | None = None,
+               fuzzy: tuple[ float, ... ] = Boolean.FUZZY ) -> dict:
         """
         Verschmelzen des zurechtgeschnittenen Gitters und der
         Schalengeometrie
+
+        :param boundary: steuert, ob nur die Schale berührende Teile des Gitters verschmolzen werden
+        :param band: Abstand zur Schale, bis zu welchem ein Teil des Gitters als berührend gilt
+        :param chunk: Anzahl der Teile des Gitters je Block der booleschen Operation, standardmäßig alle in einem Block
+        :param fuzzy: aufsteigende unscharfe Toleranzen, mit welchen fehlgeschlagene Teile wiederholt werden
+        :return: Bericht der booleschen Operation, siehe Geometry.merge
         """
         if not self.geometry.has_lattice_geometry:
             raise ValueError(
@@ -296,15 +840,20 @@ class LatticeGenerator:
         if not self.geometry.has_shell_geometry:
             raise ValueError(
                 "Es ist kein Schalenobjekt vorhanden." )
-        self.geometry.merge()
+        self.output( "intersected" )
+        self.output( "shell" )
+        report = self.geometry.merge( boundary, band, chunk, fuzzy )
+        self.finish_stage( "unified" )
+        return report
 
-    def export_unified( self, filepath: str ) -> None:
+    def export_unified( self, filepath: str, preset: str | None = None ) -> None:
         """
         Exportfunktion für die Schalengeometrie mit Gitterkern
 
         :param filepath: Pfad zur Datei
+        :param preset: Toleranzvorgabe der Triangulierung draft, standard oder fine, siehe Export.PRESETS
         """
-        exporters.export( self.get_unified(), filepath )
+        Export.write_model( self.get_unified(), filepath, preset )
 
     def get_unified(self) -> Workplane:
         """
@@ -315,7 +864,7 @@ class LatticeGenerator:
         if not self.geometry.has_union_geometry:
             raise ValueError(
                 "Es ist kein Modell mit Gitter vorhanden.")
-        return self.geometry.union_geometry
+        return self.output( "unified" )
 
     def delete_unified(self):
         """
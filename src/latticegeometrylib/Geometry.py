@@ -1,28 +1,112 @@
-from cadquery import Workplane
+from cadquery import Workplane, Compound, Shape, Solid, Vector, Location
+from OCP.BRepExtrema import BRepExtrema_DistShapeShape
+from OCP.gp import gp_Trsf
+import numpy as np
 import math
 from . import Lattice
 Lattice = Lattice.Lattice
 from . import Miscellaneous
 BoundingBox = Miscellaneous.BoundingBox
+from . import Graph
+StrutGraph = Graph.StrutGraph
+from . import Boolean
+from . import Fingerprint
+from . import Mesh
+TriangleMesh = Mesh.TriangleMesh
+BoundingVolumeHierarchy = Mesh.BoundingVolumeHierarchy
+
+
+def _boxes( shapes: list[ Shape ] ) -> np.ndarray:
+    """
+    Begrenzungsquader der gegebenen Körper als Feld mit den Spalten xmin, ymin, zmin, xmax, ymax, zmax
+    """
+    boxes = [ shape.BoundingBox() for shape in shapes ]
+    return np.array( [ [ b.xmin, b.ymin, b.zmin, b.xmax, b.ymax, b.zmax ] for b in boxes ] ).reshape( -1, 6 )
+
+
+def _retreat( mesh: TriangleMesh, points: np.ndarray, outward: np.ndarray, radii: np.ndarray ) -> np.ndarray:
+    """
+    Rückzug abgeschnittener Enden entlang der Achse, sodass die Deckfläche hinter den Ebenen aller Dreiecke liegt,
+    welche näher als der Radius am Ende liegen. Für eine Strebe im Winkel θ zur Flächennormale auf der Oberfläche
+    ergibt sich r·tan θ, die Deckfläche berührt die Oberfläche dann von innen.
+
+    :param mesh: Dreiecksnetz der Eingangsgeometrie
+    :param points: abgeschnittene Enden, Form (n, 3)
+    :param outward: Richtung der Achse zum Ende hin, Form (n, 3)
+    :param radii: Radien, Form (n,)
+    :return: Rückzug je Ende, Form (n,)
+    """
+    end, triangle = mesh.hierarchy.boxes( points - radii[ :, None ], points + radii[ :, None ] )
+    corners = mesh.vertices[ mesh.triangles[ triangle ] ]
+    near = Mesh._point_triangle_distances( points[ end ], corners[ :, 0 ], corners[ :, 1 ], corners[ :, 2 ] ) < \
+        radii[ end ]
+
+    normals = mesh.normals()[ triangle ]
+    cosines = np.einsum( 'ij,ij->i', normals, outward[ end ] )
+    sines = np.sqrt( np.clip( 1. - cosines ** 2, 0., None ) )
+    # Parallel zur Ebene verlaufende Achsen lassen sich durch Rückzug nicht hinter diese bringen
+    valid = near & ( cosines > 1e-9 )
+    needed = ( np.einsum( 'ij,ij->i', normals, points[ end ] - corners[ :, 0 ] ) + radii[ end ] * sines ) / \
+        np.where( valid, cosines, 1. )
+
+    retreat = np.zeros( len( points ) )
+    np.maximum.at( retreat, end[ valid ], needed[ valid ] )
+    return retreat
+
+
+def _segments( graph: StrutGraph, exact: bool = False,
+               mesh: TriangleMesh | None = None ) -> tuple[ np.ndarray, np.ndarray, np.ndarray ]:
+    """
+    Achsen der Körper eines zurechtgeschnittenen Graphen. Abgeschnittene Enden werden bei exaktem Verschnitt um den
+    Radius verlängert, andernfalls zurückgezogen, mit Dreiecksnetz so weit, dass die Deckfläche innerhalb der
+    Eingangsgeometrie liegt, siehe _retreat, ohne Dreiecksnetz um den Radius. Streben, deren Achse dadurch entfällt,
+    beginnen in ihrem Endpunkt.
+
+    :param graph: zurechtgeschnittener Graph
+    :param exact: steuert, ob die Enden für den exakten Verschnitt verlängert werden
+    :param mesh: Dreiecksnetz der Eingangsgeometrie für den Rückzug der Enden
+    :return: Start- und Endpunkte, Form (n, 3), sowie Radien, Form (n,)
+    """
+    starts, ends = graph.starts(), graph.ends()
+    radii = graph.diameters / 2.
+    direction = ends - starts
+    direction /= np.linalg.norm( direction, axis = 1 )[ :, None ]
+
+    trimmed = graph.trimmed
+    offsets = np.where( trimmed, radii[ :, None ] if exact else - radii[ :, None ], 0. )
+    if not exact and mesh is not None:
+        for side, points, outward in ( ( 0, starts, - direction ), ( 1, ends, direction ) ):
+            offsets[ trimmed[ :, side ], side ] = - _retreat( mesh, points[ trimmed[ :, side ] ],
+                                                              outward[ trimmed[ :, side ] ],
+                                                              radii[ trimmed[ :, side ] ] )
+    starts = starts - offsets[ :, 0, None ] * direction
+    ends = ends + offsets[ :, 1, None ] * direction
+    heights = np.einsum( 'ij,ij->i', ends - starts, direction )
+    starts[ heights <= 0. ] = ends[ heights <= 0. ]
+    return starts, ends, radii
 
 
 class Geometry:
     """
     Beinhaltet die Eingangsgeometrie und fügt in diese ein Gitter ein
     """
-    def __init__( self, solid: Workplane | None = None):
+    def __init__( self, solid: Workplane | None = None, mesh: TriangleMesh | None = None ):
         """
         Initialisierung der Geometrie mit einer Eingangsgeometrie
 
         :param solid: Eingangsgeometrie
+        :param mesh: Eingangsgeometrie als geschlossenes Dreiecksnetz, etwa aus einer STL-Datei
         """
         self.solid_geometry: Workplane | None = solid
         self.has_solid_geometry: bool = True
+        self.mesh: TriangleMesh | None = mesh
 
         self.shell_geometry: Workplane | None = None
         self.has_shell_geometry: bool = False
+        self.shell_cache: dict[ float, tuple[ float, float, np.ndarray, TriangleMesh ] ] = {}
 
         self.lattice_geometry: Workplane | None = None
+        self.lattice_graph: StrutGraph | None = None
         self.has_lattice_geometry : bool = False
 
         self.union_geometry: Workplane | None = None
@@ -31,11 +115,43 @@ class Geometry:
         if solid is None:
             self.has_solid_geometry = False
 
-    def bounding_box( self ) -> BoundingBox:
-        if not self.has_solid_geometry:
+    def empty( self ) -> bool:
+        """
+        Prüft, ob eine Eingangsgeometrie als B-Rep oder als Dreiecksnetz vorhanden ist
+
+        :return: True, wenn keine Eingangsgeometrie vorhanden ist
+        """
+        return not self.has_solid_geometry and self.mesh is None
+
+    def input( self ) -> Workplane | TriangleMesh:
+        """
+        :return: Eingangsgeometrie als B-Rep oder, falls nur dieses vorhanden ist, als Dreiecksnetz
+        """
+        if self.empty():
             raise ValueError( "Es ist keine Eingangsgeometrie vorhanden." )
-        bb = BoundingBox( self.solid_geometry )
-        return bb
+        return self.solid_geometry if self.has_solid_geometry else self.mesh
+
+    def bounding_box( self, rotation: np.ndarray | None = None ) -> BoundingBox:
+        """
+        Begrenzungsquader der Eingangsgeometrie, auf Wunsch orientiert in einem gedrehten Koordinatensystem
+
+        :param rotation: Drehmatrix, deren Spalten die Achsen des Koordinatensystems sind. Der Quader wird in den
+                         Koordinaten dieses Systems ausgegeben.
+        :return: Begrenzungsquader
+        """
+        if self.empty():
+            raise ValueError( "Es ist keine Eingangsgeometrie vorhanden." )
+        if not self.has_solid_geometry:
+            if rotation is None:
+                return BoundingBox.from_bounds( *self.mesh.bounds() )
+            vertices = self.mesh.vertices @ np.asarray( rotation, dtype = float )
+            return BoundingBox.from_bounds( tuple( vertices.min( axis = 0 ) ), tuple( vertices.max( axis = 0 ) ) )
+        if rotation is None:
+            bb = BoundingBox( self.solid_geometry )
+            return bb
+        inverse = gp_Trsf()
+        inverse.SetValues( *( value for row in np.asarray( rotation, dtype = float ).T.tolist() for value in row + [ 0. ] ) )
+        return BoundingBox( Workplane( obj = self.solid_geometry.val().moved( Location( inverse ) ) ) )
 
     def shell( self, inner_thickness: float = 0.,
                outer_thickness: float = 0.,
@@ -47,12 +163,17 @@ class Geometry:
         :param outer_thickness: Nach außen gerichtete Aufdickung der Oberfläche der Geometrie
         :param shell_geometry: importierte Schalengeometrie, falls extern erzeugt
         """
+        self.shell_cache = {}
 
         if not shell_geometry is None:
             self.shell_geometry = shell_geometry
             self.has_shell_geometry = True
             return
 
+        if not self.has_solid_geometry:
+            raise ValueError( "Die Schale kann nur aus einer B-Rep-Geometrie erzeugt werden. Für Dreiecksnetze muss "
+                              "die Schale importiert werden." )
+
         try:
             if inner_thickness  == 0. and not outer_thickness == 0.:
                 self.shell_geometry = self.solid_geometry.shell( math.fabs( outer_thickness ) )
@@ -80,22 +201,159 @@ class Geometry:
 
         self.has_shell_geometry = True
 
-    def fill( self, lattice: Lattice ) -> None:
+    def shell_properties( self, tolerance: float = 1e-2 ) -> tuple[ float, float, np.ndarray, TriangleMesh ]:
         """
-        Erstellt eine Überschneidung aus Gitter und Eingangsgeometrie
+        Volumen, Oberfläche und Schwerpunkt der Schale sowie deren Dreiecksnetz. Die Werte werden je Toleranz nur
+        einmal berechnet und bis zur nächsten Änderung der Schale vorgehalten.
+
+        :param tolerance: lineare Toleranz der Triangulierung
+        :return: Volumen, Oberfläche, Schwerpunkt und Dreiecksnetz der Schale
+        """
+        if not self.has_shell_geometry:
+            raise ValueError( "Es ist keine Schalengeometrie vorhanden." )
+        if tolerance not in self.shell_cache:
+            volume, area, centroid, _ = Fingerprint.combine( Fingerprint.properties( self.shell_geometry ) )
+            self.shell_cache[ tolerance ] = volume, area, centroid, TriangleMesh.from_workplane( self.shell_geometry,
+                                                                                                tolerance )
+        return self.shell_cache[ tolerance ]
+
+    def fill( self, lattice: Lattice, clip: bool = False, tolerance: float = 1e-2, exact: bool = False,
+              chunk: int | None = None, fuzzy: tuple[ float, ... ] = Boolean.FUZZY ) -> dict | None:
+        """
+        Erstellt eine Überschneidung aus Gitter und Eingangsgeometrie. Die boolesche Operation wird blockweise
+        ausgeführt und jedes Teilergebnis geprüft. Fehlgeschlagene Blöcke werden geteilt, einzelne Zellen mit
+        steigender unscharfer Toleranz und zuletzt mit vieleckigen Streben wiederholt, siehe Boolean.intersect.
 
         :param lattice: regelmäßiges Gitter
+        :param clip: steuert, ob statt der booleschen Operation über das gesamte Gitter die Streben des Gitters
+                     an einem Dreiecksnetz der Eingangsgeometrie abgeschnitten werden. Liegt die Eingangsgeometrie
+                     nur als Dreiecksnetz vor, wird stets abgeschnitten.
+        :param tolerance: lineare Toleranz der Triangulierung der Eingangsgeometrie
+        :param exact: steuert, ob die Streben an der Oberfläche exakt mit der Eingangsgeometrie verschnitten werden
+        :param chunk: Anzahl der Zellen je Block der booleschen Operation, standardmäßig alle in einem Block
+        :param fuzzy: aufsteigende unscharfe Toleranzen der Wiederholungen einzelner Zellen
+        :return: Bericht der booleschen Operation, siehe Boolean._isolate, mit den Indizes der Zellen, welche eine
+                 Wiederholung benötigten, unter cells. Beim Abschneiden None.
         """
-        if not self.has_solid_geometry:
+        if self.empty():
             raise ValueError( "Es ist keine Eingangsgeometrie vorhanden." )
 
-        self.lattice_geometry = self.solid_geometry.intersect(
-            lattice.geometry, clean = False )
+        if clip or not self.has_solid_geometry:
+            self.clip( lattice.graph, self._clip_mesh( tolerance ), exact, tolerance )
+            return None
+
+        pieces: list[ Shape ] = lattice.geometry.vals()
+        # Körper hybrider Gitter entsprechen nicht den Zellen, auch wenn deren Anzahl übereinstimmt
+        cellwise = lattice.initialized and len( pieces ) == len( lattice.cells )
+        fallback = None
+
+        if cellwise and lattice.graph.complete and not lattice.graph.empty():
+            # Streben einer Zelle über die Mittelpunkte, da geteilte Streben nur einer Zelle zugeordnet sind
+            graph = lattice.graph
+            starts, ends, radii = graph.starts(), graph.ends(), graph.diameters / 2.
+            middles = ( starts + ends ) / 2. @ lattice.rotation
+            half = np.array( lattice.cell_size.toTuple() ) / 2. + 1e-9
+            centers = lattice.centers() @ lattice.rotation
+
+            def fallback( index: int ) -> Shape | None:
+                """
+                Zelle aus vieleckigen Streben
+                """
+                struts = np.flatnonzero( np.all( np.abs( middles - centers[ index ] ) <= half, axis = 1 ) )
+                return Boolean.polygonal_struts( starts[ struts ], ends[ struts ], radii[ struts ] )
+
+        solids, report = Boolean.intersect( self.solid_geometry.val(), pieces, chunk, fuzzy, fallback )
+        if cellwise:
+            helped = np.concatenate( ( report[ "fuzzy" ], report[ "fallback" ], report[ "failed" ] ) )
+            report[ "cells" ] = lattice.cells[ np.sort( helped ) ]
+
+        self.lattice_geometry = Workplane( obj = Compound.makeCompound( solids ) )
+        self.has_lattice_geometry = True
+        return report
+
+    def _clip_mesh( self, tolerance: float = 1e-2 ) -> TriangleMesh:
+        """
+        Dreiecksnetz der Eingangsgeometrie für das Abschneiden, das gegebene Netz oder die Triangulierung der B-Rep
+
+        :param tolerance: lineare Toleranz der Triangulierung
+        :return: Dreiecksnetz
+        """
+        return self.mesh if self.mesh is not None else TriangleMesh.from_workplane( self.solid_geometry, tolerance )
+
+    def clip( self, graph: StrutGraph, mesh: TriangleMesh, exact: bool = False, tolerance: float = 1e-2 ) -> None:
+        """
+        Schneidet die Streben des Gitters am Dreiecksnetz der Eingangsgeometrie ab und erzeugt nur für die
+        verbleibenden Streben Körper, ohne das Gitter als Ganzes mit der Eingangsgeometrie zu verschneiden.
+        Abgeschnittene Enden werden entlang der Achse so weit zurückgezogen, dass die Deckfläche an der Oberfläche
+        innerhalb der Eingangsgeometrie liegt und diese von innen berührt, siehe _retreat. Die Streben reichen damit
+        unabhängig von ihrem Winkel zur Oberfläche bis an eine Schale heran. Streben, deren Achse ohne Schnitt näher
+        als der Radius an der Oberfläche verläuft, ragen dabei weiterhin bis zu ihrem Radius über die Oberfläche
+        hinaus. Mit einer Schale liegt dieser Überstand in deren Material, sofern die äußere Dicke den Überstand
+        aufnimmt, andernfalls ist der exakte Verschnitt zu wählen. Dieser verlängert abgeschnittene Enden um den
+        Radius und verschneidet jede Strebe, deren Abstand zur Oberfläche kleiner als ihr Radius ist, einzeln mit der
+        Eingangsgeometrie, sodass kein Material außerhalb verbleibt.
+
+        :param graph: Graph des Gitters
+        :param mesh: Dreiecksnetz der Eingangsgeometrie
+        :param exact: steuert, ob die Streben an der Oberfläche exakt verschnitten werden
+        :param tolerance: lineare Toleranz des Dreiecksnetzes, um welche der Abstand für den exakten Verschnitt
+                          erweitert wird
+        """
+        if not graph.complete:
+            raise ValueError( "Das Abschneiden ist nur für Elementarzellen möglich, welche ausschließlich aus Streben "
+                              "bestehen." )
+        if exact and not self.has_solid_geometry:
+            raise ValueError( "Der exakte Verschnitt erfordert eine B-Rep-Geometrie als Eingangsgeometrie." )
+
+        self.lattice_graph = graph.clip( mesh )
+        self.lattice_geometry = self._struts( self.lattice_graph, mesh, exact, tolerance )
         self.has_lattice_geometry = True
 
-    def merge( self ) -> None:
+    def _struts( self, graph: StrutGraph, mesh: TriangleMesh, exact: bool = False,
+                 tolerance: float = 1e-2 ) -> Workplane:
         """
-        Vereinigt den Kern mit der Schale
+        Erzeugt die Körper der Streben eines zurechtgeschnittenen Graphen. Abgeschnittene Enden werden zurückgezogen
+        oder bei exaktem Verschnitt verlängert, siehe _segments. Bei exaktem Verschnitt wird jede Strebe, deren Achse
+        näher als Radius und Toleranz an der Oberfläche liegt, mit der Eingangsgeometrie verschnitten.
+
+        :param graph: zurechtgeschnittener Graph
+        :param mesh: Dreiecksnetz der Eingangsgeometrie
+        :param exact: steuert, ob die Streben an der Oberfläche exakt verschnitten werden
+        :param tolerance: lineare Toleranz des Dreiecksnetzes
+        :return: Streben als Verbund
+        """
+        radii = graph.diameters / 2.
+        cuts = np.zeros( len( graph ), dtype = bool )
+        if exact:
+            cuts = mesh.segment_distance( graph.starts(), graph.ends(), radii + tolerance ) < radii + tolerance
+        starts, ends, radii = _segments( graph, exact, mesh )
+        direction = ends - starts
+        heights = np.linalg.norm( direction, axis = 1 )
+        direction /= np.where( heights > 0., heights, 1. )[ :, None ]
+
+        solid: Shape | None = self.solid_geometry.val() if exact else None
+        struts: list[ Shape ] = []
+
+        for start, axis, height, radius, cut in zip( starts.tolist(), direction.tolist(), heights.tolist(),
+                                                     radii.tolist(), cuts.tolist() ):
+            if height <= 0.:
+                continue
+            strut = Solid.makeCylinder( radius, height, Vector( *start ), Vector( *axis ) )
+            if cut:
+                struts += solid.intersect( strut ).Solids()
+            else:
+                struts.append( strut )
+
+        return Workplane( obj = Compound.makeCompound( struts ) )
+
+    def contact( self, band: float = 1e-3 ) -> tuple[ list[ Shape ], list[ Shape ] ]:
+        """
+        Teilt die Körper des zurechtgeschnittenen Gitters in solche, welche die Schale innerhalb des gegebenen Abstands
+        berühren, und solche ohne Kontakt. Über die Begrenzungsquader der Körper und der Schalenflächen werden zunächst
+        Kandidaten ermittelt, deren Abstand zur Schale anschließend genau berechnet wird.
+
+        :param band: Abstand zur Schale, bis zu welchem ein Körper als berührend gilt
+        :return: Körper mit Kontakt und Körper ohne Kontakt zur Schale
         """
         if not self.has_shell_geometry:
             raise ValueError( "Es ist keine Schalengeometrie vorhanden." )
@@ -103,8 +361,198 @@ class Geometry:
         if not self.has_lattice_geometry:
             raise ValueError( "Es ist kein Gitter als Kern vorhanden." )
 
-        self.union_geometry = self.shell_geometry.union( self.lattice_geometry, clean = False )
+        pieces: list[ Shape ] = self.lattice_geometry.solids().vals()
+        touching = self._touching( pieces, band )
+        return [ piece for piece, flag in zip( pieces, touching ) if flag ], \
+            [ piece for piece, flag in zip( pieces, touching ) if not flag ]
+
+    def _touching( self, pieces: list[ Shape ], band: float ) -> np.ndarray:
+        """
+        Prüft für jeden Körper, ob dieser die Schale innerhalb des gegebenen Abstands berührt
+
+        :param pieces: Körper
+        :param band: Abstand zur Schale, bis zu welchem ein Körper als berührend gilt
+        :return: boolesches Feld mit einem Eintrag je Körper
+        """
+        shell: Shape = self.shell_geometry.val()
+
+        faces = _boxes( shell.Faces() )
+        solids = _boxes( pieces )
+        solids[ :, :3 ] -= band
+        solids[ :, 3: ] += band
+
+        candidates = np.zeros( len( pieces ), dtype = bool )
+        for start in range( 0, len( pieces ), 4096 ):
+            chunk = solids[ start: start + 4096 ]
+            overlap = np.all( ( chunk[ :, None, :3 ] <= faces[ None, :, 3: ] ) &
+                              ( chunk[ :, None, 3: ] >= faces[ None, :, :3 ] ), axis = 2 )
+            candidates[ start: start + 4096 ] = np.any( overlap, axis = 1 )
+
+        distance = BRepExtrema_DistShapeShape()
+        distance.LoadS1( shell.wrapped )
+
+        touching = np.zeros( len( pieces ), dtype = bool )
+        for index in np.flatnonzero( candidates ):
+            distance.LoadS2( pieces[ index ].wrapped )
+            distance.Perform()
+            touching[ index ] = distance.IsDone() and distance.Value() <= band
+
+        return touching
+
+    def remove_fragments( self, anchored: bool | None = None, band: float = 1e-3, exact: bool = False,
+                          remove: bool = True, tolerance: float = 1e-2 ) -> dict:
+        """
+        Sucht Teile des zurechtgeschnittenen Gitters, welche weder mit dem Hauptgitter noch mit der Schale verbunden
+        sind und lose gedruckt würden. Die Zusammenhangskomponenten werden über den Graphen des Gitters bestimmt,
+        wenn dieses abgeschnitten wurde, andernfalls über die Körper, deren Abstand auf den Dreiecksnetzen der Körper
+        höchstens band beträgt. Das Hauptgitter ist die Komponente mit dem größten Volumen.
+
+        :param anchored: steuert, ob Komponenten mit Kontakt zur Oberfläche als mit der Schale verbunden gelten,
+                         standardmäßig, wenn eine Schale vorhanden ist
+        :param band: Abstand, bis zu welchem sich zwei Körper oder ein Körper und die Schale berühren
+        :param exact: steuert, ob die Streben an der Oberfläche beim Neuaufbau exakt verschnitten werden, wie
+                      beim Abschneiden des Gitters
+        :param remove: steuert, ob lose Teile entfernt oder nur gemeldet werden
+        :param tolerance: lineare Toleranz der Triangulierung der Körper, welche dem Abstand zugeschlagen wird
+        :return: Bericht mit der Anzahl der Komponenten unter components, der losen Komponenten unter fragments
+                 und der Indizes der losen Streben oder Körper unter struts oder solids
+        """
+        if not self.has_lattice_geometry:
+            raise ValueError( "Es ist kein zurechtgeschnittenes Gitter verfügbar." )
+        anchored = self.has_shell_geometry if anchored is None else anchored
+
+        if self.lattice_graph is not None:
+            graph = self.lattice_graph
+            if graph.empty():
+                return { "components": 0, "fragments": 0, "struts": np.zeros( 0, dtype = np.int64 ) }
+            starts, ends, radii = graph.starts(), graph.ends(), graph.diameters / 2.
+
+            # Streben berühren sich auch ohne gemeinsamen Knoten, etwa wenn sich Diagonalen in der Zellmitte kreuzen
+            lower = np.minimum( starts, ends ) - ( radii + band / 2. )[ :, None ]
+            upper = np.maximum( starts, ends ) + ( radii + band / 2. )[ :, None ]
+            first, second = BoundingVolumeHierarchy( lower, upper ).boxes( lower, upper )
+            candidates = ( first < second ) & np.all( ( lower[ first ] <= upper[ second ] ) &
+                                                      ( upper[ first ] >= lower[ second ] ), axis = 1 )
+            first, second = first[ candidates ], second[ candidates ]
+            gaps = Mesh.segment_segment_distances( starts[ first ], ends[ first ], starts[ second ],
+                                                   ends[ second ] ) - radii[ first ] - radii[ second ]
+            edges = np.stack( ( first, second ), axis = 1 )[ gaps <= band ]
+
+            labels = Graph.components( len( graph ), edges )
+            volumes = np.bincount( labels, weights = np.pi / 4. * graph.diameters ** 2 * graph.lengths(),
+                                   minlength = len( graph ) )
+            connected = np.zeros( len( graph ), dtype = bool )
+            connected[ np.argmax( volumes ) ] = True
+            if anchored:
+                connected[ labels[ np.any( graph.trimmed, axis = 1 ) ] ] = True
+
+            loose = np.flatnonzero( ~ connected[ labels ] )
+            report = { "components": len( np.unique( labels ) ), "fragments": len( np.unique( labels[ loose ] ) ),
+                       "struts": loose }
+            if remove and len( loose ) > 0:
+                self.lattice_graph = graph.subset( connected[ labels ] )
+                self.lattice_geometry = self._struts( self.lattice_graph, self._clip_mesh( tolerance ), exact,
+                                                      tolerance )
+            return report
+
+        pieces: list[ Shape ] = self.lattice_geometry.solids().vals()
+        if len( pieces ) == 0:
+            return { "components": 0, "fragments": 0, "solids": np.zeros( 0, dtype = np.int64 ) }
+
+        # Abstandsprüfung zwischen den Eckpunkten und Dreiecken der triangulierten Körper, da exakte Abstände
+        # gekrümmter Körper für jedes Paar sehr aufwendig sind
+        vertices: list[ np.ndarray ] = []
+        triangles: list[ np.ndarray ] = []
+        count = 0
+        for piece in pieces:
+            points, faces = piece.tessellate( tolerance, 0.5 )
+            vertices.append( np.array( [ point.toTuple() for point in points ] ).reshape( -1, 3 ) )
+            triangles.append( np.array( faces, dtype = np.int64 ).reshape( -1, 3 ) + count )
+            count += len( points )
+
+        owners = np.repeat( np.arange( len( pieces ) ), [ len( v ) for v in vertices ] )
+        points, corners = np.concatenate( vertices ), np.concatenate( triangles )
+        corner_points = points[ corners ]
+        reach = band + tolerance
+        hierarchy = BoundingVolumeHierarchy( corner_points.min( axis = 1 ), corner_points.max( axis = 1 ) )
+        vertex, triangle = hierarchy.boxes( points - reach, points + reach )
+
+        other = owners[ vertex ] != owners[ corners[ triangle, 0 ] ]
+        vertex, triangle = vertex[ other ], triangle[ other ]
+        close = Mesh._point_triangle_distances( points[ vertex ], *corner_points[ triangle ].transpose( 1, 0, 2 ) ) \
+            <= reach
+        edges = np.stack( ( owners[ vertex[ close ] ], owners[ corners[ triangle[ close ], 0 ] ] ), axis = 1 )
+
+        labels = Graph.components( len( pieces ), edges )
+        volumes = np.bincount( labels, weights = [ piece.Volume() for piece in pieces ], minlength = len( pieces ) )
+        connected = np.zeros( len( pieces ), dtype = bool )
+        connected[ np.argmax( volumes ) ] = True
+        if anchored and self.has_shell_geometry:
+            connected[ labels[ self._touching( pieces, band ) ] ] = True
+
+        loose = np.flatnonzero( ~ connected[ labels ] )
+        report = { "components": len( np.unique( labels ) ), "fragments": len( np.unique( labels[ loose ] ) ),
+                   "solids": loose }
+        if remove and len( loose ) > 0:
+            self.lattice_geometry = Workplane( obj = Compound.makeCompound(
+                [ piece for piece, keep in zip( pieces, connected[ labels ] ) if keep ] ) )
+        return report
+
+    def merge( self, boundary: bool = False, band: float = 1e-3, chunk: int | None = None,
+               fuzzy: tuple[ float, ... ] = Boolean.FUZZY ) -> dict:
+        """
+        Vereinigt den Kern mit der Schale. Die boolesche Operation wird blockweise ausgeführt und jedes Teilergebnis
+        geprüft. Fehlgeschlagene Blöcke werden geteilt, einzelne Körper mit steigender unscharfer Toleranz und, für
+        Streben eines abgeschnittenen Gitters, zuletzt als vieleckige Streben wiederholt, siehe Boolean.fuse.
+
+        :param boundary: steuert, ob nur die Körper des Gitters mit der Schale vereinigt werden, welche diese berühren.
+                         Alle übrigen Körper werden unverändert dem Ergebnis hinzugefügt.
+        :param band: Abstand zur Schale, bis zu welchem ein Körper als berührend gilt
+        :param chunk: Anzahl der Körper des Gitters je Block der booleschen Operation, standardmäßig alle in einem Block
+        :param fuzzy: aufsteigende unscharfe Toleranzen der Wiederholungen einzelner Körper
+        :return: Bericht der booleschen Operation, siehe Boolean._isolate, mit Indizes der Körper des Gitters und,
+                 wenn diese den Streben des Graphen entsprechen, der Streben, welche eine Wiederholung benötigten, unter
+                 struts
+        """
+        if not self.has_shell_geometry:
+            raise ValueError( "Es ist keine Schalengeometrie vorhanden." )
+
+        if not self.has_lattice_geometry:
+            raise ValueError( "Es ist kein Gitter als Kern vorhanden." )
+
+        pieces: list[ Shape ] = self.lattice_geometry.solids().vals()
+        touching = self._touching( pieces, band ) if boundary else np.ones( len( pieces ), dtype = bool )
+        indices = np.flatnonzero( touching )
+
+        struts: np.ndarray | None = None
+        fallback = None
+        if self.lattice_graph is not None:
+            starts, ends, radii = _segments( self.lattice_graph, mesh = self._clip_mesh() )
+            lengths = np.linalg.norm( ends - starts, axis = 1 )
+            if np.count_nonzero( lengths > 0. ) == len( pieces ):
+                struts = np.flatnonzero( lengths > 0. )
+
+                def fallback( index: int ) -> Shape | None:
+                    """
+                    Körper des Gitters als vieleckige Strebe
+                    """
+                    strut = struts[ indices[ index ] ]
+                    return Boolean.polygonal_struts( starts[ [ strut ] ], ends[ [ strut ] ], radii[ [ strut ] ] )
+
+        shell: list[ Shape ] = self.shell_geometry.vals()
+        base = shell[ 0 ] if len( shell ) == 1 else Compound.makeCompound( shell )
+        union, report = Boolean.fuse( base, [ pieces[ index ] for index in indices ], chunk, fuzzy, fallback )
+
+        for key in ( "fuzzy", "fallback", "failed" ):
+            report[ key ] = indices[ report[ key ] ]
+        if struts is not None:
+            helped = np.concatenate( ( report[ "fuzzy" ], report[ "fallback" ], report[ "failed" ] ) )
+            report[ "struts" ] = struts[ np.sort( helped ) ]
+
+        separate = [ piece for piece, flag in zip( pieces, touching ) if not flag ]
+        self.union_geometry = Workplane( obj = Compound.makeCompound( [ union ] + separate ) if separate else union )
         self.has_union_geometry = True
+        return report
 
     def reset( self ) -> None:
         """
@@ -112,9 +560,12 @@ class Geometry:
         """
         self.solid_geometry = None
         self.has_solid_geometry = False
+        self.mesh = None
         self.shell_geometry = None
         self.has_shell_geometry = False
+        self.shell_cache = {}
         self.lattice_geometry = None
+        self.lattice_graph = None
         self.has_lattice_geometry = False
         self.union_geometry = None
         self.has_union_geometry = False
@@ -0,0 +1,307 @@
+import numpy as np
+from typing import Any
+
+
+def _coordinates( point: Any ) -> tuple[ float, float, float ]:
+    """
+    Gibt die Koordinaten eines Punktes als Tupel aus, unabhängig davon, ob dieser als CADQuery Vector oder als Feld
+    vorliegt
+
+    :param point: Punkt
+    :return: Koordinaten des Punktes
+    """
+    if hasattr( point, "toTuple" ):
+        return point.toTuple()
+    return tuple( float( c ) for c in point )
+
+
+def _shares( points: np.ndarray, size: np.ndarray, tolerance: float = 1e-6 ) -> np.ndarray:
+    """
+    Anteile von Entitäten einer im Ursprung zentrierten Elementarzelle, welche diese mit Nachbarzellen teilt. Liegen
+    alle Punkte einer Entität in einer Begrenzungsfläche, zählt diese Fläche mit einem Anteil von 1/2.
+
+    :param points: Punkte je Entität, Form (n, k, 3)
+    :param size: Abmaße der Elementarzelle
+    :param tolerance: Abstand, unterhalb dessen ein Punkt als in der Begrenzungsfläche liegend gilt
+    :return: Anteile, Form (n,)
+    """
+    points = np.asarray( points, dtype = float )
+    if len( points ) == 0:
+        return np.zeros( 0 )
+    on_face = np.all( np.abs( np.abs( points ) - size / 2. ) < tolerance, axis = 1 ) \
+        & np.all( np.sign( points ) == np.sign( points[ :, :1 ] ), axis = 1 )
+    return 0.5 ** np.count_nonzero( on_face, axis = 1 )
+
+
+def components( count: int, edges: np.ndarray ) -> np.ndarray:
+    """
+    Bestimmt die Zusammenhangskomponenten eines Graphen durch eine vektorisierte Union-Find-Struktur. Jede Kante
+    hängt die Wurzel mit dem größeren Index an die mit dem kleineren, anschließend werden die Pfade durch
+    Zeigersprünge verkürzt, bis jeder Knoten direkt auf seine Wurzel zeigt.
+
+    :param count: Anzahl der Knoten
+    :param edges: Indizes der Knotenpaare der Kanten, Form (m, 2)
+    :return: Kennung der Komponente je Knoten als kleinster Knotenindex der Komponente, Form (count,)
+    """
+    labels = np.arange( count )
+    edges = np.asarray( edges, dtype = np.int64 ).reshape( -1, 2 )
+
+    while True:
+        first, second = labels[ edges[ :, 0 ] ], labels[ edges[ :, 1 ] ]
+        separate = first != second
+        if not separate.any():
+            return labels
+        edges = edges[ separate ]
+        np.minimum.at( labels, np.maximum( first, second )[ separate ], np.minimum( first, second )[ separate ] )
+
+        while True:
+            jumped = labels[ labels ]
+            if np.array_equal( jumped, labels ):
+                break
+            labels = jumped
+
+
+class StrutGraph:
+    """
+    Repräsentation eines Gitters als Graph aus Knoten und Streben
+    """
+    def __init__( self,
+                  nodes: np.ndarray | None = None,
+                  struts: np.ndarray | None = None,
+                  diameters: np.ndarray | None = None,
+                  cells: np.ndarray | None = None,
+                  trimmed: np.ndarray | None = None,
+                  complete: bool = True ) -> None:
+        """
+        Initialisierung des Graphen aus Feldern
+
+        :param nodes: Koordinaten der Knoten, Form (n, 3)
+        :param struts: Indizes der Start- und Endknoten der Streben, Form (m, 2)
+        :param diameters: Durchmesser der Streben, Form (m,)
+        :param cells: Index der Zelle, aus welcher die Strebe stammt, Form (m,)
+        :param trimmed: Kennzeichnung der an der Oberfläche abgeschnittenen Strebenenden, Form (m, 2)
+        :param complete: False, wenn die Zelle neben Streben weitere Entitäten enthält, die nicht abgebildet sind
+        """
+        self.nodes: np.ndarray = np.zeros( ( 0, 3 ) ) if nodes is None else np.asarray( nodes, dtype = float )
+        self.struts: np.ndarray = np.zeros( ( 0, 2 ), dtype = np.int64 ) if struts is None \
+            else np.asarray( struts, dtype = np.int64 ).reshape( -1, 2 )
+
+        count = len( self.struts )
+        self.diameters: np.ndarray = np.zeros( count ) if diameters is None else np.asarray( diameters, dtype = float )
+        self.cells: np.ndarray = np.full( count, -1, dtype = np.int64 ) if cells is None \
+            else np.asarray( cells, dtype = np.int64 )
+        self.trimmed: np.ndarray = np.zeros( ( count, 2 ), dtype = bool ) if trimmed is None \
+            else np.asarray( trimmed, dtype = bool )
+        self.complete: bool = complete
+
+    @classmethod
+    def from_configuration( cls, config: Any ) -> "StrutGraph":
+        """
+        Erstellt den Graphen einer Elementarzelle aus allen Entitäten der Dimension 1
+
+        :param config: Konfiguration der Elementarzelle
+        :return: Graph der Elementarzelle
+        """
+        points: list[ tuple[ float, float, float ] ] = []
+        diameters: list[ float ] = []
+        complete = True
+
+        for entity in config:
+            if entity.dimension() != 1:
+                complete = False
+                continue
+            points += [ _coordinates( p ) for p in entity.geometry ]
+            diameters.append( entity.get( "diameter" ) )
+
+        nodes = np.array( points, dtype = float ).reshape( -1, 3 )
+        struts = np.arange( len( nodes ) ).reshape( -1, 2 )
+
+        return cls( nodes, struts, np.array( diameters, dtype = float ), complete = complete ).merge()
+
+    def __len__( self ) -> int:
+        """
+        Gibt die Anzahl der Streben aus
+
+        :return: Anzahl der Streben
+        """
+        return len( self.struts )
+
+    def empty( self ) -> bool:
+        """
+        Prüft, ob der Graph Streben enthält
+
+        :return: True, wenn keine Streben vorhanden sind
+        """
+        return len( self.struts ) == 0
+
+    def starts( self ) -> np.ndarray:
+        """
+        :return: Koordinaten der Startpunkte aller Streben
+        """
+        return self.nodes[ self.struts[ :, 0 ] ]
+
+    def ends( self ) -> np.ndarray:
+        """
+        :return: Koordinaten der Endpunkte aller Streben
+        """
+        return self.nodes[ self.struts[ :, 1 ] ]
+
+    def lengths( self ) -> np.ndarray:
+        """
+        :return: Längen aller Streben
+        """
+        return np.linalg.norm( self.ends() - self.starts(), axis = 1 )
+
+    def components( self ) -> np.ndarray:
+        """
+        :return: Kennung der Zusammenhangskomponente je Strebe, Form (m,)
+        """
+        return components( len( self.nodes ), self.struts )[ self.struts[ :, 0 ] ]
+
+    def relative_density( self, size: np.ndarray, tolerance: float = 1e-6 ) -> float:
+        """
+        Näherung der relativen Dichte des Graphen einer im Ursprung zentrierten Elementarzelle aus dem Volumen der
+        Streben. Eine Strebe, welche in einer Begrenzungsfläche der Zelle liegt, wird mit einem Anteil von 1/2 je
+        Fläche berücksichtigt, da sie sich diese mit der Nachbarzelle teilt. Überschneidungen werden vernachlässigt.
+
+        :param size: Abmaße der Elementarzelle
+        :param tolerance: Abstand, unterhalb dessen eine Strebe als in der Begrenzungsfläche liegend gilt
+        :return: relative Dichte
+        """
+        size = np.asarray( size, dtype = float )
+        share = _shares( np.stack( ( self.starts(), self.ends() ), axis = 1 ), size, tolerance )
+
+        volume = np.sum( share * np.pi / 4. * self.diameters ** 2 * self.lengths() )
+        return float( volume / np.prod( size ) )
+
+    def tile( self, centers: np.ndarray, tolerance: float = 1e-6 ) -> "StrutGraph":
+        """
+        Vervielfältigt den Graphen einer Elementarzelle an die gegebenen Zellmittelpunkte. Knoten und Streben, welche
+        sich benachbarte Zellen teilen, werden zusammengefasst.
+
+        :param centers: Mittelpunkte der Zellen, Form (c, 3)
+        :param tolerance: Abstand, unterhalb dessen Knoten als identisch gelten
+        :return: Graph des Gitters
+        """
+        centers = np.asarray( centers, dtype = float ).reshape( -1, 3 )
+        count_nodes = len( self.nodes )
+
+        nodes = ( centers[ :, None, : ] + self.nodes[ None, :, : ] ).reshape( -1, 3 )
+        struts = ( self.struts[ None, :, : ] +
+                   ( np.arange( len( centers ) ) * count_nodes )[ :, None, None ] ).reshape( -1, 2 )
+
+        return StrutGraph( nodes, struts,
+                           np.tile( self.diameters, len( centers ) ),
+                           np.repeat( np.arange( len( centers ) ), len( self.struts ) ),
+                           np.tile( self.trimmed, ( len( centers ), 1 ) ),
+                           self.complete ).merge( tolerance )
+
+    def rotate( self, rotation: np.ndarray ) -> "StrutGraph":
+        """
+        Dreht die Knoten des Graphen um den Ursprung
+
+        :param rotation: Drehmatrix, Form (3, 3)
+        :return: gedrehter Graph
+        """
+        return StrutGraph( self.nodes @ np.asarray( rotation, dtype = float ).T, self.struts, self.diameters,
+                           self.cells, self.trimmed, self.complete )
+
+    def merge( self, tolerance: float = 1e-6 ) -> "StrutGraph":
+        """
+        Fasst identische Knoten und doppelte Streben zusammen und entfernt Streben der Länge 0. Von doppelten Streben
+        wird die jeweils erste beibehalten.
+
+        :param tolerance: Abstand, unterhalb dessen Knoten als identisch gelten
+        :return: bereinigter Graph
+        """
+        keys = np.round( self.nodes / tolerance ).astype( np.int64 )
+        _, first, inverse = np.unique( keys, axis = 0, return_index = True, return_inverse = True )
+        inverse = inverse.reshape( -1 )
+
+        struts = inverse[ self.struts ]
+        trimmed = self.trimmed.copy()
+        swap = struts[ :, 0 ] > struts[ :, 1 ]
+        struts[ swap ] = struts[ swap ][ :, ::-1 ]
+        trimmed[ swap ] = trimmed[ swap ][ :, ::-1 ]
+
+        valid = np.flatnonzero( struts[ :, 0 ] != struts[ :, 1 ] )
+        _, unique = np.unique( struts[ valid ], axis = 0, return_index = True )
+        keep = valid[ np.sort( unique ) ]
+
+        return StrutGraph( self.nodes[ first ], struts[ keep ], self.diameters[ keep ], self.cells[ keep ],
+                           trimmed[ keep ], self.complete )
+
+    def subset( self, mask: np.ndarray ) -> "StrutGraph":
+        """
+        Gibt den Graphen der ausgewählten Streben aus. Nicht mehr verwendete Knoten werden entfernt.
+
+        :param mask: Auswahl der Streben als boolesches Feld oder Indexfeld
+        :return: Teilgraph
+        """
+        struts = self.struts[ mask ]
+        used, inverse = np.unique( struts, return_inverse = True )
+        return StrutGraph( self.nodes[ used ], inverse.reshape( -1, 2 ), self.diameters[ mask ], self.cells[ mask ],
+                           self.trimmed[ mask ], self.complete )
+
+    def clip( self, mesh: Any ) -> "StrutGraph":
+        """
+        Schneidet die Streben an der Oberfläche eines geschlossenen Dreiecksnetzes ab. Streben außerhalb werden
+        entfernt, Streben, welche die Oberfläche schneiden, werden gekürzt und an den Schnittpunkten als
+        abgeschnitten gekennzeichnet. Enden, welche bereits auf der Oberfläche liegen, gelten ebenfalls als
+        abgeschnitten.
+
+        :param mesh: geschlossenes Dreiecksnetz mit Methoden intersect_segments und contains
+        :return: zurechtgeschnittener Graph
+        """
+        starts, ends = self.starts(), self.ends()
+        count = len( self.struts )
+
+        hit_struts, hit_parameters = mesh.intersect_segments( starts, ends )
+        touching = np.zeros( ( count, 2 ), dtype = bool )
+        touching[ hit_struts[ hit_parameters <= 1e-9 ], 0 ] = True
+        touching[ hit_struts[ hit_parameters >= 1. - 1e-9 ], 1 ] = True
+
+        segment = np.concatenate( [ hit_struts, np.arange( count ), np.arange( count ) ] )
+        parameter = np.concatenate( [ hit_parameters, np.zeros( count ), np.ones( count ) ] )
+        order = np.lexsort( ( parameter, segment ) )
+        segment, parameter = segment[ order ], parameter[ order ]
+
+        pairs = np.flatnonzero( ( segment[ :-1 ] == segment[ 1: ] ) &
+                                ( parameter[ 1: ] - parameter[ :-1 ] > 1e-9 ) )
+        segment, lower, upper = segment[ pairs ], parameter[ pairs ], parameter[ pairs + 1 ]
+
+        direction = ends[ segment ] - starts[ segment ]
+        inside = mesh.contains( starts[ segment ] + ( ( lower + upper ) / 2. )[ :, None ] * direction )
+
+        segment, lower, upper, direction = segment[ inside ], lower[ inside ], upper[ inside ], direction[ inside ]
+        first = starts[ segment ] + lower[ :, None ] * direction
+        last = starts[ segment ] + upper[ :, None ] * direction
+
+        trimmed = np.stack( [ self.trimmed[ segment, 0 ] | ( lower > 0. ) | touching[ segment, 0 ],
+                             self.trimmed[ segment, 1 ] | ( upper < 1. ) | touching[ segment, 1 ] ], axis = 1 )
+
+        nodes = np.stack( [ first, last ], axis = 1 ).reshape( -1, 3 )
+        struts = np.arange( len( nodes ) ).reshape( -1, 2 )
+
+        return StrutGraph( nodes, struts, self.diameters[ segment ], self.cells[ segment ],
+                           trimmed, self.complete ).merge()
+
+    def arrays( self ) -> dict[ str, np.ndarray ]:
+        """
+        Gibt den Graphen als Felder für die Speicherung aus
+
+        :return: Felder des Graphen
+        """
+        return { "nodes": self.nodes, "struts": self.struts, "diameters": self.diameters, "cells": self.cells,
+                 "trimmed": self.trimmed, "complete": np.array( self.complete ) }
+
+    @classmethod
+    def from_arrays( cls, arrays: dict[ str, np.ndarray ] ) -> "StrutGraph":
+        """
+        Stellt einen gespeicherten Graphen wieder her
+
+        :param arrays: Felder des Graphen
+        :return: Graph
+        """
+        return cls( arrays[ "nodes" ], arrays[ "struts" ], arrays[ "diameters" ], arrays[ "cells" ],
+                    arrays[ "trimmed" ], bool( arrays[ "complete" ] ) )
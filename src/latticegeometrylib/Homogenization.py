@@ -0,0 +1,236 @@
+from typing import Iterable
+import numpy as np
+from . import Graph
+StrutGraph = Graph.StrutGraph
+
+THEORIES: tuple[ str, ... ] = ( "euler", "timoshenko" )
+
+
+def _periodic( graph: StrutGraph, size: np.ndarray, tolerance: float = 1e-6 ) -> tuple[ int, np.ndarray, np.ndarray ]:
+    """
+    Fasst die Knoten einer im Ursprung zentrierten Elementarzelle zusammen, welche durch die Periodizität identisch
+    sind, etwa gegenüberliegende Eckknoten
+
+    :param graph: Graph der Elementarzelle
+    :param size: Abmaße der Elementarzelle
+    :param tolerance: relativer Abstand, unterhalb dessen Knoten als identisch gelten
+    :return: Anzahl der unabhängigen Knoten, Index des unabhängigen Knotens je Strebenende, Form (m, 2), und
+             Anteil jeder Strebe, welcher sich aus den mit Nachbarzellen geteilten Begrenzungsflächen ergibt
+    """
+    half = size / 2.
+    scale = int( round( 1. / tolerance ) )
+    keys = np.mod( np.round( ( graph.nodes + half ) / size * scale ).astype( np.int64 ), scale )
+    _, inverse = np.unique( keys, axis = 0, return_inverse = True )
+
+    starts, ends = graph.starts(), graph.ends()
+    on_face = ( np.abs( np.abs( starts ) - half ) < tolerance * size ) & \
+        ( np.abs( np.abs( ends ) - half ) < tolerance * size ) & ( np.sign( starts ) == np.sign( ends ) )
+    share = 0.5 ** np.count_nonzero( on_face, axis = 1 )
+
+    return int( inverse.max() ) + 1, inverse.reshape( -1 )[ graph.struts ], share
+
+
+def _element_matrices( vectors: np.ndarray, diameters: np.ndarray, youngs_modulus: float, poisson_ratio: float,
+                       theory: str ) -> np.ndarray:
+    """
+    Berechnet die Steifigkeitsmatrizen räumlicher Balkenelemente mit Kreisquerschnitt im globalen Koordinatensystem.
+    Die Freiheitsgrade je Element sind Verschiebung und Verdrehung des Start- und des Endknotens.
+
+    :param vectors: Richtungsvektoren der Streben, Form (m, 3)
+    :param diameters: Durchmesser der Streben, Form (m,)
+    :param youngs_modulus: Elastizitätsmodul des Werkstoffs
+    :param poisson_ratio: Querkontraktionszahl des Werkstoffs
+    :param theory: Balkentheorie, euler für Euler-Bernoulli oder timoshenko mit Schubverformung
+    :return: Steifigkeitsmatrizen, Form (m, 12, 12)
+    """
+    lengths = np.linalg.norm( vectors, axis = 1 )
+    shear_modulus = youngs_modulus / ( 2. * ( 1. + poisson_ratio ) )
+    area = np.pi / 4. * diameters ** 2
+    inertia = np.pi / 64. * diameters ** 4
+
+    phi = np.zeros_like( lengths )
+    if theory == "timoshenko":
+        shear_factor = 6. * ( 1. + poisson_ratio ) / ( 7. + 6. * poisson_ratio )
+        phi = 12. * youngs_modulus * inertia / ( shear_factor * shear_modulus * area * lengths ** 2 )
+
+    bending = youngs_modulus * inertia / ( 1. + phi )
+    k1 = 12. * bending / lengths ** 3
+    k2 = 6. * bending / lengths ** 2
+    k3 = ( 4. + phi ) * bending / lengths
+    k4 = ( 2. - phi ) * bending / lengths
+    axial = youngs_modulus * area / lengths
+    torsion = shear_modulus * 2. * inertia / lengths
+
+    local = np.zeros( ( len( lengths ), 12, 12 ) )
+
+    def _set( i: int, j: int, value: np.ndarray ) -> None:
+        """
+        Setzt einen Eintrag und den symmetrischen Eintrag der lokalen Steifigkeitsmatrizen
+        """
+        local[ :, i, j ] = value
+        local[ :, j, i ] = value
+
+    for i, j, value in ( ( 0, 0, axial ), ( 6, 6, axial ), ( 0, 6, - axial ),
+                         ( 3, 3, torsion ), ( 9, 9, torsion ), ( 3, 9, - torsion ) ):
+        _set( i, j, value )
+
+    # Biegung in der lokalen xy-Ebene ( v, θz ) und xz-Ebene ( w, θy ), letztere mit umgekehrtem Vorzeichen der Kopplung
+    for v, theta, sign in ( ( 1, 5, 1. ), ( 2, 4, -1. ) ):
+        _set( v, v, k1 )
+        _set( v + 6, v + 6, k1 )
+        _set( v, v + 6, - k1 )
+        _set( v, theta, sign * k2 )
+        _set( v, theta + 6, sign * k2 )
+        _set( v + 6, theta, - sign * k2 )
+        _set( v + 6, theta + 6, - sign * k2 )
+        _set( theta, theta, k3 )
+        _set( theta + 6, theta + 6, k3 )
+        _set( theta, theta + 6, k4 )
+
+    axes = vectors / lengths[ :, None ]
+    reference = np.where( ( np.abs( axes[ :, 2 ] ) < 0.9 )[ :, None ], ( 0., 0., 1. ), ( 1., 0., 0. ) )
+    second = np.cross( reference, axes )
+    second /= np.linalg.norm( second, axis = 1 )[ :, None ]
+    rotation = np.stack( ( axes, second, np.cross( axes, second ) ), axis = 1 )
+
+    transformation = np.zeros( ( len( lengths ), 12, 12 ) )
+    for block in range( 4 ):
+        transformation[ :, 3 * block: 3 * block + 3, 3 * block: 3 * block + 3 ] = rotation
+
+    return np.einsum( "mji,mjk,mkl->mil", transformation, local, transformation )
+
+
+def _strain_operators( vectors: np.ndarray ) -> np.ndarray:
+    """
+    Bildet eine makroskopische Dehnung in Voigt-Notation ( εxx, εyy, εzz, γyz, γxz, γxy ) auf die Differenz der
+    Verschiebungen der Strebenenden ab
+
+    :param vectors: Richtungsvektoren der Streben, Form (m, 3)
+    :return: Abbildungen, Form (m, 3, 6)
+    """
+    x, y, z = vectors.T
+    zero = np.zeros_like( x )
+    return np.stack( ( np.stack( ( x, zero, zero, zero, z / 2., y / 2. ), axis = 1 ),
+                       np.stack( ( zero, y, zero, z / 2., zero, x / 2. ), axis = 1 ),
+                       np.stack( ( zero, zero, z, y / 2., x / 2., zero ), axis = 1 ) ), axis = 1 )
+
+
+def _homogenize( count: int, struts: np.ndarray, share: np.ndarray, vectors: np.ndarray, diameters: np.ndarray,
+                 volume: float, youngs_modulus: float, poisson_ratio: float, theory: str ) -> np.ndarray:
+    """
+    Berechnet den homogenisierten Elastizitätstensor eines periodischen Rahmentragwerks
+
+    :param count: Anzahl der unabhängigen Knoten
+    :param struts: Indizes der unabhängigen Knoten je Strebenende, Form (m, 2)
+    :param share: Anteil jeder Strebe an der Elementarzelle, Form (m,)
+    :param vectors: Richtungsvektoren der Streben, Form (m, 3)
+    :param diameters: Durchmesser der Streben, Form (m,)
+    :param volume: Volumen der Elementarzelle
+    :param youngs_modulus: Elastizitätsmodul des Werkstoffs
+    :param poisson_ratio: Querkontraktionszahl des Werkstoffs
+    :param theory: Balkentheorie, euler oder timoshenko
+    :return: Elastizitätstensor in Voigt-Notation, Form (6, 6)
+    """
+    matrices = share[ :, None, None ] * _element_matrices( vectors, diameters, youngs_modulus, poisson_ratio, theory )
+    operators = _strain_operators( vectors )
+
+    dofs = ( 6 * struts[ :, :, None ] + np.arange( 6 ) ).reshape( -1, 12 )
+    stiffness = np.zeros( ( 6 * count, 6 * count ) )
+    np.add.at( stiffness, ( dofs[ :, :, None ], dofs[ :, None, : ] ), matrices )
+
+    # Kopplung der Schwankungsanteile und der makroskopischen Dehnung über die Verschiebung der Endknoten
+    coupling = np.zeros( ( 6 * count, 6 ) )
+    np.add.at( coupling, dofs, np.einsum( "mij,mjk->mik", matrices[ :, :, 6:9 ], operators ) )
+    affine = np.einsum( "mji,mjk,mkl->il", operators, matrices[ :, 6:9, 6:9 ], operators )
+
+    # Starrkörperverschiebungen und Mechanismen liegen im Kern, die Kopplung im Bild der Steifigkeitsmatrix
+    fluctuation = np.linalg.lstsq( stiffness, coupling, rcond = None )[ 0 ]
+    tensor = ( affine - coupling.T @ fluctuation ) / volume
+    return ( tensor + tensor.T ) / 2.
+
+
+def elasticity_tensor( graph: StrutGraph,
+                       size: Iterable[ float ],
+                       youngs_modulus: float = 1.,
+                       poisson_ratio: float = 0.3,
+                       theory: str = "euler" ) -> np.ndarray:
+    """
+    Berechnet den homogenisierten Elastizitätstensor einer im Ursprung zentrierten Elementarzelle, deren Streben als
+    Balken mit Kreisquerschnitt und periodischen Randbedingungen betrachtet werden. Knoten steif verbunden,
+    Überschneidungen an den Knoten werden vernachlässigt.
+
+    :param graph: Graph der Elementarzelle
+    :param size: Abmaße der Elementarzelle
+    :param youngs_modulus: Elastizitätsmodul des Werkstoffs
+    :param poisson_ratio: Querkontraktionszahl des Werkstoffs
+    :param theory: Balkentheorie, euler für Euler-Bernoulli oder timoshenko mit Schubverformung
+    :return: Elastizitätstensor in Voigt-Notation ( xx, yy, zz, yz, xz, xy ), Form (6, 6)
+    """
+    if theory not in THEORIES:
+        raise ValueError( f"Unbekannte Balkentheorie: { theory }" )
+    if graph.empty():
+        raise ValueError( "Der Graph enthält keine Streben." )
+
+    size = np.asarray( tuple( size ), dtype = float )
+    count, struts, share = _periodic( graph, size )
+    return _homogenize( count, struts, share, graph.ends() - graph.starts(), graph.diameters, float( np.prod( size ) ),
+                        youngs_modulus, poisson_ratio, theory )
+
+
+def moduli( tensor: np.ndarray ) -> dict[ str, np.ndarray ]:
+    """
+    Berechnet die technischen Konstanten aus einem Elastizitätstensor
+
+    :param tensor: Elastizitätstensor in Voigt-Notation, Form (6, 6)
+    :return: Elastizitätsmoduln ( Ex, Ey, Ez ), Schubmoduln ( Gyz, Gxz, Gxy ) und Querkontraktionszahlen
+             ( νyz, νxz, νxy ) unter dem Schlüssel youngs, shear und poisson
+    """
+    compliance = np.linalg.pinv( tensor )
+    diagonal = np.diag( compliance )
+    return { "youngs": 1. / diagonal[ :3 ], "shear": 1. / diagonal[ 3: ],
+             "poisson": - np.array( ( compliance[ 1, 2 ] / diagonal[ 1 ], compliance[ 0, 2 ] / diagonal[ 0 ],
+                                      compliance[ 0, 1 ] / diagonal[ 0 ] ) ) }
+
+
+def sweep( graph: StrutGraph,
+           size: Iterable[ float ],
+           diameters: Iterable[ float ],
+           scales: Iterable[ float ] = ( 1., ),
+           youngs_modulus: float = 1.,
+           poisson_ratio: float = 0.3,
+           theory: str = "euler" ) -> list[ dict ]:
+    """
+    Berechnet Elastizitätstensor und relative Dichte für Varianten einer Elementarzelle mit einheitlichem
+    Strebendurchmesser und skalierter Zellgröße. Die Zuordnung der periodischen Knoten wird nur einmal bestimmt.
+
+    :param graph: Graph der Elementarzelle
+    :param size: Abmaße der Elementarzelle, auf welche sich die Skalierungen beziehen
+    :param diameters: Strebendurchmesser der Varianten
+    :param scales: Skalierungen der Zellgröße der Varianten
+    :param youngs_modulus: Elastizitätsmodul des Werkstoffs
+    :param poisson_ratio: Querkontraktionszahl des Werkstoffs
+    :param theory: Balkentheorie, euler oder timoshenko
+    :return: je Variante ein Verzeichnis mit size, diameter, density und tensor
+    """
+    if theory not in THEORIES:
+        raise ValueError( f"Unbekannte Balkentheorie: { theory }" )
+    if graph.empty():
+        raise ValueError( "Der Graph enthält keine Streben." )
+
+    size = np.asarray( tuple( size ), dtype = float )
+    count, struts, share = _periodic( graph, size )
+    vectors = graph.ends() - graph.starts()
+    lengths = np.linalg.norm( vectors, axis = 1 )
+    diameters = tuple( diameters )
+
+    results: list[ dict ] = []
+    for scale in scales:
+        volume = float( np.prod( size * scale ) )
+        for diameter in diameters:
+            strut_diameters = np.full( len( graph ), float( diameter ) )
+            density = float( np.sum( share * np.pi / 4. * strut_diameters ** 2 * lengths * scale ) / volume )
+            tensor = _homogenize( count, struts, share, vectors * scale, strut_diameters, volume,
+                                  youngs_modulus, poisson_ratio, theory )
+            results.append( { "size": tuple( size * scale ), "diameter": float( diameter ), "density": density,
+                              "tensor": tensor } )
+    return results
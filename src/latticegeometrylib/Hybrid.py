@@ -0,0 +1,415 @@
+from typing import Callable
+from cadquery import Workplane, Compound, Shape, Solid, Vector, Location
+import numpy as np
+from . import Miscellaneous
+Size = Miscellaneous.Size
+Switch = Miscellaneous.Switch
+BoundingBox = Miscellaneous.BoundingBox
+from . import Lattice
+Lattice = Lattice.Lattice
+from . import UnitaryCell
+UnitaryCell = UnitaryCell.UnitaryCell
+from . import CellConfiguration
+CellConfiguration = CellConfiguration.CellConfiguration
+from . import Graph
+StrutGraph = Graph.StrutGraph
+from . import Mesh
+TriangleMesh = Mesh.TriangleMesh
+BoundingVolumeHierarchy = Mesh.BoundingVolumeHierarchy
+
+
+class Region:
+    """
+    Benannter Bereich eines hybriden Gitters mit eigener Elementarzelle und eigener Zellgröße. Der Bereich wird durch
+    einen Körper, einen Quader oder eine Auswahlfunktion über die Zellindizes seines Gitters beschrieben. Ein Bereich
+    ohne Beschreibung umfasst den gesamten Raum und nimmt alle Zellen auf, welche keinem vorherigen Bereich angehören.
+    """
+    def __init__( self,
+                  name: str,
+                  space: BoundingBox,
+                  length: tuple[ float, float, float ],
+                  strict: tuple[ bool, bool, bool ] = ( False, False, False ),
+                  solid: Workplane | TriangleMesh | None = None,
+                  box: tuple[ tuple[ float, float, float ], tuple[ float, float, float ] ] | None = None,
+                  cells: Callable[ [ np.ndarray ], np.ndarray ] | None = None,
+                  tolerance: float = 1e-2 ) -> None:
+        """
+        Initialisierung des Bereichs und seines Gitters
+
+        :param name: Bezeichnung des Bereichs
+        :param space: Raum, in welchem das Gitter des Bereichs erzeugt wird, üblicherweise der Begrenzungsquader der
+                      Eingangsgeometrie
+        :param length: bevorzugte Abmessungen der Elementarzelle
+        :param strict: steuert, ob die gegebenen Abmessungen genau eingehalten werden
+        :param solid: Körper des Bereichs als B-Rep oder geschlossenes Dreiecksnetz
+        :param box: kleinste und größte Koordinaten des Bereichs als Quader
+        :param cells: Auswahlfunktion, welche für Zellindizes der Form (c, 3) ein boolesches Feld der Form (c,)
+                      ausgibt
+        :param tolerance: lineare Toleranz der Triangulierung eines Körpers als B-Rep
+        """
+        if sum( selector is not None for selector in ( solid, box, cells ) ) > 1:
+            raise ValueError( "Ein Bereich wird entweder durch einen Körper, einen Quader oder eine Auswahl von Zellen "
+                              "beschrieben." )
+
+        self.name: str = name
+        self.solid: Workplane | TriangleMesh | None = solid
+        self.box: np.ndarray | None = None if box is None else np.asarray( box, dtype = float ).reshape( 2, 3 )
+        self.predicate: Callable[ [ np.ndarray ], np.ndarray ] | None = cells
+        self.tolerance: float = tolerance
+        self.mesh: TriangleMesh | None = solid if isinstance( solid, TriangleMesh ) else None
+
+        space = BoundingBox.from_bounds( space.min(), space.max() )
+        self.lattice: Lattice = Lattice( space, Size( *length ), Switch( *strict ) )
+        self.cell: UnitaryCell = UnitaryCell( self.lattice.cell_size )
+        self.config: CellConfiguration = CellConfiguration( self.cell.vertices )
+
+        self.offset: int = 0
+        self.interior: np.ndarray = np.zeros( 0, dtype = np.int64 )
+        self.transition: np.ndarray = np.zeros( 0, dtype = np.int64 )
+
+    def key( self ) -> tuple:
+        """
+        :return: Schlüssel der Elementarzelle aus Zellgröße und Konfiguration
+        """
+        return self.lattice.cell_size.toTuple(), str( self.config )
+
+    def indices( self, points: np.ndarray ) -> np.ndarray:
+        """
+        :param points: Koordinaten der Punkte, Form (n, 3)
+        :return: Index der Zelle des Bereichsgitters, in welcher die Punkte liegen, Form (n, 3)
+        """
+        size = np.array( self.lattice.cell_size.toTuple() )
+        return np.rint( ( points - np.array( self.lattice.adjusted_space.min() ) ) / size ).astype( np.int64 )
+
+    def contains( self, points: np.ndarray ) -> np.ndarray:
+        """
+        Prüft, ob Punkte innerhalb des Bereichs liegen
+
+        :param points: Koordinaten der Punkte, Form (n, 3)
+        :return: True für alle Punkte innerhalb des Bereichs
+        """
+        points = np.asarray( points, dtype = float ).reshape( -1, 3 )
+
+        if self.box is not None:
+            return np.all( ( points >= self.box[ 0 ] ) & ( points <= self.box[ 1 ] ), axis = 1 )
+
+        if self.solid is not None:
+            if self.mesh is None:
+                self.mesh = TriangleMesh.from_workplane( self.solid, self.tolerance )
+            return self.mesh.contains( points )
+
+        if self.predicate is not None:
+            indices = self.indices( points )
+            valid = np.all( ( indices >= 0 ) & ( indices < np.array( self.lattice.periodicity.toTuple() ) ), axis = 1 )
+            inside = np.zeros( len( points ), dtype = bool )
+            if valid.any():
+                inside[ valid ] = np.asarray( self.predicate( indices[ valid ] ), dtype = bool ).reshape( -1 )
+            return inside
+
+        return np.ones( len( points ), dtype = bool )
+
+    def body( self, lower: np.ndarray, upper: np.ndarray ) -> Shape:
+        """
+        Gibt den Bereich als Körper aus
+
+        :param lower: kleinste Koordinaten des gesamten Gitters, begrenzen einen Bereich ohne Beschreibung
+        :param upper: größte Koordinaten des gesamten Gitters, begrenzen einen Bereich ohne Beschreibung
+        :return: Körper des Bereichs
+        """
+        def _box( first: np.ndarray, last: np.ndarray ) -> Shape:
+            """
+            Quader zwischen zwei Ecken
+            """
+            return Solid.makeBox( *( last - first ).tolist(), Vector( *first.tolist() ) )
+
+        if self.box is not None:
+            return _box( *self.box )
+
+        if self.solid is not None:
+            if isinstance( self.solid, TriangleMesh ):
+                raise ValueError( f"Der Bereich { self.name } liegt nur als Dreiecksnetz vor. Zellen mit Flächen oder "
+                                  "Kugeln an dessen Grenze erfordern einen Körper als B-Rep." )
+            return self.solid.val()
+
+        if self.predicate is not None:
+            size = np.array( self.lattice.cell_size.toTuple() )
+            cells = self.lattice.cells[ self.contains( self.lattice.centers() ) ]
+            boxes = [ _box( center - size / 2., center + size / 2. ) for center in self.lattice.centers( cells ) ]
+            if len( boxes ) == 0:
+                return Compound.makeCompound( [] )
+            return boxes[ 0 ].fuse( *boxes[ 1: ] ).clean() if len( boxes ) > 1 else boxes[ 0 ]
+
+        return _box( lower, upper )
+
+
+class _Selection:
+    """
+    Auswahlfunktion über die Zellindizes eines Bereichsgitters aus einer festen Maske, etwa für Bereiche, welche aus
+    einem Archiv wiederhergestellt werden
+    """
+    def __init__( self, mask: np.ndarray ) -> None:
+        """
+        :param mask: True je ausgewählter Zelle, Form der Periodizität des Bereichsgitters
+        """
+        self.mask: np.ndarray = np.asarray( mask, dtype = bool )
+
+    def __call__( self, cells: np.ndarray ) -> np.ndarray:
+        """
+        :param cells: Zellindizes, Form (c, 3)
+        :return: True je ausgewählter Zelle, Form (c,)
+        """
+        return self.mask[ tuple( np.asarray( cells, dtype = np.int64 ).reshape( -1, 3 ).T ) ]
+
+
+def owners( regions: list[ Region ], points: np.ndarray ) -> np.ndarray:
+    """
+    Ordnet Punkte dem ersten Bereich zu, in welchem sie liegen
+
+    :param regions: Bereiche in absteigender Rangfolge
+    :param points: Koordinaten der Punkte, Form (n, 3)
+    :return: Index des Bereichs je Punkt, -1 für Punkte außerhalb aller Bereiche
+    """
+    points = np.asarray( points, dtype = float ).reshape( -1, 3 )
+    result = np.full( len( points ), -1, dtype = np.int64 )
+    for index, region in enumerate( regions ):
+        free = np.flatnonzero( result < 0 )
+        if len( free ) == 0:
+            break
+        result[ free[ region.contains( points[ free ] ) ] ] = index
+    return result
+
+
+def labels( regions: list[ Region ], cells: np.ndarray ) -> np.ndarray:
+    """
+    :param regions: Bereiche des hybriden Gitters
+    :param cells: Zellindizes der Streben im Graphen des hybriden Gitters
+    :return: Index des Bereichs je Strebe
+    """
+    offsets = np.array( [ region.offset for region in regions ] )
+    return np.searchsorted( offsets, cells, side = 'right' ) - 1
+
+
+class _Ownership:
+    """
+    Grenze eines Bereichs gegenüber allen übrigen Bereichen mit den Methoden intersect_segments und contains, sodass
+    Streben mit StrutGraph.clip an der Grenze abgeschnitten werden können. Die Schnittpunkte werden durch Abtastung
+    der Streben und Bisektion zwischen Abtastpunkten unterschiedlicher Zugehörigkeit bestimmt.
+    """
+    def __init__( self, regions: list[ Region ], index: int, samples: int = 16, iterations: int = 40 ) -> None:
+        """
+        :param regions: Bereiche in absteigender Rangfolge
+        :param index: Index des Bereichs
+        :param samples: Anzahl der Abschnitte je Strebe für die Abtastung
+        :param iterations: Anzahl der Bisektionsschritte je Schnittpunkt
+        """
+        self.regions: list[ Region ] = regions
+        self.index: int = index
+        self.samples: int = samples
+        self.iterations: int = iterations
+
+    def contains( self, points: np.ndarray ) -> np.ndarray:
+        """
+        :param points: Koordinaten der Punkte, Form (n, 3)
+        :return: True für alle Punkte, welche dem Bereich gehören
+        """
+        return owners( self.regions, points ) == self.index
+
+    def intersect_segments( self, starts: np.ndarray, ends: np.ndarray ) -> tuple[ np.ndarray, np.ndarray ]:
+        """
+        :param starts: Startpunkte der Strecken, Form (m, 3)
+        :param ends: Endpunkte der Strecken, Form (m, 3)
+        :return: Indizes der Strecken und Streckenparameter der Schnittpunkte mit der Bereichsgrenze
+        """
+        parameters = np.linspace( 0., 1., self.samples + 1 )
+        direction = ends - starts
+        points = starts[ :, None, : ] + parameters[ None, :, None ] * direction[ :, None, : ]
+        inside = self.contains( points.reshape( -1, 3 ) ).reshape( len( starts ), -1 )
+
+        segment, step = np.nonzero( inside[ :, :-1 ] != inside[ :, 1: ] )
+        lower, upper = parameters[ step ], parameters[ step + 1 ]
+        first = inside[ segment, step ]
+        for _ in range( self.iterations ):
+            middle = ( lower + upper ) / 2.
+            same = self.contains( starts[ segment ] + middle[ :, None ] * direction[ segment ] ) == first
+            lower, upper = np.where( same, middle, lower ), np.where( same, upper, middle )
+
+        return segment, ( lower + upper ) / 2.
+
+
+def _concatenate( graphs: list[ StrutGraph ] ) -> StrutGraph:
+    """
+    Fasst mehrere Graphen zu einem zusammen, ohne Knoten zu verschmelzen
+
+    :param graphs: Graphen
+    :return: Graph
+    """
+    offsets = np.cumsum( [ 0 ] + [ len( graph.nodes ) for graph in graphs[ :-1 ] ] )
+    return StrutGraph( np.concatenate( [ graph.nodes for graph in graphs ] ).reshape( -1, 3 ),
+                       np.concatenate( [ graph.struts + offset for graph, offset in zip( graphs, offsets ) ] ),
+                       np.concatenate( [ graph.diameters for graph in graphs ] ),
+                       np.concatenate( [ graph.cells for graph in graphs ] ),
+                       np.concatenate( [ graph.trimmed for graph in graphs ] ).reshape( -1, 2 ),
+                       all( graph.complete for graph in graphs ) )
+
+
+def _bridges( ends: list[ tuple[ np.ndarray, np.ndarray, np.ndarray ] ], reaches: np.ndarray ) -> StrutGraph:
+    """
+    Verbindet die an Bereichsgrenzen abgeschnittenen Enden der Streben verschiedener Bereiche. Jedes Ende wird mit dem
+    nächstgelegenen Ende eines anderen Bereichs verbunden, sofern dieses höchstens die Reichweite des eigenen
+    Bereichs entfernt ist. Eine Verbindungsstrebe erhält den kleineren Durchmesser der beiden Streben.
+
+    :param ends: Koordinaten, Durchmesser und Zellindizes der abgeschnittenen Enden je Bereich mit Übergangszellen
+    :param reaches: größter Abstand verbundener Enden je Bereich mit Übergangszellen
+    :return: Graph der Verbindungsstreben
+    """
+    if len( ends ) == 0:
+        return StrutGraph()
+    points = np.concatenate( [ end[ 0 ] for end in ends ] ).reshape( -1, 3 )
+    if len( points ) == 0:
+        return StrutGraph()
+    diameters = np.concatenate( [ end[ 1 ] for end in ends ] )
+    cells = np.concatenate( [ end[ 2 ] for end in ends ] )
+    owner = np.repeat( np.arange( len( ends ) ), [ len( end[ 0 ] ) for end in ends ] )
+    reach = reaches[ owner ]
+
+    first, second = BoundingVolumeHierarchy( points, points ).boxes( points - reach[ :, None ],
+                                                                     points + reach[ :, None ] )
+    distances = np.linalg.norm( points[ first ] - points[ second ], axis = 1 )
+    candidates = ( owner[ first ] != owner[ second ] ) & ( distances <= reach[ first ] )
+    first, second, distances = first[ candidates ], second[ candidates ], distances[ candidates ]
+
+    # Nächstgelegenes Ende je Ende, jedes Paar nur einmal
+    order = np.lexsort( ( distances, first ) )
+    first, second = first[ order ], second[ order ]
+    nearest = np.flatnonzero( np.concatenate( ( [ True ], first[ 1: ] != first[ :-1 ] ) ) ) if len( first ) > 0 \
+        else np.zeros( 0, dtype = np.int64 )
+    pairs = np.unique( np.sort( np.stack( ( first[ nearest ], second[ nearest ] ), axis = 1 ), axis = 1 ),
+                       axis = 0 ).reshape( -1, 2 )
+
+    bridges = StrutGraph( points, pairs, np.minimum( diameters[ pairs[ :, 0 ] ], diameters[ pairs[ :, 1 ] ] ),
+                          cells[ pairs[ :, 0 ] ] )
+    return bridges.subset( np.arange( len( pairs ) ) )
+
+
+def _cylinders( graph: StrutGraph ) -> list[ Shape ]:
+    """
+    :param graph: Graph
+    :return: Zylinder aller Streben des Graphen
+    """
+    starts, ends = graph.starts(), graph.ends()
+    heights = np.linalg.norm( ends - starts, axis = 1 )
+    return [ Solid.makeCylinder( diameter / 2., height, Vector( *start ), Vector( *( ( end - start ) / height ) ) )
+             for start, end, height, diameter in zip( starts, ends, heights, graph.diameters ) if height > 0. ]
+
+
+def create( regions: list[ Region ], cache: dict[ tuple, UnitaryCell ], combine: bool = False ) -> Lattice:
+    """
+    Erstellt ein hybrides Gitter aus mehreren Bereichen. Jede unterschiedliche Elementarzelle wird nur einmal erstellt
+    und im Zwischenspeicher abgelegt. Zellen, deren Mittelpunkt und Ecken vollständig dem Bereich gehören, werden
+    unverändert übernommen. Übergangszellen an der Grenze zu anderen Bereichen werden je Bereich in einem einzigen
+    Durchgang an der Bereichsgrenze abgeschnitten, Zellen aus Streben direkt über den Graphen, übrige Zellen in einer
+    booleschen Operation mit dem Körper des Bereichs. Die an der Grenze abgeschnittenen Enden der Streben werden mit
+    Verbindungsstreben an die nächstgelegenen Enden der Nachbarbereiche angeschlossen, siehe _bridges. Das Ergebnis
+    wird wie ein regelmäßiges Gitter mit der Eingangsgeometrie verschnitten und mit der Schale vereinigt.
+
+    :param regions: Bereiche in absteigender Rangfolge. Gehört ein Punkt mehreren Bereichen an, gilt der erste.
+    :param cache: Zwischenspeicher der Elementarzellen nach Zellgröße und Konfiguration
+    :param combine: steuert, ob die Übergangszellen aller Bereiche in einer Operation vereinigt werden
+    :return: Gitter mit Geometrie und Graph. Die Zellindizes des Graphen sind über alle Bereiche fortlaufend, siehe
+             labels, und verweisen auf die Zellen des Gitters, welche die Zellen aller Bereichsgitter nacheinander
+             enthalten.
+    """
+    if len( regions ) == 0:
+        raise ValueError( "Es sind keine Bereiche vorhanden." )
+
+    lower = np.min( [ np.array( region.lattice.adjusted_space.min() ) - np.array( region.lattice.cell_size.toTuple() )
+                      for region in regions ], axis = 0 )
+    upper = np.max( [ np.array( region.lattice.adjusted_space.max() ) + np.array( region.lattice.cell_size.toTuple() )
+                      for region in regions ], axis = 0 )
+
+    interior_solids: list[ Shape ] = []
+    transition_solids: list[ Shape ] = []
+    graphs: list[ StrutGraph ] = []
+    ends: list[ tuple[ np.ndarray, np.ndarray, np.ndarray ] ] = []
+    reaches: list[ float ] = []
+    offset = 0
+
+    for index, region in enumerate( regions ):
+        if region.config.empty():
+            raise ValueError( f"Für den Bereich { region.name } sind keine Entitäten gegeben." )
+
+        key = region.key()
+        if key not in cache:
+            region.cell.create( region.config )
+            cache[ key ] = region.cell
+        cell = cache[ key ]
+
+        # Zugehörigkeit von Mittelpunkt und leicht nach innen versetzten Ecken jeder Zelle
+        size = np.array( region.lattice.cell_size.toTuple() )
+        centers = region.lattice.centers()
+        corners = np.array( [ [ x, y, z ] for x in ( -1, 1 ) for y in ( -1, 1 ) for z in ( -1, 1 ) ] ) * size * 0.4995
+        points = np.concatenate( ( centers[ :, None, : ], centers[ :, None, : ] + corners[ None ] ), axis = 1 )
+        owned = ( owners( regions, points.reshape( -1, 3 ) ) == index ).reshape( len( centers ), -1 )
+
+        region.offset = offset
+        region.interior = np.flatnonzero( owned.all( axis = 1 ) )
+        region.transition = np.flatnonzero( owned.any( axis = 1 ) & ~ owned.all( axis = 1 ) )
+        offset += len( region.lattice.cells )
+
+        interior_solids += [ cell.geometry.val().located( Location( Vector( *center ) ) )
+                             for center in centers[ region.interior ].tolist() ]
+
+        unit = StrutGraph.from_configuration( cell.config )
+        kept = np.concatenate( ( region.interior, region.transition ) )
+        if len( kept ) == 0:
+            continue
+        graph = unit.tile( centers[ kept ] )
+        graph.cells = kept[ graph.cells ]
+        at_interface = np.isin( graph.cells, region.transition )
+
+        interface = graph.subset( at_interface )
+        if not interface.empty():
+            interface = interface.clip( _Ownership( regions, index ) )
+            strut, side = np.nonzero( interface.trimmed )
+            ends.append( ( interface.nodes[ interface.struts[ strut, side ] ], interface.diameters[ strut ],
+                           interface.cells[ strut ] + region.offset ) )
+            reaches.append( min( region.lattice.cell_size.toTuple() ) )
+            # Schnitte an Bereichsgrenzen sind keine Schnitte an der Oberfläche und werden nicht gekürzt
+            interface.trimmed[ : ] = False
+        graph = _concatenate( [ graph.subset( ~ at_interface ), interface ] )
+        graph.cells = graph.cells + region.offset
+        graphs.append( graph )
+
+        if len( region.transition ) == 0:
+            continue
+        if unit.complete:
+            transition_solids += _cylinders( interface )
+        else:
+            placed = [ cell.geometry.val().located( Location( Vector( *center ) ) )
+                       for center in centers[ region.transition ].tolist() ]
+            body = region.body( lower, upper )
+            for other in regions[ :index ]:
+                body = body.cut( other.body( lower, upper ) )
+            transition_solids += Compound.makeCompound( placed ).intersect( body ).Solids()
+
+    bridges = _bridges( ends, np.array( reaches ) )
+    if not bridges.empty():
+        graphs.append( bridges )
+        transition_solids += _cylinders( bridges )
+
+    if combine and len( transition_solids ) > 1:
+        transition_solids = transition_solids[ 0 ].fuse( *transition_solids[ 1: ] ).clean().Solids()
+
+    lattice = Lattice()
+    sizes = np.array( [ region.lattice.cell_size.toTuple() for region in regions ] )
+    lattice.cell_size = Size( *sizes.min( axis = 0 ).tolist() )
+    lattice.space = BoundingBox.from_bounds( np.min( [ region.lattice.space.min() for region in regions ], axis = 0 ),
+                                             np.max( [ region.lattice.space.max() for region in regions ], axis = 0 ) )
+    lattice.adjusted_space = BoundingBox.from_bounds(
+        np.min( [ region.lattice.adjusted_space.min() for region in regions ], axis = 0 ),
+        np.max( [ region.lattice.adjusted_space.max() for region in regions ], axis = 0 ) )
+    lattice.cells = np.concatenate( [ region.lattice.cells for region in regions ] ).astype( np.int32 )
+    lattice.geometry = Workplane( obj = Compound.makeCompound( interior_solids + transition_solids ) )
+    lattice.graph = _concatenate( graphs ).merge()
+    lattice.has_grid = True
+    return lattice
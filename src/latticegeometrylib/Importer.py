@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+from cadquery import Workplane, Shape, Compound
+from OCP.STEPControl import STEPControl_Reader
+from OCP.IFSelect import IFSelect_RetDone
+
+
+def content_hash( filepath: str, chunk: int = 1 << 20 ) -> str:
+    """
+    Berechnet den SHA-256-Hashwert des Inhalts einer Datei. Die Datei wird blockweise gelesen, sodass auch große
+    Dateien nicht vollständig in den Arbeitsspeicher geladen werden.
+
+    :param filepath: Pfad zur Datei
+    :param chunk: Größe der gelesenen Blöcke in Byte
+    :return: Hashwert als Hexadezimalzeichenkette
+    """
+    digest = hashlib.sha256()
+    with open( filepath, mode = 'rb' ) as file:
+        while block := file.read( chunk ):
+            digest.update( block )
+    return digest.hexdigest()
+
+
+def read_step( filepath: str, root: int | None = None, heal: bool = False ) -> Workplane:
+    """
+    Liest eine STEP-Datei ein. Ist eine Wurzel angegeben, wird nur diese in OCC-Geometrie überführt, was bei großen
+    Baugruppen den Großteil der Rechenzeit einspart. Mehrere übertragene Formen werden zu einem Verbund
+    zusammengefasst.
+
+    :param filepath: Pfad zur STEP-Datei
+    :param root: Index der zu übertragenden Wurzel, beginnend bei 0, standardmäßig alle Wurzeln
+    :param heal: steuert, ob die übertragene Geometrie zusätzlich mit ShapeFix repariert wird
+    :return: Geometrie als CADQuery Workplane
+    :raise ValueError: wenn die Datei nicht gelesen werden kann oder die Wurzel nicht existiert
+    """
+    reader = STEPControl_Reader()
+    if reader.ReadFile( filepath ) != IFSelect_RetDone:
+        raise ValueError( f"Die STEP-Datei { filepath } konnte nicht gelesen werden." )
+
+    count = reader.NbRootsForTransfer()
+    if root is None:
+        for index in range( count ):
+            reader.TransferRoot( index + 1 )
+    elif 0 <= root < count:
+        reader.TransferRoot( root + 1 )
+    else:
+        raise ValueError( f"Die STEP-Datei { filepath } enthält keine Wurzel mit dem Index { root }." )
+
+    shapes = [ Shape.cast( reader.Shape( index + 1 ) ) for index in range( reader.NbShapes() ) ]
+    if len( shapes ) == 0:
+        raise ValueError( f"Die STEP-Datei { filepath } enthält keine übertragbare Geometrie." )
+    if heal:
+        shapes = [ shape.fix() for shape in shapes ]
+
+    return Workplane( obj = shapes[ 0 ] if len( shapes ) == 1 else Compound.makeCompound( shapes ) )
+
+
+def select( model: Workplane, solid: int | None = None ) -> Workplane:
+    """
+    Wählt einen einzelnen Körper einer importierten Geometrie aus
+
+    :param model: importierte Geometrie
+    :param solid: Index des Körpers, standardmäßig wird die gesamte Geometrie ausgegeben
+    :return: Geometrie als CADQuery Workplane
+    :raise ValueError: wenn der Körper nicht existiert
+    """
+    if solid is None:
+        return model
+
+    solids = model.solids().vals()
+    if not 0 <= solid < len( solids ):
+        raise ValueError( f"Die Geometrie enthält { len( solids ) } Körper, Index { solid } ist ungültig." )
+    return Workplane( obj = solids[ solid ] )
+
+
+class ImportCache:
+    """
+    Zwischenspeicher für importierte STEP-Dateien. Das Ergebnis des Imports wird als binäre BREP-Datei unter dem
+    Hashwert des Dateiinhalts abgelegt und bei späteren Aufrufen direkt geladen, ohne die STEP-Datei erneut zu
+    interpretieren. Die Hashwerte werden zusätzlich zu Pfad, Größe und Änderungszeitpunkt vermerkt, damit
+    unveränderte Dateien nicht erneut gelesen werden müssen.
+    """
+    def __init__( self, directory: str ) -> None:
+        """
+        Initialisierung des Zwischenspeichers
+
+        :param directory: Verzeichnis für die BREP-Dateien
+        """
+        self.directory: str = directory
+        self.hashes: dict[ str, str ] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+        os.makedirs( directory, exist_ok = True )
+
+        index = os.path.join( directory, "index.json" )
+        if os.path.exists( index ):
+            with open( index, mode = 'r' ) as file:
+                self.hashes = json.load( file )
+
+    def _hash( self, filepath: str ) -> str:
+        """
+        Gibt den Hashwert des Dateiinhalts aus und berechnet diesen nur, wenn sich die Datei geändert hat
+
+        :param filepath: Pfad zur Datei
+        :return: Hashwert
+        """
+        status = os.stat( filepath )
+        key = f"{ os.path.abspath( filepath ) }|{ status.st_size }|{ status.st_mtime_ns }"
+
+        if key not in self.hashes:
+            self.hashes[ key ] = content_hash( filepath )
+            index = os.path.join( self.directory, "index.json" )
+            temporary = f"{ index }.{ os.getpid() }.tmp"
+            with open( temporary, mode = 'w' ) as file:
+                json.dump( self.hashes, file )
+            os.replace( temporary, index )
+
+        return self.hashes[ key ]
+
+    def load( self, filepath: str, root: int | None = None, solid: int | None = None,
+              heal: bool = False ) -> Workplane:
+        """
+        Importiert eine STEP-Datei über den Zwischenspeicher
+
+        :param filepath: Pfad zur STEP-Datei
+        :param root: Index der zu übertragenden Wurzel, standardmäßig alle Wurzeln
+        :param solid: Index des auszuwählenden Körpers, standardmäßig die gesamte Geometrie
+        :param heal: steuert, ob die Geometrie beim ersten Import mit ShapeFix repariert wird
+        :return: Geometrie als CADQuery Workplane
+        """
+        suffix = "" if root is None else f"-root{ root }"
+        suffix += "-healed" if heal else ""
+        target = os.path.join( self.directory, f"{ self._hash( filepath ) }{ suffix }.bin" )
+
+        if os.path.exists( target ):
+            self.hits += 1
+            model = Workplane( obj = Shape.importBin( target ) )
+        else:
+            self.misses += 1
+            model = read_step( filepath, root, heal )
+            temporary = f"{ target }.{ os.getpid() }.tmp"
+            model.val().exportBin( temporary )
+            os.replace( temporary, target )
+
+        return select( model, solid )
+
+
+def import_step( filepath: str, cache: str | None = None, root: int | None = None, solid: int | None = None,
+                 heal: bool = False ) -> Workplane:
+    """
+    Importiert eine STEP-Datei, bei Angabe eines Verzeichnisses über einen ImportCache
+
+    :param filepath: Pfad zur STEP-Datei
+    :param cache: Verzeichnis des Zwischenspeichers
+    :param root: Index der zu übertragenden Wurzel, standardmäßig alle Wurzeln
+    :param solid: Index des auszuwählenden Körpers, standardmäßig die gesamte Geometrie
+    :param heal: steuert, ob die Geometrie mit ShapeFix repariert wird
+    :return: Geometrie als CADQuery Workplane
+    """
+    if cache is None:
+        return select( read_step( filepath, root, heal ), solid )
+    return ImportCache( cache ).load( filepath, root, solid, heal )
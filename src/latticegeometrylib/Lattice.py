@@ -1,5 +1,5 @@
-from cadquery import Workplane, Vector
-from math import floor, ceil
+from cadquery import Workplane, Compound, Location
+from math import ceil
 from . import Miscellaneous
 Size = Miscellaneous.Size
 Switch = Miscellaneous.Switch
@@ -7,7 +7,18 @@ Periodicity = Miscellaneous.Periodicity
 BoundingBox = Miscellaneous.BoundingBox
 from . import UnitaryCell
 UnitaryCell = UnitaryCell.UnitaryCell
-from copy import deepcopy
+from . import Graph
+StrutGraph = Graph.StrutGraph
+from . import SpatialIndex
+SpatialIndex = SpatialIndex.SpatialIndex
+from . import Mesh
+TriangleMesh = Mesh.TriangleMesh
+import numpy as np
+from OCP.BRepClass3d import BRepClass3d_SolidClassifier
+from OCP.BRepExtrema import BRepExtrema_DistShapeShape
+from OCP.BRepBuilderAPI import BRepBuilderAPI_MakeVertex
+from OCP.TopAbs import TopAbs_IN, TopAbs_ON
+from OCP.gp import gp_Pnt, gp_Trsf
 
 
 class Lattice:
@@ -17,21 +28,32 @@ class Lattice:
     def __init__(self,
                  space: BoundingBox | None = None,
                  preferred_cell_size: Size = Size(),
-                 strict: Switch = Switch() ):
+                 strict: Switch = Switch(),
+                 rotation: np.ndarray | None = None ):
         """
         Initialisierung des Gitters
 
-        :parameter space: Raum, in welchem das Gitter erzeugt werden soll
+        :parameter space: Raum, in welchem das Gitter erzeugt werden soll, in den Koordinaten des Gitters
         :parameter strict: steuert, ob die gegebenen Abmessungen des Begrenzungsraumes genau eingehalten werden sollen
+        :parameter rotation: Drehmatrix, deren Spalten die Achsen des Gitters im globalen Koordinatensystem sind,
+                             standardmäßig achsparallel. Der Raum ist dann ein orientierter Begrenzungsquader.
         """
 
         self.geometry = None
+        self.graph: StrutGraph = StrutGraph()
+        self.index: SpatialIndex | None = None
         self.space: BoundingBox | None = space
         self.adjusted_space: BoundingBox | None = space
         self.cell_size: Size = preferred_cell_size
         self.periodicity = Periodicity()
+        self.cells: np.ndarray = np.zeros( ( 0, 3 ), dtype = np.int32 )
+        self.rotation: np.ndarray = np.eye( 3 ) if rotation is None else np.asarray( rotation, dtype = float )
         self.initialized: bool = True
 
+        if self.rotation.shape != ( 3, 3 ) or np.linalg.det( self.rotation ) < 0. or \
+                not np.allclose( self.rotation.T @ self.rotation, np.eye( 3 ), atol = 1e-9 ):
+            raise ValueError( "Die Orientierung des Gitters muss eine Drehmatrix der Form (3, 3) sein." )
+
         if preferred_cell_size == Size():
             self.initialized = False
 
@@ -52,35 +74,165 @@ class Lattice:
                 self.cell_size[ direction ] = self.space.length( direction ) / self.periodicity[ direction ]
                 self.adjusted_space.extend( direction, - self.cell_size[ direction ] )
 
+        self.cells = np.indices( self.periodicity.toTuple(), dtype = np.int32 ).reshape( 3, -1 ).T
+
+    def centers( self, cells: np.ndarray | None = None ) -> np.ndarray:
+        """
+        Berechnet die Mittelpunkte der gegebenen Zellen
+
+        :parameter cells: Zellindizes, standardmäßig alle besetzten Zellen
+        :return: Koordinaten der Zellmittelpunkte
+        """
+        if cells is None:
+            cells = self.cells
+        return self.transform( np.array( self.adjusted_space.min() ) + cells * np.array( self.cell_size.toTuple() ) )
+
+    def transform( self, points: np.ndarray ) -> np.ndarray:
+        """
+        Überführt Punkte aus den Koordinaten des Gitters in globale Koordinaten
+
+        :parameter points: Koordinaten im Gitter, Form (n, 3)
+        :return: globale Koordinaten
+        """
+        return np.asarray( points, dtype = float ) @ self.rotation.T
+
+    def rotated( self ) -> bool:
+        """
+        :return: True, wenn das Gitter nicht achsparallel ist
+        """
+        return not np.array_equal( self.rotation, np.eye( 3 ) )
+
+    def occupy( self, solid: Workplane | TriangleMesh ) -> None:
+        """
+        Reduziert das Gitter auf die Zellen, welche die Eingangsgeometrie berühren. Das Gitter wird rekursiv in Blöcke
+        unterteilt. Liegt der Mittelpunkt eines Blocks weiter als die halbe Blockdiagonale von der Oberfläche entfernt,
+        ist der Block entweder vollständig leer oder vollständig besetzt und wird nicht weiter unterteilt. Für
+        Dreiecksnetze werden stattdessen die vorzeichenbehafteten Abstände aller Zellmittelpunkte vektorisiert berechnet.
+
+        :parameter solid: Eingangsgeometrie als B-Rep oder als geschlossenes Dreiecksnetz
+        """
+        if not self.initialized:
+            raise ValueError( "Gitter wurde noch nicht initialisiert." )
+
+        size = np.array( self.cell_size.toTuple() )
+        cmin = np.array( self.adjusted_space.min() )
+        occupied: list[ np.ndarray ] = []
+
+        if isinstance( solid, TriangleMesh ):
+            cells = np.indices( self.periodicity.toTuple(), dtype = np.int32 ).reshape( 3, -1 ).T
+            radius = np.linalg.norm( size ) / 2.
+            for start in range( 0, len( cells ), 65536 ):
+                chunk = cells[ start: start + 65536 ]
+                occupied.append( chunk[ solid.signed_distance( self.centers( chunk ) ) <= radius ] )
+            self.cells = np.concatenate( occupied )
+            return
+
+        shape = solid.val()
+        classifier = BRepClass3d_SolidClassifier( shape.wrapped )
+        distance = BRepExtrema_DistShapeShape()
+        distance.LoadS1( Compound.makeCompound( shape.Faces() ).wrapped )
+
+        def _classify( point: np.ndarray ) -> tuple[ bool, float ]:
+            """
+            Klassifiziert einen Punkt und bestimmt seinen Abstand zur Oberfläche der Eingangsgeometrie
+
+            :parameter point: Koordinaten des Punktes
+            :return: True, wenn der Punkt innerhalb liegt, und Abstand zur Oberfläche
+            """
+            pnt = gp_Pnt( *point )
+            classifier.Perform( pnt, 1e-6 )
+            distance.LoadS2( BRepBuilderAPI_MakeVertex( pnt ).Vertex() )
+            distance.Perform()
+            return classifier.State() in ( TopAbs_IN, TopAbs_ON ), distance.Value()
+
+        def _block( lower: np.ndarray, upper: np.ndarray ) -> None:
+            """
+            Prüft einen Block von Zellen mit den Indizes lower <= n < upper
+
+            :parameter lower: kleinste Zellindizes des Blocks
+            :parameter upper: größte Zellindizes des Blocks (exklusiv)
+            """
+            center = self.transform( cmin + ( lower + upper - 1 ) / 2. * size )
+            radius = np.linalg.norm( ( upper - lower ) * size ) / 2.
+            inside, gap = _classify( center )
+
+            if gap > radius:
+                if inside:
+                    occupied.append( np.indices( upper - lower, dtype = np.int32 ).reshape( 3, -1 ).T + lower )
+                return
+
+            if np.all( upper - lower == 1 ):
+                occupied.append( lower[ None, : ].astype( np.int32 ) )
+                return
+
+            axis = int( np.argmax( upper - lower ) )
+            middle = lower[ axis ] + ( upper[ axis ] - lower[ axis ] ) // 2
+            split_upper, split_lower = upper.copy(), lower.copy()
+            split_upper[ axis ], split_lower[ axis ] = middle, middle
+            _block( lower, split_upper )
+            _block( split_lower, upper )
+
+        _block( np.zeros( 3, dtype = int ), np.array( self.periodicity.toTuple(), dtype = int ) )
+
+        self.cells = np.concatenate( occupied ) if occupied else np.zeros( ( 0, 3 ), dtype = np.int32 )
+
     def create( self, cell: UnitaryCell, combine: bool = False ) -> None:
         """
         Erstellt die Geometrie des Gitters unter Verwendung der Elementarzelle
 
         :parameter cell: Elementarzelle, mit der das Gitter erstellt werden soll
-        :parameter combine: steuert, die Verschmelzung der Elementarzellen
+        :parameter combine: steuert, die Verschmelzung der Elementarzellen. Die Zellen werden in einer Operation vereinigt
+                           und koplanare Flächen benachbarter Zellen zusammengefasst
         """
         if not self.initialized:
             raise ValueError( "Gitter wurde noch nicht initialisiert." )
 
-        cmin: Vector = Vector( self.adjusted_space.min() )
-
-        points: list[ tuple[ float, float, float ] ] = [
-            ( cmin.x + nx * cell.size.dx, cmin.y + ny * cell.size.dy, cmin.z + nz * cell.size.dz )
-            for nx in range( self.periodicity.nx )
-            for ny in range( self.periodicity.ny )
-            for nz in range( self.periodicity.nz )
-        ]
+        points: list[ tuple[ float, float, float ] | Location ] = [ tuple( p ) for p in self.centers().tolist() ]
+        if self.rotated():
+            points = [ self._location( p ) for p in points ]
 
         self.geometry = Workplane().pushPoints( points ).eachpoint(
-            lambda loc: cell.geometry.val().located( loc ), combine = combine )
+            lambda loc: cell.geometry.val().located( loc ), combine = False )
+
+        if combine and len( points ) > 1:
+            cells = self.geometry.vals()
+            self.geometry = Workplane( obj = cells[ 0 ].fuse( *cells[ 1: ] ).clean() )
+
+        self.graph = StrutGraph.from_configuration( cell.config ).rotate( self.rotation ).tile( self.centers() )
+        self.index = None
 
         self.has_grid = True
 
+    def _location( self, center: tuple[ float, float, float ] ) -> Location:
+        """
+        :parameter center: globale Koordinaten eines Zellmittelpunktes
+        :return: Lage einer Zelle mit der Orientierung des Gitters
+        """
+        transformation = gp_Trsf()
+        transformation.SetValues( *( value for row, offset in zip( self.rotation.tolist(), center )
+                                     for value in row + [ offset ] ) )
+        return Location( transformation )
+
+    def spatial_index( self, spacing: float | None = None ) -> SpatialIndex:
+        """
+        Gibt den räumlichen Index über die Streben des Gitters aus und erstellt diesen bei Bedarf
+
+        :parameter spacing: Kantenlänge der Gitterzellen des Index, standardmäßig die kleinste Zellabmessung
+        :return: räumlicher Index
+        """
+        if self.index is None or ( spacing is not None and spacing != self.index.spacing ):
+            if spacing is None:
+                spacing = min( self.cell_size.toTuple() )
+            self.index = SpatialIndex.from_graph( self.graph, spacing )
+        return self.index
+
     def reset( self ):
         """
         Löscht die Geometrie des Gitters
         """
         self.geometry = Workplane()
+        self.graph = StrutGraph()
+        self.index = None
         self.has_grid = False
 
     def empty( self ) -> bool:
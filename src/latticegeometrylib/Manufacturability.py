@@ -0,0 +1,250 @@
+from typing import Iterable
+import numpy as np
+from . import Graph
+StrutGraph = Graph.StrutGraph
+from . import Mesh
+TriangleMesh = Mesh.TriangleMesh
+
+
+def _direction( direction: Iterable[ float ] ) -> np.ndarray:
+    """
+    :param direction: Aufbaurichtung
+    :return: normierte Aufbaurichtung
+    """
+    direction = np.asarray( tuple( direction ), dtype = float )
+    norm = np.linalg.norm( direction )
+    if direction.shape != ( 3, ) or norm == 0.:
+        raise ValueError( "Die Aufbaurichtung muss ein Vektor mit drei Komponenten und einer Länge ungleich 0 sein." )
+    return direction / norm
+
+
+def elevations( graph: StrutGraph, direction: Iterable[ float ] = ( 0., 0., 1. ) ) -> np.ndarray:
+    """
+    Berechnet den Winkel der Streben zur Bauplattform
+
+    :param graph: Graph des Gitters
+    :param direction: Aufbaurichtung
+    :return: Winkel in Grad zwischen 0 für waagerechte und 90 für senkrechte Streben, Form (m,)
+    """
+    vectors = graph.ends() - graph.starts()
+    lengths = np.linalg.norm( vectors, axis = 1 )
+    sines = np.abs( vectors @ _direction( direction ) ) / np.where( lengths > 0., lengths, 1. )
+    return np.degrees( np.arcsin( np.clip( sines, 0., 1. ) ) )
+
+
+def overhangs( graph: StrutGraph, direction: Iterable[ float ] = ( 0., 0., 1. ), angle: float = 30.,
+               tolerance: float = 1e-6 ) -> np.ndarray:
+    """
+    Ermittelt Streben, deren Winkel zur Bauplattform unterhalb des Grenzwinkels liegt und welche nicht auf der
+    Bauplattform aufliegen
+
+    :param graph: Graph des Gitters
+    :param direction: Aufbaurichtung
+    :param angle: kleinster ohne Stützstruktur druckbarer Winkel zur Bauplattform in Grad
+    :param tolerance: Abstand zur untersten Knotenebene, bis zu welchem eine Strebe auf der Bauplattform aufliegt
+    :return: Indizes der überhängenden Streben
+    """
+    if graph.empty():
+        return np.zeros( 0, dtype = np.int64 )
+    heights = graph.nodes @ _direction( direction )
+    on_plate = np.all( heights[ graph.struts ] <= heights.min() + tolerance, axis = 1 )
+    return np.flatnonzero( ( elevations( graph, direction ) < angle ) & ~ on_plate )
+
+
+def thin_struts( graph: StrutGraph, minimum_diameter: float ) -> np.ndarray:
+    """
+    Ermittelt Streben unterhalb des kleinsten druckbaren Durchmessers
+
+    :param graph: Graph des Gitters
+    :param minimum_diameter: kleinster druckbarer Durchmesser
+    :return: Indizes der zu dünnen Streben
+    """
+    return np.flatnonzero( graph.diameters < minimum_diameter )
+
+
+def long_spans( graph: StrutGraph, maximum_span: float, direction: Iterable[ float ] = ( 0., 0., 1. ),
+                angle: float = 30. ) -> tuple[ np.ndarray, np.ndarray ]:
+    """
+    Ermittelt zusammenhängende Folgen überhängender Streben, deren Gesamtlänge die größte ohne Stützstruktur
+    druckbare Spannweite überschreitet. Die Folgen werden als Zusammenhangskomponenten des Teilgraphen der
+    überhängenden Streben bestimmt.
+
+    :param graph: Graph des Gitters
+    :param maximum_span: größte druckbare Länge einer Folge überhängender Streben
+    :param direction: Aufbaurichtung
+    :param angle: kleinster ohne Stützstruktur druckbarer Winkel zur Bauplattform in Grad
+    :return: Indizes der Streben zu langer Folgen und Länge der Folge je Strebe
+    """
+    candidates = overhangs( graph, direction, angle )
+    labels = Graph.components( len( graph.nodes ), graph.struts[ candidates ] )[ graph.struts[ candidates, 0 ] ]
+    spans = np.bincount( labels, weights = graph.lengths()[ candidates ], minlength = len( graph.nodes ) )[ labels ]
+    exceeded = spans > maximum_span
+    return candidates[ exceeded ], spans[ exceeded ]
+
+
+def _rasterize( graph: StrutGraph, lower: np.ndarray, spacing: float, shape: tuple[ int, int, int ],
+                budget: int = 1 << 22 ) -> np.ndarray:
+    """
+    Bestimmt die Voxel, deren Mittelpunkte innerhalb einer Strebe liegen. Die Kandidaten je Strebe ergeben sich aus
+    ihrem achsparallelen Hüllquader und werden blockweise geprüft.
+
+    :param graph: Graph des Gitters
+    :param lower: untere Ecke des Rasters
+    :param spacing: Kantenlänge eines Voxels
+    :param shape: Anzahl der Voxel je Achse
+    :param budget: größte Anzahl gleichzeitig geprüfter Voxel
+    :return: belegte Voxel als boolesches Feld der Form shape
+    """
+    occupied = np.zeros( int( np.prod( shape ) ), dtype = bool )
+    starts, ends, radii = graph.starts(), graph.ends(), graph.diameters / 2.
+    extent = np.array( shape )
+
+    first = np.clip( np.floor( ( np.minimum( starts, ends ) - radii[ :, None ] - lower ) / spacing ), 0, extent - 1 )
+    last = np.clip( np.floor( ( np.maximum( starts, ends ) + radii[ :, None ] - lower ) / spacing ), 0, extent - 1 )
+    first, sizes = first.astype( np.int64 ), ( last - first ).astype( np.int64 ) + 1
+
+    # Strecken im Raster relativ zur Mitte des ersten Voxels, sodass die Voxelmittelpunkte ganzzahlig sind
+    origin = ( starts - lower ) / spacing - 0.5
+    direction = ( ends - starts ) / spacing
+    squared = np.maximum( np.einsum( 'ij,ij->i', direction, direction ), 1e-12 )
+    limits = ( radii / spacing ) ** 2
+
+    # Streben mit gleich großem Hüllquader teilen sich die Versätze der Kandidaten innerhalb des Quaders
+    base = int( extent.max() ) + 1
+    keys, inverse = np.unique( ( sizes[ :, 0 ] * base + sizes[ :, 1 ] ) * base + sizes[ :, 2 ], return_inverse = True )
+    for group, key in enumerate( keys ):
+        offsets = np.indices( ( key // base // base, key // base % base, key % base ) ).reshape( 3, -1 )
+        members = np.flatnonzero( inverse == group )
+        for block in np.array_split( members, max( 1, len( members ) * offsets.shape[ 1 ] // budget ) ):
+            voxels = [ first[ block, axis, None ] + offsets[ axis ] for axis in range( 3 ) ]
+            relative = [ voxels[ axis ] - origin[ block, axis, None ] for axis in range( 3 ) ]
+            t = np.clip( sum( relative[ axis ] * direction[ block, axis, None ] for axis in range( 3 ) ) /
+                         squared[ block, None ], 0., 1. )
+            distances = sum( ( relative[ axis ] - t * direction[ block, axis, None ] ) ** 2 for axis in range( 3 ) )
+            inside = distances <= limits[ block, None ]
+            occupied[ np.ravel_multi_index( tuple( v[ inside ] for v in voxels ), shape ) ] = True
+
+    occupied = occupied.reshape( shape )
+    return occupied
+
+
+def _fill( mesh: TriangleMesh, lower: np.ndarray, spacing: float, shape: tuple[ int, int, int ] ) -> np.ndarray:
+    """
+    Bestimmt die Voxel, deren Mittelpunkte innerhalb eines geschlossenen Dreiecksnetzes liegen. Je Säule des Rasters
+    wird eine Strecke entlang der dritten Achse mit dem Netz geschnitten, die Lage wechselt an jedem Durchstoßpunkt.
+
+    :param mesh: geschlossenes Dreiecksnetz
+    :param lower: untere Ecke des Rasters
+    :param spacing: Kantenlänge eines Voxels
+    :param shape: Anzahl der Voxel je Achse
+    :return: belegte Voxel als boolesches Feld der Form shape
+    """
+    axes = [ lower[ axis ] + ( np.arange( shape[ axis ] ) + 0.5 ) * spacing for axis in range( 2 ) ]
+    columns = np.stack( np.meshgrid( *axes, indexing = 'ij' ), axis = -1 ).reshape( -1, 2 )
+    bottom, top = lower[ 2 ] - spacing, lower[ 2 ] + ( shape[ 2 ] + 1 ) * spacing
+    starts = np.concatenate( ( columns, np.full( ( len( columns ), 1 ), bottom ) ), axis = 1 )
+    ends = np.concatenate( ( columns, np.full( ( len( columns ), 1 ), top ) ), axis = 1 )
+    column, parameter, _ = mesh.crossings( starts, ends )
+
+    # erster Voxel oberhalb jedes Durchstoßpunktes
+    heights = bottom + parameter * ( top - bottom )
+    first = np.clip( np.floor( ( heights - lower[ 2 ] ) / spacing - 0.5 ) + 1, 0, shape[ 2 ] ).astype( np.int64 )
+    toggles = np.zeros( ( len( columns ), shape[ 2 ] + 1 ), dtype = np.int8 )
+    np.add.at( toggles, ( column, first ), 1 )
+    return np.logical_xor.accumulate( toggles[ :, :-1 ] % 2 == 1, axis = 1 ).reshape( shape )
+
+
+def enclosed_voids( graph: StrutGraph, spacing: float | None = None, shell: TriangleMesh | None = None,
+                    samples: int = 4, resolution: int = 256 ) -> list[ dict ]:
+    """
+    Ermittelt Hohlräume zwischen den Streben und der Schale, welche keine Verbindung zur Umgebung haben und Pulver
+    oder Harz einschließen. Das Gitter und die Schale werden dazu auf ein Voxelraster abgebildet, dessen freie Voxel
+    über ihre Nachbarschaft zu Zusammenhangskomponenten verbunden werden. Komponenten, welche den Rand des Rasters
+    nicht berühren, sind eingeschlossen.
+
+    :param graph: Graph des Gitters
+    :param spacing: Kantenlänge eines Voxels, standardmäßig aus dem kleinsten Durchmesser der Streben
+    :param shell: Schale als geschlossenes Dreiecksnetz
+    :param samples: Anzahl der Voxel je kleinstem Durchmesser, wenn keine Kantenlänge angegeben ist
+    :param resolution: größte Anzahl der Voxel entlang der längsten Achse, wenn keine Kantenlänge angegeben ist
+    :return: je Hohlraum ein Verzeichnis mit volume, center und voxels
+    """
+    if graph.empty():
+        return []
+
+    radius = float( graph.diameters.max() ) / 2.
+    lower, upper = graph.nodes.min( axis = 0 ) - radius, graph.nodes.max( axis = 0 ) + radius
+    if shell is not None:
+        bounds = shell.bounds()
+        lower, upper = np.minimum( lower, bounds[ 0 ] ), np.maximum( upper, bounds[ 1 ] )
+    if spacing is None:
+        positive = graph.diameters[ graph.diameters > 0. ]
+        spacing = float( ( upper - lower ).max() ) / resolution
+        if len( positive ) > 0:
+            spacing = max( float( positive.min() ) / samples, spacing )
+    # ein zusätzlicher freier Voxel an jedem Rand verbindet alle offenen Bereiche mit der Umgebung
+    lower = lower - spacing
+    shape = tuple( int( n ) for n in np.ceil( ( upper - lower ) / spacing ).astype( np.int64 ) + 1 )
+
+    occupied = _rasterize( graph, lower, spacing, shape )
+    if shell is not None:
+        occupied |= _fill( shell, lower, spacing, shape )
+    free = ~ occupied
+    indices = np.full( shape, -1, dtype = np.int64 )
+    indices[ free ] = np.arange( np.count_nonzero( free ) )
+
+    edges = []
+    for axis in range( 3 ):
+        head = [ slice( None ) ] * 3
+        tail = [ slice( None ) ] * 3
+        head[ axis ], tail[ axis ] = slice( None, -1 ), slice( 1, None )
+        pairs = np.stack( ( indices[ tuple( head ) ].reshape( -1 ), indices[ tuple( tail ) ].reshape( -1 ) ), axis = 1 )
+        edges.append( pairs[ ( pairs >= 0 ).all( axis = 1 ) ] )
+
+    labels = Graph.components( int( free.sum() ), np.concatenate( edges ) )
+    outside = labels[ 0 ]
+
+    voxels = np.argwhere( free )
+    enclosed = labels != outside
+    if not enclosed.any():
+        return []
+
+    void_labels, inverse, counts = np.unique( labels[ enclosed ], return_inverse = True, return_counts = True )
+    centers = lower + ( voxels[ enclosed ] + 0.5 ) * spacing
+    sums = np.stack( [ np.bincount( inverse, weights = centers[ :, axis ] ) for axis in range( 3 ) ], axis = 1 )
+
+    return [ { "volume": float( count * spacing ** 3 ), "center": tuple( float( c ) for c in total / count ),
+               "voxels": int( count ) } for total, count in zip( sums, counts ) ]
+
+
+def analyze( graph: StrutGraph,
+             direction: Iterable[ float ] = ( 0., 0., 1. ),
+             angle: float = 30.,
+             minimum_diameter: float = 0.,
+             maximum_span: float = np.inf,
+             voids: bool = True,
+             shell: TriangleMesh | None = None,
+             samples: int = 4,
+             resolution: int = 256 ) -> dict:
+    """
+    Prüft die Fertigbarkeit eines Gitters anhand seines Graphen, ohne die Geometrie zu erstellen
+
+    :param graph: Graph des Gitters
+    :param direction: Aufbaurichtung
+    :param angle: kleinster ohne Stützstruktur druckbarer Winkel zur Bauplattform in Grad
+    :param minimum_diameter: kleinster druckbarer Strebendurchmesser
+    :param maximum_span: größte druckbare Länge einer Folge überhängender Streben
+    :param voids: steuert, ob eingeschlossene Hohlräume gesucht werden
+    :param shell: Schale als geschlossenes Dreiecksnetz, welche Hohlräume mit dem Gitter einschließen kann
+    :param samples: Anzahl der Voxel je kleinstem Strebendurchmesser für die Suche nach Hohlräumen
+    :param resolution: größte Anzahl der Voxel entlang der längsten Achse für die Suche nach Hohlräumen
+    :return: Bericht mit den Indizes der Streben je Prüfung unter overhangs, thin und spans, den Hohlräumen unter
+             voids und printable, wenn keine Prüfung einen Befund ergibt
+    """
+    report = { "overhangs": overhangs( graph, direction, angle ),
+               "thin": thin_struts( graph, minimum_diameter ),
+               "spans": long_spans( graph, maximum_span, direction, angle )[ 0 ],
+               "voids": enclosed_voids( graph, None, shell, samples, resolution ) if voids else [] }
+    report[ "printable" ] = not ( len( report[ "overhangs" ] ) or len( report[ "thin" ] ) or
+                                  len( report[ "spans" ] ) or report[ "voids" ] )
+    return report
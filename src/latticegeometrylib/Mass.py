@@ -0,0 +1,415 @@
+import numpy as np
+from cadquery import Solid, Vector
+from . import Graph
+StrutGraph = Graph.StrutGraph
+from . import Geometry
+from . import Mesh
+TriangleMesh = Mesh.TriangleMesh
+BoundingVolumeHierarchy = Mesh.BoundingVolumeHierarchy
+
+
+def _halton( count: int, bases: tuple[ int, ... ] = ( 2, 3, 5 ) ) -> np.ndarray:
+    """
+    Quasizufällige, gleichmäßig verteilte Punkte im Einheitswürfel nach Halton
+
+    :param count: Anzahl der Punkte
+    :param bases: Primzahlen als Basen je Dimension
+    :return: Punkte, Form (count, len( bases ))
+    """
+    points = np.zeros( ( count, len( bases ) ) )
+    for dimension, base in enumerate( bases ):
+        index = np.arange( 1, count + 1 )
+        fraction = 1.
+        while np.any( index > 0 ):
+            fraction /= base
+            points[ :, dimension ] += fraction * ( index % base )
+            index //= base
+    return points
+
+
+def _frames( units: np.ndarray ) -> tuple[ np.ndarray, np.ndarray ]:
+    """
+    :param units: Einheitsvektoren der Achsen, Form (n, 3)
+    :return: zwei zu den Achsen und zueinander senkrechte Einheitsvektoren je Achse
+    """
+    reference = np.where( ( np.abs( units[ :, 2 ] ) < 0.9 )[ :, None ], ( 0., 0., 1. ), ( 1., 0., 0. ) )
+    first = np.cross( reference, units )
+    first /= np.linalg.norm( first, axis = 1 )[ :, None ]
+    return first, np.cross( units, first )
+
+
+def _inside( points: np.ndarray, starts: np.ndarray, units: np.ndarray, lengths: np.ndarray,
+             radii: np.ndarray ) -> np.ndarray:
+    """
+    Prüft, ob Punkte in Zylindern liegen
+
+    :param points: Punkte, Form (n, s, 3)
+    :param starts: Startpunkte der Zylinder, Form (n, k, 3)
+    :param units: Achsrichtungen der Zylinder, Form (n, k, 3)
+    :param lengths: Längen der Zylinder, Form (n, k)
+    :param radii: Radien der Zylinder, Form (n, k)
+    :return: True je Punkt und Zylinder, welcher den Punkt enthält, Form (n, s, k)
+    """
+    relative = points[ :, :, None, : ] - starts[ :, None, :, : ]
+    axial = np.einsum( 'nskj,nkj->nsk', relative, units )
+    radial = np.einsum( 'nskj,nskj->nsk', relative, relative ) - axial ** 2
+    return ( axial >= 0. ) & ( axial <= lengths[ :, None, : ] ) & ( radial <= radii[ :, None, : ] ** 2 )
+
+
+def union( starts: np.ndarray, ends: np.ndarray, radii: np.ndarray, solid: TriangleMesh | None = None,
+           samples: int = 512, tolerance: float = 1e-6 ) -> tuple[ float, float, np.ndarray, float ]:
+    """
+    Volumen, Oberfläche und Schwerpunkt der Vereinigung von Zylindern mit ebenen Enden, ohne B-Rep-Operation. Die
+    Werte der einzelnen Zylinder werden um ihre Überschneidungen korrigiert. Für jeden Zylinder mit Nachbarn wird der
+    Abschnitt der Achse, in welchem sich Überschneidungen ergeben können, mit quasizufälligen Punkten abgetastet. Ein
+    Punkt, welcher in c Zylindern liegt, zählt mit 1 - 1 / c zur Überschneidung, ein Punkt der Oberfläche innerhalb
+    eines Nachbarn als verdeckt. Zylinder mit gleicher Umgebung, wie in periodischen Gittern, werden nur einmal
+    abgetastet.
+
+    Mit einem Körper, etwa der Schale, zählen Punkte in diesem vollständig zur Überschneidung. Zylinder, deren
+    Begrenzungsquader Dreiecke des Körpers berühren oder welche in diesem liegen, werden dazu einzeln betrachtet.
+    Deren Anteil im Körper ergibt sich über die gesamte Länge exakt aus den Schnittpunkten achsparalleler Strecken
+    durch die Abtastpunkte des Querschnitts mit dessen Dreiecken, ebenso die von den Zylindern verdeckte Oberfläche
+    des Körpers.
+
+    :param starts: Startpunkte der Achsen, Form (n, 3)
+    :param ends: Endpunkte der Achsen, Form (n, 3)
+    :param radii: Radien, Form (n,)
+    :param solid: Körper als geschlossenes Dreiecksnetz, dessen Volumen bereits anderweitig erfasst ist
+    :param samples: Anzahl der Abtastpunkte je Zylinder
+    :param tolerance: Rasterweite, auf welche die Umgebung eines Zylinders für den Vergleich gerundet wird
+    :return: Volumen, Oberfläche und Schwerpunkt sowie die verdeckte Oberfläche des Körpers
+    """
+    starts = np.asarray( starts, dtype = float ).reshape( -1, 3 )
+    ends = np.asarray( ends, dtype = float ).reshape( -1, 3 )
+    radii = np.asarray( radii, dtype = float ).reshape( -1 )
+
+    lengths = np.linalg.norm( ends - starts, axis = 1 )
+    keep = lengths > 0.
+    starts, ends, radii, lengths = starts[ keep ], ends[ keep ], radii[ keep ], lengths[ keep ]
+    if len( starts ) == 0:
+        return 0., 0., np.zeros( 3 ), 0.
+    units = ( ends - starts ) / lengths[ :, None ]
+
+    sections = np.pi * radii ** 2
+    volume = float( np.sum( sections * lengths ) )
+    moment = ( sections * lengths ) @ ( starts + ends ) / 2.
+    area = float( np.sum( 2. * np.pi * radii * lengths + 2. * sections ) )
+
+    # Paare sich überschneidender Zylinder in beiden Richtungen
+    lower = np.minimum( starts, ends ) - radii[ :, None ]
+    upper = np.maximum( starts, ends ) + radii[ :, None ]
+    first, second = BoundingVolumeHierarchy( lower, upper ).boxes( lower, upper )
+    candidates = first != second
+    first, second = first[ candidates ], second[ candidates ]
+    gaps = Mesh.segment_segment_distances( starts[ first ], ends[ first ], starts[ second ],
+                                           ends[ second ] ) - radii[ first ] - radii[ second ]
+    first, second = first[ gaps < 0. ], second[ gaps < 0. ]
+
+    # Zylinder, deren Begrenzungsquader Dreiecke des Körpers berühren oder welche vollständig in diesem liegen
+    near = np.zeros( len( starts ), dtype = bool )
+    if solid is not None:
+        near[ solid.hierarchy.boxes( lower, upper )[ 0 ] ] = True
+        if not np.all( near ):
+            near[ ~ near ] = solid.contains( starts[ ~ near ] )
+    if len( first ) == 0 and not np.any( near ):
+        return volume, area, moment / volume, 0.
+
+    # Abschnitt der Achse, außerhalb dessen ein Punkt weiter als die Summe der Radien von der Nachbarachse entfernt ist
+    cosine = np.einsum( 'ij,ij->i', units[ first ], units[ second ] )
+    sine = np.sqrt( np.maximum( 1. - cosine ** 2, 0. ) )
+    offset = starts[ first ] - starts[ second ]
+    closest = np.where( sine > 1e-9,
+                        ( cosine * np.einsum( 'ij,ij->i', units[ second ], offset ) -
+                          np.einsum( 'ij,ij->i', units[ first ], offset ) ) / np.maximum( sine ** 2, 1e-18 ),
+                        np.einsum( 'ij,ij->i', ( starts[ second ] + ends[ second ] ) / 2. - starts[ first ],
+                                   units[ first ] ) )
+    reach = ( radii[ first ] + radii[ second ] ) / np.maximum( sine, 1e-9 )
+    begin = np.full( len( starts ), np.inf )
+    finish = np.full( len( starts ), -np.inf )
+    np.minimum.at( begin, first, closest - reach )
+    np.maximum.at( finish, first, closest + reach )
+    begin, finish = np.clip( begin, 0., lengths ), np.clip( finish, 0., lengths )
+    empty = begin > finish
+    begin[ empty ], finish[ empty ] = 0., 0.
+
+    # Umgebung je Zylinder relativ zu dessen Startpunkt, Nachbarn ohne Beachtung der Richtung geordnet
+    middles = ( starts[ second ] + ends[ second ] ) / 2. - starts[ first ]
+    halves = ( ends[ second ] - starts[ second ] ) / 2.
+    leading = halves[ np.arange( len( halves ) ), np.argmax( np.abs( halves ) > tolerance, axis = 1 ) ]
+    halves = np.where( ( leading < 0. )[ :, None ], - halves, halves )
+    neighbours = np.round( np.concatenate( ( middles, halves, radii[ second, None ] ), axis = 1 ) /
+                           tolerance ).astype( np.int64 )
+    order = np.lexsort( tuple( neighbours.T[ :: -1 ] ) + ( first, ) )
+    first, second, neighbours = first[ order ], second[ order ], neighbours[ order ]
+
+    # Zylinder nahe des Körpers haben eine eigene Umgebung
+    counts = np.bincount( first, minlength = len( starts ) )
+    offsets = np.concatenate( ( [ 0 ], np.cumsum( counts ) ) )
+    own = np.round( np.concatenate( ( ends - starts, radii[ :, None ], begin[ :, None ], finish[ :, None ] ), axis = 1 )
+                    / tolerance ).astype( np.int64 )
+    own = np.concatenate( ( own, np.where( near, np.arange( len( starts ) ), -1 )[ :, None ] ), axis = 1 )
+
+    points = _halton( samples )
+    overlap = 0.
+    shift = np.zeros( 3 )
+    hidden = 0.
+    covered = 0.
+
+    for count in np.unique( counts[ ( counts > 0 ) | near ] ):
+        members = np.flatnonzero( ( counts == count ) & ( ( counts > 0 ) | near ) )
+        pairs = offsets[ members ][ :, None ] + np.arange( count )[ None, : ]
+        rows = np.ascontiguousarray( np.concatenate( ( own[ members ], neighbours[ pairs ].reshape( len( members ),
+                                                                                                    -1 ) ), axis = 1 ) )
+        _, representatives, inverse = np.unique( rows.view( np.dtype( ( np.void, rows.dtype.itemsize *
+                                                                        rows.shape[ 1 ] ) ) ),
+                                                 return_index = True, return_inverse = True )
+        inverse = inverse.reshape( -1 )
+        step = max( 1, ( 2 ** 16 if np.any( near[ members ] ) else 2 ** 22 ) // ( samples * max( count, 1 ) ) )
+        results = np.zeros( ( len( representatives ), 6 ) )
+
+        for block in range( 0, len( representatives ), step ):
+            index = members[ representatives[ block: block + step ] ]
+            other = second[ offsets[ index ][ :, None ] + np.arange( count )[ None, : ] ]
+            results[ block: block + step ] = _sample(
+                points, starts[ index ], units[ index ], lengths[ index ], radii[ index ], begin[ index ],
+                finish[ index ], starts[ other ], units[ other ], lengths[ other ], radii[ other ],
+                solid, near[ index ] )
+
+        # Werte des Vertreters gelten für alle Zylinder gleicher Umgebung, das Moment relativ zu deren Startpunkt
+        results = results[ inverse ]
+        overlap += float( results[ :, 0 ].sum() )
+        shift += results[ :, 0 ] @ starts[ members ] + results[ :, 1: 4 ].sum( axis = 0 )
+        hidden += float( results[ :, 4 ].sum() )
+        covered += float( results[ :, 5 ].sum() )
+
+    volume -= overlap
+    centroid = ( moment - shift ) / volume if volume > 0. else np.zeros( 3 )
+    return volume, area - hidden, centroid, covered
+
+
+def _crossings( solid: TriangleMesh, starts: np.ndarray, units: np.ndarray, lengths: np.ndarray, offsets: np.ndarray,
+                lines: np.ndarray, positions: tuple[ np.ndarray, ... ] ) -> tuple[ list[ np.ndarray ], np.ndarray,
+                                                                                   np.ndarray, np.ndarray, np.ndarray,
+                                                                                   np.ndarray ]:
+    """
+    Prüft für Punkte auf achsparallelen Strecken durch Zylinder, ob diese im Körper liegen. Ausgehend von einem Punkt
+    der Achse wird die Parität der Durchstoßpunkte durch das Netz erst entlang des Querschnitts und dann entlang der
+    Strecken gezählt, sodass nur ein Strahl je Zylinder das Netz verlassen muss. Treffer auf Kanten und Ecken zählen
+    nur einmal, siehe TriangleMesh.crossings. Aus den Durchstoßpunkten ergeben sich zudem Länge und Moment des Anteils
+    jeder Strecke im Körper exakt.
+
+    :param solid: Körper als geschlossenes Dreiecksnetz
+    :param starts: Startpunkte der Achsen, Form (n, 3)
+    :param units: Achsrichtungen, Form (n, 3)
+    :param lengths: Längen, Form (n,)
+    :param offsets: Versatz der Strecken gegenüber der Achse, Form (n, m, 3)
+    :param lines: Strecke je Punkt, Form (s,)
+    :param positions: Lage der Punkte auf ihrer Strecke als Anteil der Länge, je Eintrag Form (n, s)
+    :return: True je Punkt im Körper für jeden Eintrag von positions, Anteil der Länge jeder Strecke im Körper und
+             dessen erstes Moment über dem Streckenparameter, je Form (n, m), sowie Index der Strecke,
+             Streckenparameter und Index des Dreiecks je Schnittpunkt der Strecken mit dem Netz
+    """
+    # Bezugspunkt auf der Achse abseits der Enden, welche oft auf der Oberfläche des Netzes liegen
+    count, size = offsets.shape[ :2 ]
+    reference = np.sqrt( 2. ) - 1.
+    centres = starts + ( reference * lengths )[ :, None ] * units
+    origins = ( starts[ :, None, : ] + offsets ).reshape( -1, 3 )
+    radial, _, _ = solid.crossings( np.repeat( centres, size, axis = 0 ), origins + np.repeat( centres - starts, size,
+                                                                                               axis = 0 ) )
+    base = np.repeat( solid.contains( centres ), size ) ^ ( np.bincount( radial, minlength = count * size ) % 2 == 1 )
+
+    line, parameter, triangle = solid.crossings( origins, origins + np.repeat( lengths[ :, None ] * units, size,
+                                                                                axis = 0 ) )
+    keys = np.sort( 2. * line + parameter )
+    query = ( np.arange( count )[ :, None ] * size + lines[ None, : ] ).reshape( -1 )
+    middle = np.searchsorted( keys, 2. * query + reference )
+    inside = [ ( base[ query ] ^ ( np.abs( np.searchsorted( keys, 2. * query + position.reshape( -1 ) ) - middle ) % 2
+                                   == 1 ) ).reshape( count, -1 ) for position in positions ]
+
+    # Lage am Anfang jeder Strecke, danach wechselt diese an jedem Durchstoßpunkt
+    every = np.arange( count * size )
+    edges = np.searchsorted( keys, 2. * every )
+    zero = base ^ ( ( np.searchsorted( keys, 2. * every + reference ) - edges ) % 2 == 1 )
+    owner = np.minimum( np.floor( keys / 2. ).astype( np.int64 ), count * size - 1 )
+    fraction = keys - 2. * owner
+    entering = ~ ( zero[ owner ] ^ ( ( np.arange( len( keys ) ) - edges[ owner ] ) % 2 == 1 ) )
+    sign = np.where( entering, 1., -1. )
+    share = zero + np.bincount( owner, weights = sign * ( 1. - fraction ), minlength = count * size )
+    moment = zero / 2. + np.bincount( owner, weights = sign * ( 1. - fraction ** 2 ) / 2., minlength = count * size )
+    return inside, share.reshape( count, size ), moment.reshape( count, size ), line, parameter, triangle
+
+
+def _sample( points: np.ndarray, starts: np.ndarray, units: np.ndarray, lengths: np.ndarray, radii: np.ndarray,
+             begin: np.ndarray, finish: np.ndarray, neighbour_starts: np.ndarray, neighbour_units: np.ndarray,
+             neighbour_lengths: np.ndarray, neighbour_radii: np.ndarray, solid: TriangleMesh | None,
+             near: np.ndarray ) -> np.ndarray:
+    """
+    Tastet Zylinder im Abschnitt möglicher Überschneidungen und an ihren Deckflächen ab
+
+    :param points: quasizufällige Punkte im Einheitswürfel, Form (s, 3)
+    :param starts: Startpunkte der Achsen, Form (n, 3)
+    :param units: Achsrichtungen, Form (n, 3)
+    :param lengths: Längen, Form (n,)
+    :param radii: Radien, Form (n,)
+    :param begin: Beginn des Abschnitts auf der Achse, Form (n,)
+    :param finish: Ende des Abschnitts auf der Achse, Form (n,)
+    :param neighbour_starts: Startpunkte der Nachbarn, Form (n, k, 3)
+    :param neighbour_units: Achsrichtungen der Nachbarn, Form (n, k, 3)
+    :param neighbour_lengths: Längen der Nachbarn, Form (n, k)
+    :param neighbour_radii: Radien der Nachbarn, Form (n, k)
+    :param solid: Körper als geschlossenes Dreiecksnetz
+    :param near: Zylinder nahe des Körpers, Form (n,)
+    :return: je Zylinder Volumen der Überschneidung, deren Moment bezogen auf den Startpunkt, verdeckte Oberfläche
+             und verdeckte Oberfläche des Körpers, Form (n, 6)
+    """
+    # Punkte der Zylinder nahe des Körpers liegen paarweise auf achsparallelen Strecken, um dessen Schnitte zu begrenzen
+    size = max( 1, len( points ) // 2 )
+    lines = np.arange( len( points ) ) % size
+    pattern = np.where( near[ :, None, None ], points[ None, lines, 1: ], points[ None, :, 1: ] )
+    first, second = _frames( units )
+    angle = 2. * np.pi * pattern[ :, :, 1, None ]
+    radial = first[ :, None, : ] * np.cos( angle ) + second[ :, None, : ] * np.sin( angle )
+    axial = begin[ :, None ] + ( finish - begin )[ :, None ] * points[ None, :, 0 ]
+    spread = np.sqrt( pattern[ :, :, 0, None ] ) * radii[ :, None, None ]
+    neighbours = ( neighbour_starts, neighbour_units, neighbour_lengths, neighbour_radii )
+    result = np.zeros( ( len( starts ), 6 ) )
+
+    # Lage im Körper entlang achsparalleler Strecken durch den Querschnitt und durch die Mantelfläche. Der Anteil im
+    # Körper wird je Strecke exakt integriert, die Punkte erfassen nur noch die Überschneidungen außerhalb.
+    solids = np.zeros( ( 4, len( starts ), len( points ) ), dtype = bool )
+    exact = np.zeros( ( len( starts ), 5 ) )
+    if solid is not None and np.any( near ):
+        index = np.flatnonzero( near )
+        fractions = axial[ index ] / lengths[ index, None ]
+        offsets = ( spread * radial )[ index, : size ]
+        ( solids[ 0, index ], solids[ 1, index ], solids[ 2, index ] ), share, moment, line, parameter, triangle = \
+            _crossings( solid, starts[ index ], units[ index ], lengths[ index ], offsets, lines,
+                        ( fractions, np.zeros_like( fractions ), np.ones_like( fractions ) ) )
+        ( solids[ 3, index ], ), mantle, *_ = _crossings( solid, starts[ index ], units[ index ], lengths[ index ],
+                                                          radii[ index, None, None ] * radial[ index, : size ], lines,
+                                                          ( fractions, ) )
+        exact[ index, 0 ] = share.mean( axis = 1 )
+        exact[ index, 1: 4 ] = ( np.einsum( 'nm,nmj->nj', share, starts[ index, None, : ] + offsets ) +
+                                 moment.sum( axis = 1 )[ :, None ] * lengths[ index, None ] * units[ index ] ) / size
+        exact[ index, 4 ] = mantle.mean( axis = 1 )
+
+        # Schnittpunkte der Strecken durch den Querschnitt mit der Oberfläche des Körpers, gewichtet mit deren
+        # Neigung. Ein Schnittpunkt, welcher in c Zylindern liegt, zählt mit 1 / c.
+        row = index[ line // size ]
+        corners = solid.vertices[ solid.triangles[ triangle ] ]
+        normals = np.cross( corners[ :, 1 ] - corners[ :, 0 ], corners[ :, 2 ] - corners[ :, 0 ] )
+        normals /= np.linalg.norm( normals, axis = 1 )[ :, None ]
+        cosine = np.abs( np.einsum( 'ij,ij->i', normals, units[ row ] ) )
+        hits = starts[ row ] + ( spread * radial )[ row, line % size ] + \
+            ( parameter * lengths[ row ] )[ :, None ] * units[ row ]
+        shares = 1. / ( 1. + _inside( hits[ :, None, : ], *( values[ row ] for values in neighbours ) )[ :, 0 ].sum(
+            axis = 1 ) )
+        result[ :, 5 ] = np.bincount( row, weights = shares * np.pi * radii[ row ] ** 2 / size /
+                                      np.maximum( cosine, 1e-3 ), minlength = len( starts ) )
+
+    inner = starts[ :, None, : ] + axial[ :, :, None ] * units[ :, None, : ] + spread * radial
+    shares = np.where( solids[ 0 ], 0., 1. - 1. / ( 1. + _inside( inner, *neighbours ).sum( axis = 2 ) ) )
+    segment = np.pi * radii ** 2 * ( finish - begin )
+    full = np.pi * radii ** 2 * lengths
+    result[ :, 0 ] = segment * shares.mean( axis = 1 ) + full * exact[ :, 0 ]
+    result[ :, 1: 4 ] = segment[ :, None ] * np.einsum( 'ns,nsj->nj', shares, inner ) / len( points ) + \
+        full[ :, None ] * exact[ :, 1: 4 ] - result[ :, 0, None ] * starts
+
+    surface = starts[ :, None, : ] + axial[ :, :, None ] * units[ :, None, : ] + radii[ :, None, None ] * radial
+    blocked = _inside( surface, *neighbours ).any( axis = 2 ) & ~ solids[ 3 ]
+    result[ :, 4 ] = 2. * np.pi * radii * ( ( finish - begin ) * blocked.mean( axis = 1 ) + lengths * exact[ :, 4 ] )
+    for position, within in ( ( np.zeros( len( starts ) ), solids[ 1 ] ), ( lengths, solids[ 2 ] ) ):
+        cap = starts[ :, None, : ] + position[ :, None, None ] * units[ :, None, : ] + spread * radial
+        blocked = _inside( cap, *neighbours ).any( axis = 2 ) | within
+        result[ :, 4 ] += np.pi * radii ** 2 * blocked.mean( axis = 1 )
+
+    return result
+
+
+def struts( graph: StrutGraph, shortened: bool = True, mesh: TriangleMesh | None = None ) -> StrutGraph:
+    """
+    Graph der Zylinder eines zurechtgeschnittenen Gitters. Abgeschnittene Enden werden wie beim Erzeugen der Körper
+    zurückgezogen, siehe Geometry._segments.
+
+    :param graph: zurechtgeschnittener Graph
+    :param shortened: steuert, ob abgeschnittene Enden zurückgezogen werden
+    :param mesh: Dreiecksnetz der Eingangsgeometrie, ohne dieses werden abgeschnittene Enden um den Radius gekürzt
+    :return: Graph der Zylinder
+    """
+    if shortened:
+        starts, ends, radii = Geometry._segments( graph, mesh = mesh )
+    else:
+        starts, ends, radii = graph.starts(), graph.ends(), graph.diameters / 2.
+    keep = np.linalg.norm( ends - starts, axis = 1 ) > 0.
+    nodes = np.stack( [ starts[ keep ], ends[ keep ] ], axis = 1 ).reshape( -1, 3 )
+    return StrutGraph( nodes, np.arange( len( nodes ) ).reshape( -1, 2 ), 2. * radii[ keep ], graph.cells[ keep ],
+                       complete = graph.complete )
+
+
+def lattice( graph: StrutGraph, shell: TriangleMesh | None = None, samples: int = 512,
+             tolerance: float = 1e-6 ) -> dict:
+    """
+    Volumen, Oberfläche und Schwerpunkt eines Gitters aus dessen Zylindern ohne das Material der Schale, siehe union
+
+    :param graph: Graph der Zylinder, siehe struts
+    :param shell: Schale als geschlossenes Dreiecksnetz
+    :param samples: Anzahl der Abtastpunkte je Zylinder
+    :param tolerance: Rasterweite für den Vergleich der Umgebungen
+    :return: Volumen unter volume, Oberfläche unter area, Schwerpunkt unter centroid, von den Streben verdeckte
+             Schalenfläche unter covered sowie Anzahl der Streben unter struts
+    """
+    volume, area, centroid, covered = union( graph.starts(), graph.ends(), graph.diameters / 2., shell, samples,
+                                             tolerance )
+    return { "volume": volume, "area": area, "centroid": centroid, "covered": covered, "struts": len( graph.struts ) }
+
+
+def _cells( graph: StrutGraph ) -> np.ndarray:
+    """
+    Zelle je Strebe. Ohne Zellen, etwa bei stochastischen Gittern, werden die Mittelpunkte der Streben einem Raster
+    mit doppelter mittlerer Strebenlänge zugeordnet.
+    """
+    if len( graph.cells ) == 0 or np.all( graph.cells >= 0 ):
+        return graph.cells
+    middles = ( graph.starts() + graph.ends() ) / 2.
+    spacing = 2. * max( float( np.mean( graph.lengths() ) ), 1e-9 )
+    _, labels = np.unique( np.floor( ( middles - middles.min( axis = 0 ) ) / spacing ).astype( np.int64 ), axis = 0,
+                           return_inverse = True )
+    return labels.reshape( -1 )
+
+
+def cross_check( graph: StrutGraph, count: int, seed: int | None = None, samples: int = 512 ) -> dict:
+    """
+    Vergleicht Volumen und Oberfläche der Zylinder zufällig gewählter Zellen, ohne Schale, mit deren Vereinigung in
+    OpenCascade
+
+    :param graph: Graph der Zylinder, siehe struts
+    :param count: Anzahl der Zellen
+    :param seed: Startwert des Zufallsgenerators
+    :param samples: Anzahl der Abtastpunkte je Zylinder
+    :return: Zellen unter cells, Volumen und Oberfläche je Zelle unter analytic und occ, Form (n, 2), sowie größte
+             relative Abweichung von Volumen und Oberfläche unter volume und area
+    """
+    labels = _cells( graph )
+    available = np.unique( labels )
+    cells = np.sort( np.random.default_rng( seed ).choice( available, min( int( count ), len( available ) ),
+                                                           replace = False ) )
+    starts, ends, radii = graph.starts(), graph.ends(), graph.diameters / 2.
+    analytic, exact = np.zeros( ( len( cells ), 2 ) ), np.zeros( ( len( cells ), 2 ) )
+
+    for row, cell in enumerate( cells.tolist() ):
+        mask = labels == cell
+        volume, area, _, _ = union( starts[ mask ], ends[ mask ], radii[ mask ], samples = samples )
+        analytic[ row ] = volume, area
+
+        cylinders = [ Solid.makeCylinder( radius, float( np.linalg.norm( np.subtract( end, start ) ) ),
+                                          Vector( *start ), Vector( *np.subtract( end, start ) ) )
+                      for start, end, radius in zip( starts[ mask ].tolist(), ends[ mask ].tolist(),
+                                                     radii[ mask ].tolist() ) ]
+        fused = cylinders[ 0 ].fuse( *cylinders[ 1: ] ) if len( cylinders ) > 1 else cylinders[ 0 ]
+        exact[ row ] = fused.Volume(), fused.Area()
+
+    errors = np.abs( analytic - exact ) / np.maximum( np.abs( exact ), 1e-300 )
+    maximum = errors.max( axis = 0 ) if len( cells ) > 0 else np.zeros( 2 )
+    return { "cells": cells, "analytic": analytic, "occ": exact, "volume": float( maximum[ 0 ] ),
+             "area": float( maximum[ 1 ] ) }
@@ -0,0 +1,564 @@
+import numpy as np
+import re
+from typing import Any
+
+
+def _dot( a: np.ndarray, b: np.ndarray ) -> np.ndarray:
+    """
+    Zeilenweises Skalarprodukt zweier Felder der Form (n, 3)
+    """
+    return np.einsum( 'ij,ij->i', a, b )
+
+
+def _point_triangle_distances( points: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray ) -> np.ndarray:
+    """
+    Berechnet paarweise die Abstände zwischen Punkten und Dreiecken über die Voronoi-Bereiche der Ecken, Kanten und
+    der Fläche des Dreiecks
+
+    :param points: Koordinaten der Punkte, Form (n, 3)
+    :param a: erste Eckpunkte der Dreiecke, Form (n, 3)
+    :param b: zweite Eckpunkte der Dreiecke, Form (n, 3)
+    :param c: dritte Eckpunkte der Dreiecke, Form (n, 3)
+    :return: Abstände, Form (n,)
+    """
+    ab, ac = b - a, c - a
+    ap, bp, cp = points - a, points - b, points - c
+    d1, d2 = _dot( ab, ap ), _dot( ac, ap )
+    d3, d4 = _dot( ab, bp ), _dot( ac, bp )
+    d5, d6 = _dot( ab, cp ), _dot( ac, cp )
+    va, vb, vc = d3 * d6 - d5 * d4, d5 * d2 - d1 * d6, d1 * d4 - d3 * d2
+
+    def _ratio( numerator: np.ndarray, denominator: np.ndarray ) -> np.ndarray:
+        """
+        Quotient mit Schutz vor Division durch 0 bei entarteten Dreiecken
+        """
+        safe = np.where( np.abs( denominator ) > 1e-300, denominator, 1. )
+        return ( numerator / safe )[ :, None ]
+
+    total = va + vb + vc
+    closest = a + ab * _ratio( vb, total ) + ac * _ratio( vc, total )
+
+    regions = [
+        ( ( va <= 0. ) & ( d4 - d3 >= 0. ) & ( d5 - d6 >= 0. ),
+          b + ( c - b ) * _ratio( d4 - d3, ( d4 - d3 ) + ( d5 - d6 ) ) ),
+        ( ( vb <= 0. ) & ( d2 >= 0. ) & ( d6 <= 0. ), a + ac * _ratio( d2, d2 - d6 ) ),
+        ( ( d6 >= 0. ) & ( d5 <= d6 ), c ),
+        ( ( vc <= 0. ) & ( d1 >= 0. ) & ( d3 <= 0. ), a + ab * _ratio( d1, d1 - d3 ) ),
+        ( ( d3 >= 0. ) & ( d4 <= d3 ), b ),
+        ( ( d1 <= 0. ) & ( d2 <= 0. ), a )
+    ]
+    for mask, point in regions:
+        closest = np.where( mask[ :, None ], point, closest )
+
+    return np.linalg.norm( points - closest, axis = 1 )
+
+
+def segment_point_distances( starts: np.ndarray, ends: np.ndarray, points: np.ndarray ) -> np.ndarray:
+    """
+    Berechnet die Abstände zwischen Strecken und Punkten paarweise
+
+    :param starts: Startpunkte der Strecken, Form (n, 3)
+    :param ends: Endpunkte der Strecken, Form (n, 3)
+    :param points: Punkte, Form (n, 3)
+    :return: Abstände, Form (n,)
+    """
+    direction = ends - starts
+    squared = np.einsum( 'ij,ij->i', direction, direction )
+    t = np.einsum( 'ij,ij->i', points - starts, direction ) / np.where( squared > 0., squared, 1. )
+    closest = starts + np.clip( t, 0., 1. )[ :, None ] * direction
+    return np.linalg.norm( points - closest, axis = 1 )
+
+
+def segment_segment_distances( p1: np.ndarray, q1: np.ndarray, p2: np.ndarray, q2: np.ndarray ) -> np.ndarray:
+    """
+    Berechnet die kleinsten Abstände zwischen zwei Mengen von Strecken paarweise
+
+    :param p1: Startpunkte der ersten Strecken, Form (n, 3)
+    :param q1: Endpunkte der ersten Strecken, Form (n, 3)
+    :param p2: Startpunkte der zweiten Strecken, Form (n, 3)
+    :param q2: Endpunkte der zweiten Strecken, Form (n, 3)
+    :return: Abstände, Form (n,)
+    """
+    d1, d2, r = q1 - p1, q2 - p2, p1 - p2
+    a = np.einsum( 'ij,ij->i', d1, d1 )
+    e = np.einsum( 'ij,ij->i', d2, d2 )
+    f = np.einsum( 'ij,ij->i', d2, r )
+    c = np.einsum( 'ij,ij->i', d1, r )
+    b = np.einsum( 'ij,ij->i', d1, d2 )
+    denominator = a * e - b * b
+
+    safe_a = np.where( a > 0., a, 1. )
+    safe_e = np.where( e > 0., e, 1. )
+    s = np.where( denominator > 1e-12, np.clip( ( b * f - c * e ) / np.where( denominator > 1e-12, denominator, 1. ),
+                                                0., 1. ), 0. )
+    t = ( b * s + f ) / safe_e
+    s = np.where( t < 0., np.clip( - c / safe_a, 0., 1. ), np.where( t > 1., np.clip( ( b - c ) / safe_a, 0., 1. ), s ) )
+    t = np.clip( t, 0., 1. )
+
+    return np.linalg.norm( ( p1 + s[ :, None ] * d1 ) - ( p2 + t[ :, None ] * d2 ), axis = 1 )
+
+
+def _segment_triangle_hits( starts: np.ndarray, ends: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray,
+                            margin: float = 0. ) -> tuple[ np.ndarray, np.ndarray ]:
+    """
+    Schnitttest zwischen Strecken und Dreiecken paarweise nach Möller und Trumbore
+
+    :param starts: Startpunkte der Strecken, Form (n, 3)
+    :param ends: Endpunkte der Strecken, Form (n, 3)
+    :param a: erste Eckpunkte der Dreiecke, Form (n, 3)
+    :param b: zweite Eckpunkte der Dreiecke, Form (n, 3)
+    :param c: dritte Eckpunkte der Dreiecke, Form (n, 3)
+    :param margin: Erweiterung der Dreiecke in baryzentrischen Koordinaten
+    :return: True für alle Paare mit Schnittpunkt sowie Streckenparameter des Schnittpunkts, Form (n,)
+    """
+    direction = ends - starts
+    edge1, edge2 = b - a, c - a
+    p = np.cross( direction, edge2 )
+    determinant = _dot( edge1, p )
+    valid = np.abs( determinant ) > 1e-14
+    inverse = np.where( valid, 1. / np.where( valid, determinant, 1. ), 0. )
+
+    s = starts - a
+    u = _dot( s, p ) * inverse
+    q = np.cross( s, edge1 )
+    v = _dot( direction, q ) * inverse
+    t = _dot( edge2, q ) * inverse
+
+    hit = valid & ( u >= - margin ) & ( v >= - margin ) & ( u + v <= 1. + margin ) & ( t >= 0. ) & ( t <= 1. )
+    return hit, t
+
+
+def segment_triangle_distances( starts: np.ndarray, ends: np.ndarray, a: np.ndarray, b: np.ndarray,
+                                c: np.ndarray ) -> np.ndarray:
+    """
+    Berechnet die kleinsten Abstände zwischen Strecken und Dreiecken paarweise. Schneidet eine Strecke das Dreieck
+    nicht, liegt der kleinste Abstand an einem Endpunkt der Strecke oder zwischen der Strecke und einer Kante.
+
+    :param starts: Startpunkte der Strecken, Form (n, 3)
+    :param ends: Endpunkte der Strecken, Form (n, 3)
+    :param a: erste Eckpunkte der Dreiecke, Form (n, 3)
+    :param b: zweite Eckpunkte der Dreiecke, Form (n, 3)
+    :param c: dritte Eckpunkte der Dreiecke, Form (n, 3)
+    :return: Abstände, Form (n,)
+    """
+    distances = np.minimum( _point_triangle_distances( starts, a, b, c ), _point_triangle_distances( ends, a, b, c ) )
+    for first, second in ( ( a, b ), ( b, c ), ( c, a ) ):
+        distances = np.minimum( distances, segment_segment_distances( starts, ends, first, second ) )
+    hit, _ = _segment_triangle_hits( starts, ends, a, b, c )
+    return np.where( hit, 0., distances )
+
+
+class BoundingVolumeHierarchy:
+    """
+    Hüllkörperhierarchie aus achsparallelen Quadern über einer Menge von Dreiecken, gespeichert in Feldern
+    """
+    def __init__( self, lower: np.ndarray, upper: np.ndarray, leaf_size: int = 8 ) -> None:
+        """
+        Aufbau der Hierarchie durch Teilung am Median der Schwerpunkte entlang der längsten Achse
+
+        :param lower: kleinste Koordinaten der Begrenzungsquader der Primitive, Form (m, 3)
+        :param upper: größte Koordinaten der Begrenzungsquader der Primitive, Form (m, 3)
+        :param leaf_size: maximale Anzahl an Primitiven je Blatt
+        """
+        centroids = ( lower + upper ) / 2.
+        order = np.arange( len( lower ) )
+
+        node_lower: list[ np.ndarray ] = []
+        node_upper: list[ np.ndarray ] = []
+        left: list[ int ] = []
+        right: list[ int ] = []
+        start: list[ int ] = []
+        count: list[ int ] = []
+
+        def _node( begin: int, end: int ) -> int:
+            """
+            Fügt einen Knoten für die Primitive order[ begin: end ] hinzu
+
+            :return: Index des neuen Knotens
+            """
+            index = len( left )
+            items = order[ begin: end ]
+            node_lower.append( lower[ items ].min( axis = 0 ) )
+            node_upper.append( upper[ items ].max( axis = 0 ) )
+            left.append( -1 )
+            right.append( -1 )
+            start.append( begin )
+            count.append( end - begin )
+            return index
+
+        root = _node( 0, len( order ) ) if len( order ) > 0 else -1
+        stack = [ ( root, 0, len( order ) ) ] if root >= 0 else []
+
+        while stack:
+            index, begin, end = stack.pop()
+            if end - begin <= leaf_size:
+                continue
+
+            items = order[ begin: end ]
+            axis = int( np.argmax( node_upper[ index ] - node_lower[ index ] ) )
+            middle = ( end - begin ) // 2
+            order[ begin: end ] = items[ np.argpartition( centroids[ items, axis ], middle ) ]
+
+            left[ index ] = _node( begin, begin + middle )
+            right[ index ] = _node( begin + middle, end )
+            count[ index ] = 0
+            stack.append( ( left[ index ], begin, begin + middle ) )
+            stack.append( ( right[ index ], begin + middle, end ) )
+
+        self.order: np.ndarray = order
+        self.lower: np.ndarray = np.array( node_lower ).reshape( -1, 3 )
+        self.upper: np.ndarray = np.array( node_upper ).reshape( -1, 3 )
+        self.left: np.ndarray = np.array( left, dtype = np.int64 )
+        self.right: np.ndarray = np.array( right, dtype = np.int64 )
+        self.start: np.ndarray = np.array( start, dtype = np.int64 )
+        self.count: np.ndarray = np.array( count, dtype = np.int64 )
+
+    def query( self, overlaps: Any, queries: int ) -> tuple[ np.ndarray, np.ndarray ]:
+        """
+        Durchläuft die Hierarchie für alle Anfragen gleichzeitig. Die Funktion overlaps erhält Anfrage- und
+        Knotenindizes und gibt zurück, welche Paare sich überschneiden.
+
+        :param overlaps: vektorisierte Überschneidungsprüfung zwischen Anfragen und Knoten
+        :param queries: Anzahl der Anfragen
+        :return: Indizes der Anfragen und der Primitive aller Kandidatenpaare
+        """
+        found_queries: list[ np.ndarray ] = []
+        found_items: list[ np.ndarray ] = []
+
+        if len( self.left ) == 0 or queries == 0:
+            return np.zeros( 0, dtype = np.int64 ), np.zeros( 0, dtype = np.int64 )
+
+        query = np.arange( queries, dtype = np.int64 )
+        node = np.zeros( queries, dtype = np.int64 )
+
+        while len( query ) > 0:
+            hit = overlaps( query, node )
+            query, node = query[ hit ], node[ hit ]
+
+            leaf = self.count[ node ] > 0
+            leaf_query, leaf_node = query[ leaf ], node[ leaf ]
+            sizes = self.count[ leaf_node ]
+            offsets = np.arange( sizes.sum() ) - np.repeat( np.cumsum( sizes ) - sizes, sizes )
+            found_queries.append( np.repeat( leaf_query, sizes ) )
+            found_items.append( self.order[ np.repeat( self.start[ leaf_node ], sizes ) + offsets ] )
+
+            inner_query, inner_node = query[ ~leaf ], node[ ~leaf ]
+            query = np.concatenate( [ inner_query, inner_query ] )
+            node = np.concatenate( [ self.left[ inner_node ], self.right[ inner_node ] ] )
+
+        return np.concatenate( found_queries ), np.concatenate( found_items )
+
+    def box_distances( self, points: np.ndarray, node: np.ndarray ) -> np.ndarray:
+        """
+        Berechnet paarweise die Abstände zwischen Punkten und Knotenquadern
+
+        :param points: Koordinaten der Punkte, Form (n, 3)
+        :param node: Indizes der Knoten, Form (n,)
+        :return: Abstände, 0 für Punkte innerhalb des Quaders
+        """
+        gap = np.maximum( np.maximum( self.lower[ node ] - points, points - self.upper[ node ] ), 0. )
+        return np.linalg.norm( gap, axis = 1 )
+
+    def descend( self, points: np.ndarray ) -> tuple[ np.ndarray, np.ndarray ]:
+        """
+        Steigt für jeden Punkt bis zu einem Blatt ab, wobei jeweils der Kindknoten mit dem geringeren Abstand gewählt
+        wird. Die Primitive des erreichten Blattes liefern eine obere Schranke für den kleinsten Abstand.
+
+        :param points: Koordinaten der Punkte, Form (n, 3)
+        :return: Indizes der Punkte und der Primitive im jeweils erreichten Blatt
+        """
+        node = np.zeros( len( points ), dtype = np.int64 )
+        inner = self.count[ node ] == 0
+
+        while np.any( inner ):
+            index = np.flatnonzero( inner )
+            left, right = self.left[ node[ index ] ], self.right[ node[ index ] ]
+            closer = self.box_distances( points[ index ], left ) <= self.box_distances( points[ index ], right )
+            node[ index ] = np.where( closer, left, right )
+            inner = self.count[ node ] == 0
+
+        sizes = self.count[ node ]
+        offsets = np.arange( sizes.sum() ) - np.repeat( np.cumsum( sizes ) - sizes, sizes )
+        items = self.order[ np.repeat( self.start[ node ], sizes ) + offsets ]
+        return np.repeat( np.arange( len( points ) ), sizes ), items
+
+    def segments( self, starts: np.ndarray, ends: np.ndarray ) -> tuple[ np.ndarray, np.ndarray ]:
+        """
+        Ermittelt alle Paare aus Strecken und Primitiven, deren Begrenzungsquader von der Strecke geschnitten werden
+
+        :param starts: Startpunkte der Strecken, Form (n, 3)
+        :param ends: Endpunkte der Strecken, Form (n, 3)
+        :return: Indizes der Strecken und der Primitive
+        """
+        direction = ends - starts
+        with np.errstate( divide = 'ignore' ):
+            inverse = 1. / direction
+
+        def _overlaps( query: np.ndarray, node: np.ndarray ) -> np.ndarray:
+            """
+            Schnitttest zwischen Strecken und Knotenquadern nach dem Slab-Verfahren
+            """
+            origin, inv = starts[ query ], inverse[ query ]
+            with np.errstate( invalid = 'ignore' ):
+                near = ( self.lower[ node ] - origin ) * inv
+                far = ( self.upper[ node ] - origin ) * inv
+            parallel = ~np.isfinite( inv )
+            inside = ( origin >= self.lower[ node ] ) & ( origin <= self.upper[ node ] )
+            near = np.where( parallel, np.where( inside, -np.inf, np.inf ), near )
+            far = np.where( parallel, np.where( inside, np.inf, -np.inf ), far )
+            entry = np.minimum( near, far ).max( axis = 1 )
+            exit = np.maximum( near, far ).min( axis = 1 )
+            return ( entry <= exit ) & ( exit >= 0. ) & ( entry <= 1. )
+
+        return self.query( _overlaps, len( starts ) )
+
+    def boxes( self, lower: np.ndarray, upper: np.ndarray ) -> tuple[ np.ndarray, np.ndarray ]:
+        """
+        Ermittelt alle Paare aus Quadern und Primitiven, deren Begrenzungsquader sich überschneiden
+
+        :param lower: kleinste Koordinaten der Quader, Form (n, 3)
+        :param upper: größte Koordinaten der Quader, Form (n, 3)
+        :return: Indizes der Quader und der Primitive
+        """
+        def _overlaps( query: np.ndarray, node: np.ndarray ) -> np.ndarray:
+            """
+            Überschneidungstest zwischen Quadern und Knotenquadern
+            """
+            return np.all( ( lower[ query ] <= self.upper[ node ] ) & ( upper[ query ] >= self.lower[ node ] ), axis = 1 )
+
+        return self.query( _overlaps, len( lower ) )
+
+
+class TriangleMesh:
+    """
+    Geschlossenes Dreiecksnetz mit Hüllkörperhierarchie für schnelle Schnitt- und Innen-/Außentests
+    """
+    def __init__( self, vertices: np.ndarray, triangles: np.ndarray ) -> None:
+        """
+        Initialisierung des Netzes aus Feldern
+
+        :param vertices: Koordinaten der Eckpunkte, Form (n, 3)
+        :param triangles: Indizes der Eckpunkte der Dreiecke, Form (m, 3)
+        """
+        self.vertices: np.ndarray = np.asarray( vertices, dtype = float ).reshape( -1, 3 )
+        self.triangles: np.ndarray = np.asarray( triangles, dtype = np.int64 ).reshape( -1, 3 )
+
+        corners = self.vertices[ self.triangles ]
+        self.hierarchy = BoundingVolumeHierarchy( corners.min( axis = 1 ), corners.max( axis = 1 ) )
+
+    @classmethod
+    def from_triangles( cls, corners: np.ndarray, tolerance: float = 1e-9 ) -> "TriangleMesh":
+        """
+        Erstellt das Netz aus einzelnen Dreiecken. Übereinstimmende Eckpunkte werden zusammengefasst und entartete
+        Dreiecke entfernt.
+
+        :param corners: Eckpunkte der Dreiecke, Form (m, 3, 3)
+        :param tolerance: Abstand, unterhalb dessen Eckpunkte als identisch gelten
+        :return: Dreiecksnetz
+        """
+        corners = np.asarray( corners, dtype = float ).reshape( -1, 3 )
+        keys = np.round( corners / tolerance ).astype( np.int64 )
+        _, first, inverse = np.unique( keys, axis = 0, return_index = True, return_inverse = True )
+        triangles = inverse.reshape( -1, 3 )
+
+        valid = ( triangles[ :, 0 ] != triangles[ :, 1 ] ) & ( triangles[ :, 1 ] != triangles[ :, 2 ] ) & \
+            ( triangles[ :, 0 ] != triangles[ :, 2 ] )
+        return cls( corners[ first ], triangles[ valid ] )
+
+    @classmethod
+    def from_stl( cls, filepath: str, tolerance: float = 1e-9 ) -> "TriangleMesh":
+        """
+        Liest ein Netz aus einer binären oder ASCII-kodierten STL-Datei
+
+        :param filepath: Pfad zur STL-Datei
+        :param tolerance: Abstand, unterhalb dessen Eckpunkte als identisch gelten
+        :return: Dreiecksnetz
+        :raise ValueError: wenn die Datei keine Dreiecke enthält
+        """
+        with open( filepath, mode = 'rb' ) as file:
+            data = file.read()
+
+        count = int.from_bytes( data[ 80: 84 ], 'little' ) if len( data ) >= 84 else -1
+        if len( data ) == 84 + 50 * count:
+            record = np.dtype( [ ( "normal", "<f4", ( 3, ) ), ( "corners", "<f4", ( 3, 3 ) ), ( "attribute", "<u2" ) ] )
+            corners = np.frombuffer( data, dtype = record, count = count, offset = 84 )[ "corners" ]
+        else:
+            values = re.findall( rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)", data )
+            corners = np.array( values, dtype = float )
+
+        if len( corners ) == 0:
+            raise ValueError( f"Die STL-Datei { filepath } enthält keine Dreiecke." )
+        return cls.from_triangles( corners, tolerance )
+
+    @classmethod
+    def from_workplane( cls, model: Any, tolerance: float = 1e-2, angular_tolerance: float = 0.1 ) -> "TriangleMesh":
+        """
+        Erstellt das Netz durch Triangulierung einer B-Rep-Geometrie
+
+        :param model: Geometrie als CADQuery Workplane
+        :param tolerance: lineare Toleranz der Triangulierung
+        :param angular_tolerance: Winkeltoleranz der Triangulierung
+        :return: Dreiecksnetz
+        """
+        vertices, triangles = model.val().copy().tessellate( tolerance, angular_tolerance )
+        return cls( np.array( [ v.toTuple() for v in vertices ] ), np.array( triangles ) )
+
+    def bounds( self ) -> tuple[ np.ndarray, np.ndarray ]:
+        """
+        :return: kleinste und größte Koordinaten des Netzes
+        """
+        return self.vertices.min( axis = 0 ), self.vertices.max( axis = 0 )
+
+    def intersect_segments( self, starts: np.ndarray, ends: np.ndarray, triangles: bool = False,
+                            margin: float = 0. ) -> tuple[ np.ndarray, ... ]:
+        """
+        Berechnet alle Schnittpunkte der Strecken mit den Dreiecken des Netzes nach Möller und Trumbore
+
+        :param starts: Startpunkte der Strecken, Form (n, 3)
+        :param ends: Endpunkte der Strecken, Form (n, 3)
+        :param triangles: steuert, ob zusätzlich der Index des geschnittenen Dreiecks ausgegeben wird
+        :param margin: Erweiterung der Dreiecke in baryzentrischen Koordinaten, damit Treffer auf Kanten trotz
+                       Rundungsfehlern von allen angrenzenden Dreiecken erfasst werden
+        :return: Index der Strecke und Streckenparameter in [0, 1] je Schnittpunkt, auf Wunsch mit Index des Dreiecks
+        """
+        starts = np.asarray( starts, dtype = float ).reshape( -1, 3 )
+        ends = np.asarray( ends, dtype = float ).reshape( -1, 3 )
+        segment, triangle = self.hierarchy.segments( starts, ends )
+
+        corners = self.vertices[ self.triangles[ triangle ] ]
+        hit, t = _segment_triangle_hits( starts[ segment ], ends[ segment ], corners[ :, 0 ], corners[ :, 1 ],
+                                         corners[ :, 2 ], margin )
+        if triangles:
+            return segment[ hit ], t[ hit ], triangle[ hit ]
+        return segment[ hit ], t[ hit ]
+
+    def crossings( self, starts: np.ndarray, ends: np.ndarray ) -> tuple[ np.ndarray, np.ndarray, np.ndarray ]:
+        """
+        Durchstoßpunkte der Strecken durch das Netz für Paritätstests. Trifft eine Strecke eine gemeinsame Kante oder
+        Ecke mehrerer Dreiecke, liefert intersect_segments einen Schnittpunkt je Dreieck oder durch Rundungsfehler
+        keinen. Die Dreiecke werden daher geringfügig erweitert und Schnittpunkte an gleicher Stelle zusammengefasst:
+        Zeigen alle Dreiecke gleich zur Strecke, durchstößt diese das Netz und der Punkt zählt einmal, andernfalls
+        berührt sie das Netz nur und der Punkt entfällt.
+
+        :param starts: Startpunkte der Strecken, Form (n, 3)
+        :param ends: Endpunkte der Strecken, Form (n, 3)
+        :return: Index der Strecke, Streckenparameter in [0, 1] und Index eines geschnittenen Dreiecks je Durchstoßpunkt
+        """
+        starts = np.asarray( starts, dtype = float ).reshape( -1, 3 )
+        ends = np.asarray( ends, dtype = float ).reshape( -1, 3 )
+        segment, parameter, triangle = self.intersect_segments( starts, ends, triangles = True, margin = 1e-9 )
+        if len( segment ) == 0:
+            return segment, parameter, triangle
+
+        order = np.lexsort( ( parameter, segment ) )
+        segment, parameter, triangle = segment[ order ], parameter[ order ], triangle[ order ]
+        lengths = np.linalg.norm( ends[ segment ] - starts[ segment ], axis = 1 )
+        lower, upper = self.bounds()
+        tolerance = 1e-9 * max( float( np.linalg.norm( upper - lower ) ), 1. )
+        fresh = np.concatenate( ( [ True ], ( segment[ 1: ] != segment[ :-1 ] ) |
+                                  ( ( parameter[ 1: ] - parameter[ :-1 ] ) * lengths[ 1: ] > tolerance ) ) )
+        groups = np.cumsum( fresh ) - 1
+
+        corners = self.vertices[ self.triangles[ triangle ] ]
+        normals = np.cross( corners[ :, 1 ] - corners[ :, 0 ], corners[ :, 2 ] - corners[ :, 0 ] )
+        facing = np.sign( _dot( normals, ends[ segment ] - starts[ segment ] ) )
+        count = groups[ -1 ] + 1
+        positive = np.bincount( groups, weights = facing > 0., minlength = count )
+        negative = np.bincount( groups, weights = facing < 0., minlength = count )
+        through = ( positive == 0. ) | ( negative == 0. )
+
+        first = np.flatnonzero( fresh )
+        keep = first[ through ]
+        return segment[ keep ], parameter[ keep ], triangle[ keep ]
+
+    def contains( self, points: np.ndarray ) -> np.ndarray:
+        """
+        Prüft über die Parität der Durchstoßpunkte eines Strahls mit dem Netz, ob Punkte innerhalb liegen. Treffer auf
+        Kanten und Ecken zählen nur einmal, siehe crossings.
+
+        :param points: Koordinaten der Punkte, Form (n, 3)
+        :return: True für alle Punkte innerhalb des Netzes
+        """
+        points = np.asarray( points, dtype = float ).reshape( -1, 3 )
+        lower, upper = self.bounds()
+        reach = 2. * np.linalg.norm( upper - lower ) + 1.
+
+        direction = np.array( [ 0.8017837, 0.5345225, 0.2672612 ] )
+        segment, _, _ = self.crossings( points, points + reach * direction )
+        crossings = np.bincount( segment, minlength = len( points ) )
+
+        return crossings % 2 == 1
+
+    def distance( self, points: np.ndarray ) -> np.ndarray:
+        """
+        Berechnet den kleinsten Abstand der Punkte zum Netz. Eine erste Schranke ergibt sich aus dem Blatt der
+        Hierarchie, welches beim Abstieg zum jeweils näheren Kindknoten erreicht wird. Anschließend werden nur die
+        Dreiecke geprüft, deren Knotenquader näher als diese Schranke liegen.
+
+        :param points: Koordinaten der Punkte, Form (n, 3)
+        :return: Abstände, Form (n,)
+        """
+        points = np.asarray( points, dtype = float ).reshape( -1, 3 )
+        distances = np.full( len( points ), np.inf )
+
+        def _update( query: np.ndarray, triangle: np.ndarray ) -> None:
+            """
+            Übernimmt die Abstände zu den gegebenen Dreiecken, sofern diese kleiner sind
+            """
+            corners = self.vertices[ self.triangles[ triangle ] ]
+            np.minimum.at( distances, query, _point_triangle_distances(
+                points[ query ], corners[ :, 0 ], corners[ :, 1 ], corners[ :, 2 ] ) )
+
+        if len( self.triangles ) == 0:
+            return distances
+
+        _update( *self.hierarchy.descend( points ) )
+        bound = distances.copy()
+        _update( *self.hierarchy.query(
+            lambda query, node: self.hierarchy.box_distances( points[ query ], node ) <= bound[ query ],
+            len( points ) ) )
+        return distances
+
+    def segment_distance( self, starts: np.ndarray, ends: np.ndarray, reach: np.ndarray | float ) -> np.ndarray:
+        """
+        Berechnet den kleinsten Abstand der Strecken zum Netz. Geprüft werden nur die Dreiecke, deren Quader den um
+        reach erweiterten Begrenzungsquader der Strecke schneiden, sodass alle Abstände bis reach genau sind.
+
+        :param starts: Startpunkte der Strecken, Form (n, 3)
+        :param ends: Endpunkte der Strecken, Form (n, 3)
+        :param reach: größter gesuchter Abstand je Strecke oder für alle Strecken
+        :return: Abstände, Form (n,), unendlich für Strecken ohne Dreieck in Reichweite
+        """
+        starts = np.asarray( starts, dtype = float ).reshape( -1, 3 )
+        ends = np.asarray( ends, dtype = float ).reshape( -1, 3 )
+        reach = np.broadcast_to( np.asarray( reach, dtype = float ), ( len( starts ), ) )[ :, None ]
+        distances = np.full( len( starts ), np.inf )
+
+        segment, triangle = self.hierarchy.boxes( np.minimum( starts, ends ) - reach,
+                                                  np.maximum( starts, ends ) + reach )
+        corners = self.vertices[ self.triangles[ triangle ] ]
+        np.minimum.at( distances, segment, segment_triangle_distances(
+            starts[ segment ], ends[ segment ], corners[ :, 0 ], corners[ :, 1 ], corners[ :, 2 ] ) )
+        return distances
+
+    def normals( self ) -> np.ndarray:
+        """
+        Nach außen gerichtete Einheitsnormalen der Dreiecke. Die Richtung folgt aus dem Vorzeichen des von den
+        Dreiecken eingeschlossenen Volumens und setzt einheitlich orientierte Dreiecke voraus.
+
+        :return: Normalen, Form (m, 3)
+        """
+        corners = self.vertices[ self.triangles ]
+        normals = np.cross( corners[ :, 1 ] - corners[ :, 0 ], corners[ :, 2 ] - corners[ :, 0 ] )
+        lengths = np.linalg.norm( normals, axis = 1 )
+        normals /= np.where( lengths > 0., lengths, 1. )[ :, None ]
+        return normals if np.sum( _dot( corners[ :, 0 ], normals * lengths[ :, None ] ) ) >= 0. else - normals
+
+    def signed_distance( self, points: np.ndarray ) -> np.ndarray:
+        """
+        Berechnet den vorzeichenbehafteten Abstand der Punkte zum Netz
+
+        :param points: Koordinaten der Punkte, Form (n, 3)
+        :return: Abstände, negativ für Punkte innerhalb des Netzes
+        """
+        return np.where( self.contains( points ), -1., 1. ) * self.distance( points )
@@ -1,9 +1,12 @@
 
-import cadquery as cq
-from typing import (Tuple, List, Any, AnyStr, Union)
+from typing import (Tuple, List, Any, AnyStr, Union, TYPE_CHECKING)
+import numpy as np
 
+if TYPE_CHECKING:
+    import cadquery as cq
 
-def boundingBox(model: cq.Workplane) -> List[ List[ float ]]:
+
+def boundingBox(model: "cq.Workplane") -> List[ List[ float ]]:
 
     bbInfo = model.val().BoundingBox()
 
@@ -54,9 +57,47 @@ class Size:
         return self.dx == other.dx and self.dy == other.dy and self.dz == other.dz
 
 
+def vertices( size: "Size" ) -> dict[ int, np.ndarray ]:
+    """
+    Berechnet die Eckknoten einer im Ursprung zentrierten Elementarzelle ohne Abhängigkeit von CADQuery
+
+    :param size: Abmaße der Elementarzelle
+    :return: Koordinaten der Eckknoten
+    """
+    dx, dy, dz = size.dx / 2., size.dy / 2., size.dz / 2.
+    return {
+        1: np.array( ( - dx, - dy, - dz ) ),
+        2: np.array( ( - dx, dy, - dz ) ),
+        3: np.array( ( dx, dy, - dz ) ),
+        4: np.array( ( dx, - dy, - dz ) ),
+        5: np.array( ( - dx, - dy, dz ) ),
+        6: np.array( ( dx, - dy, dz ) ),
+        7: np.array( ( dx, dy, dz ) ),
+        8: np.array( ( - dx, dy, dz ) )
+    }
+
+
+def rotation( axis: Tuple[ float, float, float ], angle: float ) -> np.ndarray:
+    """
+    Berechnet die Drehmatrix einer Drehung um eine Achse durch den Ursprung nach Rodrigues
+
+    :param axis: Drehachse
+    :param angle: Drehwinkel in Grad
+    :return: Drehmatrix, Form (3, 3)
+    """
+    axis = np.asarray( axis, dtype = float )
+    norm = np.linalg.norm( axis )
+    if axis.shape != ( 3, ) or norm == 0.:
+        raise ValueError( "Die Drehachse muss ein Vektor mit drei Komponenten und einer Länge ungleich 0 sein." )
+    x, y, z = axis / norm
+    cross = np.array( [ [ 0., -z, y ], [ z, 0., -x ], [ -y, x, 0. ] ] )
+    radians = np.radians( angle )
+    return np.eye( 3 ) + np.sin( radians ) * cross + ( 1. - np.cos( radians ) ) * cross @ cross
+
+
 class BoundingBox:
-    def __init__( self, model: cq.Workplane ) -> None:
-        self.box: cq.BoundBox = model.val().BoundingBox()
+    def __init__( self, model: "cq.Workplane" ) -> None:
+        self.box: "cq.BoundBox | None" = model.val().BoundingBox()
         self.xmin = self.box.xmin
         self.ymin = self.box.ymin
         self.zmin = self.box.zmin
@@ -69,6 +110,22 @@ class BoundingBox:
         self.ylen = self.box.ylen
         self.zlen = self.box.zlen
 
+    @classmethod
+    def from_bounds( cls, lower: Tuple[ float, ... ], upper: Tuple[ float, ... ] ) -> "BoundingBox":
+        """
+        Erstellt einen Begrenzungsquader aus seinen kleinsten und größten Koordinaten, etwa für Dreiecksnetze
+
+        :param lower: kleinste Koordinaten
+        :param upper: größte Koordinaten
+        :return: Begrenzungsquader
+        """
+        box = cls.__new__( cls )
+        box.box = None
+        box.xmin, box.ymin, box.zmin = ( float( value ) for value in lower )
+        box.xmax, box.ymax, box.zmax = ( float( value ) for value in upper )
+        box.xlen, box.ylen, box.zlen = box.xmax - box.xmin, box.ymax - box.ymin, box.zmax - box.zmin
+        return box
+
     def extend(self, direction: Union[ str, int ], value: float ) -> None:
         if direction == 'x' or direction == 0:
             self.xmin, self.xmax, self.xlen = ( self.xmin - value / 2., self.xmax + value / 2., self.xlen + value )
@@ -0,0 +1,306 @@
+from collections import OrderedDict
+from time import perf_counter
+from typing import Callable
+import hashlib
+import json
+import os
+import numpy as np
+from cadquery import Workplane, Shape
+from . import Generator
+from . import Importer
+from . import Checkpoint
+LatticeGenerator = Generator.LatticeGenerator
+
+OUTPUTS: dict[ str, str ] = {
+    "initial": "export_initial_model",
+    "shell": "export_shell",
+    "cell": "export_unitary_cell",
+    "lattice": "export_lattice",
+    "intersected": "export_intersected_lattice",
+    "unified": "export_unified",
+    "beams": "export_beam_lattice",
+    "beam_model": "export_beam_model"
+}
+
+
+class ModelCache:
+    """
+    Zwischenspeicher für importierte Modelle, Schalen und Elementarzellen, welcher über mehrere Aufträge hinweg
+    erhalten bleibt. Bei Überschreitung der maximalen Anzahl an Einträgen wird der am längsten unbenutzte entfernt.
+    Ist ein Verzeichnis angegeben, werden die Einträge zusätzlich als BREP-Dateien abgelegt und stehen damit auch
+    anderen Prozessen und späteren Aufrufen zur Verfügung.
+    """
+    def __init__( self, capacity: int = 16, directory: str | None = None ) -> None:
+        """
+        Initialisierung eines leeren Zwischenspeichers
+
+        :param capacity: maximale Anzahl an Einträgen im Arbeitsspeicher
+        :param directory: Verzeichnis für die Ablage der Einträge als BREP-Dateien
+        """
+        self.capacity: int = capacity
+        self.directory: str | None = directory
+        self.entries: OrderedDict[ tuple, Workplane ] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+        if directory is not None:
+            os.makedirs( directory, exist_ok = True )
+
+    def _path( self, key: tuple ) -> str:
+        """
+        :param key: Schlüssel des Eintrags
+        :return: Pfad der BREP-Datei des Eintrags
+        """
+        return os.path.join( self.directory, hashlib.sha256( repr( key ).encode() ).hexdigest() + ".brep" )
+
+    def get( self, key: tuple, create: Callable[ [], Workplane ] ) -> Workplane:
+        """
+        Gibt den Eintrag zum Schlüssel aus und erzeugt diesen bei Bedarf
+
+        :param key: Schlüssel des Eintrags
+        :param create: Funktion zur Erzeugung des Eintrags
+        :return: Eintrag
+        """
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end( key )
+            return self.entries[ key ]
+
+        if self.directory is not None and os.path.exists( self._path( key ) ):
+            self.hits += 1
+            value = Workplane( obj = Shape.importBrep( self._path( key ) ) )
+        else:
+            self.misses += 1
+            value = create()
+            if self.directory is not None:
+                temporary = f"{ self._path( key ) }.{ os.getpid() }.tmp"
+                value.val().exportBrep( temporary )
+                os.replace( temporary, self._path( key ) )
+
+        self.entries[ key ] = value
+        if len( self.entries ) > self.capacity:
+            self.entries.popitem( last = False )
+        return value
+
+    def clear( self ) -> None:
+        """
+        Leert den Zwischenspeicher im Arbeitsspeicher
+        """
+        self.entries.clear()
+
+
+def _file_key( filepath: str ) -> tuple:
+    """
+    Schlüssel einer Datei aus Pfad, Größe und Änderungszeitpunkt
+
+    :param filepath: Pfad zur Datei
+    :return: Schlüssel
+    """
+    status = os.stat( filepath )
+    return os.path.abspath( filepath ), status.st_size, status.st_mtime_ns
+
+
+def _resolve( filepath: str, base: str | None ) -> str:
+    """
+    Löst relative Pfade gegenüber dem Basisverzeichnis des Auftrags auf
+
+    :param filepath: Pfad aus der Auftragsbeschreibung
+    :param base: Basisverzeichnis
+    :return: Pfad
+    """
+    if base is None or os.path.isabs( filepath ):
+        return filepath
+    return os.path.join( base, filepath )
+
+
+def digest( spec: dict, base: str | None = None ) -> str:
+    """
+    Prüfsumme aller Einträge einer Auftragsbeschreibung, welche das Ergebnis bestimmen. Eingangsdateien gehen mit
+    Pfad, Größe und Änderungszeitpunkt ein, Ausgaben, Zwischenspeicher und Auslagerung nicht.
+
+    :param spec: Auftragsbeschreibung
+    :param base: Basisverzeichnis für relative Pfade
+    :return: Prüfsumme
+    """
+    def _key( filepath: str ) -> list | str:
+        """
+        Schlüssel einer Eingangsdatei, sofern diese vorhanden ist
+        """
+        filepath = _resolve( filepath, base )
+        return list( _file_key( filepath ) ) if os.path.exists( filepath ) else os.path.abspath( filepath )
+
+    normalized = { key: spec[ key ] for key in ( "shell", "cell", "entities", "lattice", "intersect", "fragments",
+                                                 "unify" ) if key in spec }
+    normalized[ "input" ] = _key( spec[ "input" ] )
+    normalized[ "import" ] = { key: value for key, value in spec.get( "import", {} ).items() if key != "cache" }
+    if "template" in spec:
+        normalized[ "template" ] = _key( spec[ "template" ] )
+    if "file" in spec.get( "shell", {} ):
+        normalized[ "shell" ] = dict( spec[ "shell" ], file = _key( spec[ "shell" ][ "file" ] ) )
+
+    return hashlib.sha256( json.dumps( normalized, sort_keys = True, default = str ).encode() ).hexdigest()
+
+
+def _serializable( report: dict ) -> dict:
+    """
+    Wandelt die Felder eines Berichts in Listen um, sodass dieser als JSON ausgegeben werden kann
+
+    :param report: Bericht
+    :return: Bericht mit Listen statt Feldern
+    """
+    return { key: value.tolist() if isinstance( value, np.ndarray ) else value for key, value in report.items() }
+
+
+def run( spec: dict, cache: ModelCache | None = None, base: str | None = None ) -> dict:
+    """
+    Führt einen Auftrag zur Erzeugung einer Schalengeometrie mit Gitterkern aus. Die Auftragsbeschreibung enthält
+    folgende Einträge, von denen nur input, cell und entities oder template zwingend sind:\n
+    input: Pfad zur STEP- oder STL-Datei der Eingangsgeometrie\n
+    import: { "cache": Verzeichnis, "root": Index, "solid": Index, "heal": bool } für den Import der Eingangsgeometrie\n
+    shell: { "inner": Dicke, "outer": Dicke } oder { "file": Pfad zur STEP-Datei der Schale, "root": Index,
+    "solid": Index }\n
+    cell: { "size": [ dx, dy, dz ], "strict": [ bool, bool, bool ] }\n
+    entities: Liste der Entitäten oder deren Darstellung als String\n
+    template: Pfad zu einer Vorlagendatei mit Entitäten, alternativ zu entities\n
+    lattice: { "sparse": bool }\n
+    intersect: { "clip": bool, "tolerance": float, "exact": bool, "chunk": int, "fuzzy": [ float ] }\n
+    fragments: { "anchored": bool, "band": float, "exact": bool, "remove": bool, "tolerance": float } entfernt
+    lose Teile des zurechtgeschnittenen Gitters\n
+    unify: { "boundary": bool, "band": float, "chunk": int, "fuzzy": [ float ] }\n
+    outputs: { Stufe: Pfad } mit den Stufen initial, shell, cell, lattice, intersected und unified sowie beams
+    für das zurechtgeschnittene Gitter als 3MF-Balkengitter und beam_model als Balkenmodell (.vtk, .h5)\n
+    export: { "preset": "draft" | "standard" | "fine" } Toleranzvorgabe der Triangulierung für Netzformate\n
+    checkpoint: Pfad zu einem Archiv, in welchem jede abgeschlossene Stufe gesichert wird. Existiert das Archiv
+    bereits und wurde es für dieselbe Auftragsbeschreibung erstellt, siehe digest, wird der Auftrag nach der letzten
+    gesicherten Stufe fortgesetzt, andernfalls von vorn begonnen und das Archiv ersetzt.\n
+    spill: { "budget": Arbeitsspeicher in MiB, "directory": Verzeichnis } zur Auslagerung nicht mehr benötigter
+    Zwischenergebnisse. Ohne Budget wird stets ausgelagert.
+
+    :param spec: Auftragsbeschreibung
+    :param cache: Zwischenspeicher für Modelle, Schalen und Elementarzellen
+    :param base: Basisverzeichnis für relative Pfade
+    :return: exportierte Dateien, Rechenzeiten der Stufen, aus dem Sicherungspunkt übernommene Stufen und Berichte
+             der booleschen Operationen je Stufe
+    """
+    cache = ModelCache( 0 ) if cache is None else cache
+    timings: dict[ str, float ] = {}
+    repairs: dict[ str, dict ] = {}
+
+    checkpoint = _resolve( spec[ "checkpoint" ], base ) if "checkpoint" in spec else None
+    spill: dict | None = spec.get( "spill" )
+    budget = int( spill.get( "budget", 0 ) * 2 ** 20 ) if spill is not None else None
+    spill_directory = _resolve( spill[ "directory" ], base ) if spill is not None and "directory" in spill else None
+
+    generator = LatticeGenerator( budget = budget, spill = spill_directory )
+    generator.digest = digest( spec, base )
+    if checkpoint is not None and Checkpoint.digest( checkpoint ) == generator.digest:
+        Checkpoint.load( checkpoint, generator, mmap = False )
+    generator.checkpoint = checkpoint
+    resumed = generator.stages()
+
+    def _stage( name: str, action: Callable[ [], None ] ) -> None:
+        """
+        Führt eine Stufe aus und misst deren Rechenzeit. Bereits gesicherte Stufen werden übersprungen.
+        """
+        if name in resumed:
+            return
+        start = perf_counter()
+        action()
+        timings[ name ] = perf_counter() - start
+
+    options: dict = spec.get( "import", {} )
+    directory = _resolve( options[ "cache" ], base ) if "cache" in options else None
+    root, solid, heal = options.get( "root" ), options.get( "solid" ), bool( options.get( "heal", False ) )
+
+    filepath = _resolve( spec[ "input" ], base )
+    model_key = ( "model", ) + _file_key( filepath ) + ( root, solid, heal )
+    if filepath.lower().endswith( ".stl" ):
+        _stage( "model", lambda: generator.import_initial_model( filepath ) )
+    else:
+        _stage( "model", lambda: generator.set_initial_model(
+            cache.get( model_key, lambda: Importer.import_step( filepath, directory, root, solid, heal ) ) ) )
+
+    shell: dict = spec.get( "shell", {} )
+    if "file" in shell:
+        shell_path = _resolve( shell[ "file" ], base )
+        shell_root, shell_solid = shell.get( "root" ), shell.get( "solid" )
+        _stage( "shell", lambda: generator.set_shell(
+            cache.get( ( "shell", ) + _file_key( shell_path ) + ( shell_root, shell_solid ),
+                       lambda: Importer.import_step( shell_path, directory, shell_root, shell_solid ) ) ) )
+    elif shell:
+        inner, outer = float( shell.get( "inner", 0. ) ), float( shell.get( "outer", 0. ) )
+
+        def _shell() -> Workplane:
+            """
+            Erstellt die Schale aus der Eingangsgeometrie
+            """
+            generator.geometry.shell( inner, outer )
+            return generator.get_shell()
+
+        _stage( "shell", lambda: generator.set_shell( cache.get( model_key + ( "shell", inner, outer ), _shell ) ) )
+
+    entities: str | list = spec[ "entities" ] if "entities" in spec else \
+        [ [ "template", { "filepath": _resolve( spec[ "template" ], base ) } ] ]
+
+    cell: dict = spec[ "cell" ]
+
+    def _cell() -> Workplane:
+        """
+        Erstellt die Elementarzelle aus der Konfiguration
+        """
+        generator.cell.create( generator.config )
+        return generator.cell.geometry
+
+    def _set_cell() -> None:
+        """
+        Übernimmt die Elementarzelle aus dem Zwischenspeicher oder erstellt diese
+        """
+        generator.init_unitary_cell( tuple( cell[ "size" ] ), tuple( cell.get( "strict", ( False, False, False ) ) ) )
+        generator.add_entities( entities )
+        cell_key = ( "cell", generator.cell.size.toTuple(), str( generator.config ) )
+
+        generator.cell.geometry = cache.get( cell_key, _cell )
+        generator.cell.config = generator.config
+        generator.cell.has_cell = True
+        generator.finish_stage( "cell" )
+
+    _stage( "cell", _set_cell )
+
+    _stage( "lattice", lambda: generator.create_lattice( **spec.get( "lattice", {} ) ) )
+
+    def _intersect() -> None:
+        """
+        Schneidet das Gitter zurecht und entfernt auf Wunsch lose Teile. Die Stufe wird erst danach einmalig
+        abgeschlossen und gesichert.
+        """
+        report = generator.intersect_lattice( **spec.get( "intersect", {} ), finish = False )
+        if report is not None:
+            repairs[ "intersected" ] = _serializable( report )
+        if "fragments" in spec:
+            generator.remove_fragments( **spec[ "fragments" ], finish = False )
+        generator.finish_stage( "intersected" )
+
+    _stage( "intersected", _intersect )
+
+    def _unify() -> None:
+        """
+        Verschmilzt das zurechtgeschnittene Gitter mit der Schale
+        """
+        repairs[ "unified" ] = _serializable( generator.unify( **spec.get( "unify", {} ) ) )
+
+    if shell:
+        _stage( "unified", _unify )
+
+    outputs: dict[ str, str ] = {}
+    for stage, target in spec.get( "outputs", {} ).items():
+        if stage not in OUTPUTS:
+            raise ValueError( f"Unbekannte Stufe für die Ausgabe: { stage }" )
+        target = _resolve( target, base )
+        if stage in ( "beams", "beam_model" ):
+            getattr( generator, OUTPUTS[ stage ] )( target )
+        else:
+            getattr( generator, OUTPUTS[ stage ] )( target, spec.get( "export", {} ).get( "preset" ) )
+        outputs[ stage ] = os.path.abspath( target )
+
+    return { "outputs": outputs, "timings": timings, "resumed": resumed, "repairs": repairs,
+             "cache": { "hits": cache.hits, "misses": cache.misses } }
@@ -0,0 +1,173 @@
+from typing import Any
+import numpy as np
+from . import Graph
+from . import Mesh
+TriangleMesh = Mesh.TriangleMesh
+
+
+def clip_segments( starts: np.ndarray, ends: np.ndarray, lower: np.ndarray,
+                   upper: np.ndarray ) -> tuple[ np.ndarray, np.ndarray, np.ndarray ]:
+    """
+    Schneidet Strecken vektorisiert an einem achsparallelen Quader ab (Liang-Barsky)
+
+    :param starts: Startpunkte der Strecken, Form (n, 3)
+    :param ends: Endpunkte der Strecken, Form (n, 3)
+    :param lower: kleinste Koordinaten des Quaders
+    :param upper: größte Koordinaten des Quaders
+    :return: Indizes der verbleibenden Strecken sowie deren abgeschnittene Start- und Endpunkte
+    """
+    direction = ends - starts
+    first, last = np.zeros( len( starts ) ), np.ones( len( starts ) )
+    valid = np.ones( len( starts ), dtype = bool )
+
+    with np.errstate( divide = 'ignore', invalid = 'ignore' ):
+        for p, q in ( ( - direction, starts - lower ), ( direction, upper - starts ) ):
+            parallel = p == 0.
+            valid &= ~ ( parallel & ( q < 0. ) ).any( axis = 1 )
+            ratio = q / np.where( parallel, 1., p )
+            first = np.maximum( first, np.where( ~ parallel & ( p < 0. ), ratio, -np.inf ).max( axis = 1 ) )
+            last = np.minimum( last, np.where( ~ parallel & ( p > 0. ), ratio, np.inf ).min( axis = 1 ) )
+
+    keep = np.flatnonzero( valid & ( last - first > 1e-12 ) )
+    return keep, starts[ keep ] + first[ keep, None ] * direction[ keep ], \
+        starts[ keep ] + last[ keep, None ] * direction[ keep ]
+
+
+class LatticePreview:
+    """
+    Vorschau eines Gitters aus Strecken, ohne Geometrie der Elementarzelle und ohne boolesche Operationen. Die
+    Streben werden je Entität über alle Zellen vervielfältigt und am Begrenzungsquader abgeschnitten. Bei einer
+    Aktualisierung werden nur Entitäten neu berechnet, deren Koordinaten oder Durchmesser sich geändert haben.
+    """
+    def __init__( self, centers: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+                  mesh: TriangleMesh | None = None, size: np.ndarray | None = None,
+                  rotation: np.ndarray | None = None ) -> None:
+        """
+        Initialisierung der Vorschau
+
+        :param centers: Mittelpunkte der Zellen, Form (c, 3)
+        :param lower: kleinste Koordinaten des Begrenzungsquaders
+        :param upper: größte Koordinaten des Begrenzungsquaders
+        :param mesh: grobes Dreiecksnetz der Eingangsgeometrie. Zellen außerhalb des Netzes, deren Quader keinen
+                     Hüllquader eines Dreiecks schneidet, werden verworfen.
+        :param size: Abmaße der Elementarzelle, benötigt für das Verwerfen von Zellen über das Netz
+        :param rotation: Drehmatrix des Gitters, mit welcher die Streben der Elementarzelle gedreht werden
+        """
+        self.rotation: np.ndarray = np.eye( 3 ) if rotation is None else np.asarray( rotation, dtype = float )
+        centers = np.asarray( centers, dtype = float ).reshape( -1, 3 )
+        if mesh is not None and len( centers ) > 0:
+            # Zellen, deren Quader den Hüllquader eines Dreiecks schneidet oder deren Mittelpunkt innen liegt
+            half = np.abs( self.rotation ) @ np.asarray( size, dtype = float ) / 2.
+            keep = np.zeros( len( centers ), dtype = bool )
+            keep[ mesh.hierarchy.boxes( centers - half, centers + half )[ 0 ] ] = True
+            keep[ ~ keep ] = mesh.contains( centers[ ~ keep ] )
+            centers = centers[ keep ]
+
+        self.centers: np.ndarray = centers
+        self.lower: np.ndarray = np.asarray( lower, dtype = float )
+        self.upper: np.ndarray = np.asarray( upper, dtype = float )
+        self.blocks: dict[ tuple, tuple[ np.ndarray, np.ndarray, np.ndarray ] ] = {}
+        self.order: list[ tuple ] = []
+        self.updated: int = 0
+
+    def update( self, config: Any ) -> int:
+        """
+        Gleicht die Vorschau mit der Konfiguration der Elementarzelle ab. Entitäten, welche keine Streben sind, werden
+        nicht dargestellt.
+
+        :param config: Konfiguration der Elementarzelle
+        :return: Anzahl der neu berechneten Entitäten
+        """
+        keys: list[ tuple ] = []
+        for entity in config:
+            if entity.dimension() != 1:
+                continue
+            points = tuple( Graph._coordinates( point ) for point in entity.geometry )
+            keys.append( points + ( float( entity.get( "diameter" ) ), ) )
+
+        computed = 0
+        for key in keys:
+            if key in self.blocks:
+                continue
+            start, end, diameter = self.rotation @ key[ 0 ], self.rotation @ key[ 1 ], key[ 2 ]
+            _, starts, ends = clip_segments( self.centers + start, self.centers + end, self.lower, self.upper )
+            self.blocks[ key ] = ( starts, ends, np.full( len( starts ), diameter / 2. ) )
+            computed += 1
+
+        for key in set( self.blocks ) - set( keys ):
+            del self.blocks[ key ]
+        self.order = list( dict.fromkeys( keys ) )
+        self.updated = computed
+        return computed
+
+    def __len__( self ) -> int:
+        """
+        :return: Anzahl der dargestellten Streben
+        """
+        return sum( len( self.blocks[ key ][ 0 ] ) for key in self.order )
+
+    def lines( self ) -> tuple[ np.ndarray, np.ndarray, np.ndarray ]:
+        """
+        Gibt die Streben als Strecken aus, etwa für die Darstellung als Linien
+
+        :return: Start- und Endpunkte, Form (n, 3), sowie Radien, Form (n,)
+        """
+        if not self.order:
+            return np.zeros( ( 0, 3 ) ), np.zeros( ( 0, 3 ) ), np.zeros( 0 )
+        return tuple( np.concatenate( [ self.blocks[ key ][ i ] for key in self.order ] ) for i in range( 3 ) )
+
+    def instances( self ) -> np.ndarray:
+        """
+        Gibt je Strebe eine Transformationsmatrix aus, welche einen Zylinder mit Radius 1 von z = 0 bis z = 1 auf die
+        Strebe abbildet, etwa für instanziertes Rendern von template
+
+        :return: homogene Transformationsmatrizen, Form (n, 4, 4)
+        """
+        starts, ends, radii = self.lines()
+        axes = ends - starts
+        lengths = np.linalg.norm( axes, axis = 1 )
+        unit = axes / np.where( lengths > 0., lengths, 1. )[ :, None ]
+
+        reference = np.where( ( np.abs( unit[ :, 2 ] ) < 0.9 )[ :, None ], ( 0., 0., 1. ), ( 1., 0., 0. ) )
+        first = np.cross( reference, unit )
+        first /= np.linalg.norm( first, axis = 1 )[ :, None ]
+        second = np.cross( unit, first )
+
+        matrices = np.zeros( ( len( starts ), 4, 4 ) )
+        matrices[ :, :3, 0 ] = first * radii[ :, None ]
+        matrices[ :, :3, 1 ] = second * radii[ :, None ]
+        matrices[ :, :3, 2 ] = axes
+        matrices[ :, :3, 3 ] = starts
+        matrices[ :, 3, 3 ] = 1.
+        return matrices
+
+    @staticmethod
+    def template( sides: int = 6 ) -> tuple[ np.ndarray, np.ndarray ]:
+        """
+        Mantel eines Zylinders mit Radius 1 von z = 0 bis z = 1 als Prisma mit wenigen Seiten
+
+        :param sides: Anzahl der Seitenflächen
+        :return: Eckpunkte, Form (2 * sides, 3), und Dreiecke, Form (2 * sides, 3)
+        """
+        angles = 2. * np.pi * np.arange( sides ) / sides
+        ring = np.stack( ( np.cos( angles ), np.sin( angles ), np.zeros( sides ) ), axis = 1 )
+        vertices = np.concatenate( ( ring, ring + ( 0., 0., 1. ) ) )
+
+        i = np.arange( sides )
+        j = ( i + 1 ) % sides
+        triangles = np.concatenate( ( np.stack( ( i, j, j + sides ), axis = 1 ),
+                                      np.stack( ( i, j + sides, i + sides ), axis = 1 ) ) )
+        return vertices, triangles
+
+    def tubes( self, sides: int = 6 ) -> tuple[ np.ndarray, np.ndarray ]:
+        """
+        Gibt die Streben als Dreiecksnetz aus Prismen mit wenigen Seiten aus
+
+        :param sides: Anzahl der Seitenflächen je Strebe
+        :return: Eckpunkte, Form (n * 2 * sides, 3), und Dreiecke, Form (n * 2 * sides, 3)
+        """
+        vertices, triangles = self.template( sides )
+        matrices = self.instances()
+        points = np.einsum( 'nij,vj->nvi', matrices[ :, :3, :3 ], vertices ) + matrices[ :, None, :3, 3 ]
+        offsets = np.arange( len( matrices ) )[ :, None, None ] * len( vertices )
+        return points.reshape( -1, 3 ), ( triangles[ None ] + offsets ).reshape( -1, 3 )
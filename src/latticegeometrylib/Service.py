@@ -0,0 +1,318 @@
+import asyncio
+import json
+import os
+import socket
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_CACHE = None
+
+
+def _warm( capacity: int ) -> None:
+    """
+    Initialisiert einen Arbeitsprozess. CADQuery und OCP werden vorab geladen und ein prozessweiter Zwischenspeicher
+    angelegt, welcher über alle Aufträge des Prozesses erhalten bleibt.
+
+    :param capacity: maximale Anzahl an Einträgen des Zwischenspeichers
+    """
+    global _CACHE
+    from . import Pipeline
+    _CACHE = Pipeline.ModelCache( capacity )
+
+
+def _execute( spec: dict, base: str | None ) -> dict:
+    """
+    Führt einen Auftrag in einem Arbeitsprozess aus
+
+    :param spec: Auftragsbeschreibung
+    :param base: Basisverzeichnis für relative Pfade
+    :return: Ergebnis des Auftrags
+    """
+    from . import Pipeline
+    return Pipeline.run( spec, _CACHE, base )
+
+
+class LatticeService:
+    """
+    Lokaler Dienst, welcher Aufträge über einen Unix-Socket oder eine lokale TCP-Verbindung entgegennimmt und auf
+    dauerhaft laufenden Arbeitsprozessen ausführt. Jeder Arbeitsprozess hält CADQuery geladen und speichert
+    importierte Modelle, Schalen und Elementarzellen zwischen. Freie Arbeitsprozesse bevorzugen Aufträge, deren
+    Eingangsgeometrie sie bereits geladen haben.
+    """
+    def __init__( self, address: str | tuple[ str, int ], workers: int = 2, capacity: int = 16 ) -> None:
+        """
+        Initialisierung des Dienstes
+
+        :param address: Pfad des Unix-Sockets oder Tupel aus Host und Port
+        :param workers: Anzahl der Arbeitsprozesse
+        :param capacity: maximale Anzahl an Einträgen im Zwischenspeicher je Arbeitsprozess
+        """
+        self.address: str | tuple[ str, int ] = address
+        self.workers: int = workers
+        self.capacity: int = capacity
+        self.jobs: dict[ str, dict ] = {}
+        self.pending: list[ str ] = []
+        self.condition: asyncio.Condition | None = None
+        self.server: asyncio.AbstractServer | None = None
+        self.stopping: asyncio.Event | None = None
+        self.executors: list[ ProcessPoolExecutor ] = []
+        self.connections: set[ asyncio.Task ] = set()
+
+    async def serve( self ) -> None:
+        """
+        Startet die Arbeitsprozesse und nimmt Anfragen entgegen, bis der Dienst beendet wird
+        """
+        self.condition = asyncio.Condition()
+        self.stopping = asyncio.Event()
+        self.executors = [ self._executor() for _ in range( self.workers ) ]
+        consumers = [ asyncio.create_task( self._consume( index ) ) for index in range( self.workers ) ]
+
+        if isinstance( self.address, str ):
+            if os.path.exists( self.address ):
+                os.remove( self.address )
+            self.server = await asyncio.start_unix_server( self._handle, path = self.address )
+        else:
+            self.server = await asyncio.start_server( self._handle, *self.address )
+
+        try:
+            async with self.server:
+                await self.stopping.wait()
+        finally:
+            # offene Verbindungen und Verbraucher werden beendet, bevor die Ereignisschleife geschlossen wird
+            for task in consumers + list( self.connections ):
+                task.cancel()
+            await asyncio.gather( *consumers, *self.connections, return_exceptions = True )
+            for executor in self.executors:
+                executor.shutdown( cancel_futures = True )
+            if isinstance( self.address, str ) and os.path.exists( self.address ):
+                os.remove( self.address )
+
+    def _executor( self ) -> ProcessPoolExecutor:
+        """
+        :return: neuer Arbeitsprozess mit vorab geladenem Zwischenspeicher
+        """
+        return ProcessPoolExecutor( 1, initializer = _warm, initargs = ( self.capacity, ) )
+
+    def submit( self, spec: dict, base: str | None = None ) -> str:
+        """
+        Reiht einen Auftrag in die Warteschlange ein
+
+        :param spec: Auftragsbeschreibung
+        :param base: Basisverzeichnis für relative Pfade
+        :return: Kennung des Auftrags
+        """
+        job = uuid.uuid4().hex
+        self.jobs[ job ] = { "status": "queued", "spec": spec, "base": base, "result": None, "error": None,
+                             "done": asyncio.Event() }
+        self.pending.append( job )
+        return job
+
+    def _input( self, job: str ) -> str:
+        """
+        :param job: Kennung des Auftrags
+        :return: absoluter Pfad der Eingangsgeometrie des Auftrags
+        """
+        entry = self.jobs[ job ]
+        return os.path.abspath( os.path.join( entry[ "base" ] or "", entry[ "spec" ].get( "input", "" ) ) )
+
+    async def _consume( self, index: int ) -> None:
+        """
+        Entnimmt Aufträge aus der Warteschlange und führt diese auf dem gegebenen Arbeitsprozess aus. Bricht der
+        Arbeitsprozess ab, etwa durch Speichermangel, schlägt nur der laufende Auftrag fehl und der Arbeitsprozess
+        wird neu gestartet.
+
+        :param index: Index des Arbeitsprozesses
+        """
+        loaded: set[ str ] = set()
+        loop = asyncio.get_running_loop()
+
+        while True:
+            async with self.condition:
+                await self.condition.wait_for( lambda: len( self.pending ) > 0 )
+                preferred = [ job for job in self.pending if self._input( job ) in loaded ]
+                job = preferred[ 0 ] if preferred else self.pending[ 0 ]
+                self.pending.remove( job )
+
+            entry = self.jobs[ job ]
+            entry[ "status" ] = "running"
+            try:
+                entry[ "result" ] = await loop.run_in_executor( self.executors[ index ], _execute, entry[ "spec" ],
+                                                                entry[ "base" ] )
+                entry[ "status" ] = "done"
+                loaded.add( self._input( job ) )
+            except BrokenProcessPool as exception:
+                entry[ "error" ] = f"{ type( exception ).__name__ }: { exception }"
+                entry[ "status" ] = "failed"
+                self.executors[ index ].shutdown( wait = False )
+                self.executors[ index ] = self._executor()
+                loaded = set()
+            except Exception as exception:
+                entry[ "error" ] = f"{ type( exception ).__name__ }: { exception }"
+                entry[ "status" ] = "failed"
+            entry[ "done" ].set()
+
+    async def _respond( self, request: dict ) -> dict:
+        """
+        Bearbeitet eine einzelne Anfrage
+
+        :param request: Anfrage mit dem Eintrag command
+        :return: Antwort
+        """
+        command = request.get( "command" )
+
+        if command == "submit":
+            job = self.submit( request[ "spec" ], request.get( "base" ) )
+            async with self.condition:
+                self.condition.notify()
+            return { "job": job }
+
+        if command == "shutdown":
+            self.stopping.set()
+            return { "status": "stopping" }
+
+        if command == "jobs":
+            return { "jobs": { job: entry[ "status" ] for job, entry in self.jobs.items() } }
+
+        job = request.get( "job" )
+        if job not in self.jobs:
+            return { "error": f"Unbekannter Auftrag: { job }" }
+        entry = self.jobs[ job ]
+
+        if command == "status":
+            return { "job": job, "status": entry[ "status" ] }
+
+        if command == "result":
+            if request.get( "wait", False ):
+                await asyncio.wait_for( entry[ "done" ].wait(), request.get( "timeout" ) )
+            return { "job": job, "status": entry[ "status" ], "result": entry[ "result" ], "error": entry[ "error" ] }
+
+        return { "error": f"Unbekannter Befehl: { command }" }
+
+    async def _handle( self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter ) -> None:
+        """
+        Bearbeitet die zeilenweise als JSON übertragenen Anfragen einer Verbindung. Beim Beenden des Dienstes wird die
+        Verbindung geschlossen.
+
+        :param reader: eingehender Datenstrom
+        :param writer: ausgehender Datenstrom
+        """
+        task = asyncio.current_task()
+        self.connections.add( task )
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self._respond( json.loads( line ) )
+                except ( ValueError, KeyError, asyncio.TimeoutError ) as exception:
+                    response = { "error": f"{ type( exception ).__name__ }: { exception }" }
+                writer.write( ( json.dumps( response ) + "\n" ).encode() )
+                await writer.drain()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.connections.discard( task )
+            writer.close()
+
+
+class LatticeClient:
+    """
+    Client zur Übermittlung von Aufträgen an einen laufenden LatticeService
+    """
+    def __init__( self, address: str | tuple[ str, int ], timeout: float | None = None ) -> None:
+        """
+        Initialisierung des Clients
+
+        :param address: Pfad des Unix-Sockets oder Tupel aus Host und Port
+        :param timeout: Zeitlimit für Verbindungen in s
+        """
+        self.address: str | tuple[ str, int ] = address
+        self.timeout: float | None = timeout
+
+    def _request( self, request: dict ) -> dict:
+        """
+        Sendet eine Anfrage und wartet auf die Antwort
+
+        :param request: Anfrage
+        :return: Antwort
+        :raise RuntimeError: wenn der Dienst einen Fehler meldet
+        """
+        family = socket.AF_UNIX if isinstance( self.address, str ) else socket.AF_INET
+        with socket.socket( family, socket.SOCK_STREAM ) as connection:
+            connection.settimeout( self.timeout )
+            connection.connect( self.address )
+            connection.sendall( ( json.dumps( request ) + "\n" ).encode() )
+            with connection.makefile( "r" ) as stream:
+                response = json.loads( stream.readline() )
+
+        if "error" in response and response.get( "status" ) is None:
+            raise RuntimeError( response[ "error" ] )
+        return response
+
+    def submit( self, spec: dict, base: str | None = None ) -> str:
+        """
+        Übermittelt einen Auftrag
+
+        :param spec: Auftragsbeschreibung
+        :param base: Basisverzeichnis für relative Pfade, standardmäßig das aktuelle Arbeitsverzeichnis
+        :return: Kennung des Auftrags
+        """
+        return self._request( { "command": "submit", "spec": spec, "base": base or os.getcwd() } )[ "job" ]
+
+    def status( self, job: str ) -> str:
+        """
+        :param job: Kennung des Auftrags
+        :return: Status des Auftrags (queued, running, done oder failed)
+        """
+        return self._request( { "command": "status", "job": job } )[ "status" ]
+
+    def result( self, job: str, wait: bool = True, timeout: float | None = None ) -> dict:
+        """
+        Gibt das Ergebnis eines Auftrags aus
+
+        :param job: Kennung des Auftrags
+        :param wait: steuert, ob auf den Abschluss des Auftrags gewartet wird
+        :param timeout: maximale Wartezeit in s
+        :return: Ergebnis des Auftrags
+        :raise RuntimeError: wenn der Auftrag fehlgeschlagen ist
+        """
+        response = self._request( { "command": "result", "job": job, "wait": wait, "timeout": timeout } )
+        if response[ "status" ] == "failed":
+            raise RuntimeError( response[ "error" ] )
+        return response[ "result" ]
+
+    def jobs( self ) -> dict[ str, str ]:
+        """
+        :return: Status aller bekannten Aufträge
+        """
+        return self._request( { "command": "jobs" } )[ "jobs" ]
+
+    def shutdown( self ) -> None:
+        """
+        Beendet den Dienst
+        """
+        self._request( { "command": "shutdown" } )
+
+
+def serve( address: str | tuple[ str, int ], workers: int = 2, capacity: int = 16 ) -> None:
+    """
+    Startet einen LatticeService und blockiert, bis dieser beendet wird
+
+    :param address: Pfad des Unix-Sockets oder Tupel aus Host und Port
+    :param workers: Anzahl der Arbeitsprozesse
+    :param capacity: maximale Anzahl an Einträgen im Zwischenspeicher je Arbeitsprozess
+    """
+    asyncio.run( LatticeService( address, workers, capacity ).serve() )
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser( description = "Lokaler Dienst zur Erzeugung von Gitterstrukturen" )
+    parser.add_argument( "--socket", default = None, help = "Pfad des Unix-Sockets" )
+    parser.add_argument( "--port", type = int, default = 8765, help = "TCP-Port auf localhost" )
+    parser.add_argument( "--workers", type = int, default = 2, help = "Anzahl der Arbeitsprozesse" )
+    parser.add_argument( "--capacity", type = int, default = 16, help = "Einträge im Zwischenspeicher je Prozess" )
+    arguments = parser.parse_args()
+
+    serve( arguments.socket if arguments.socket else ( "127.0.0.1", arguments.port ),
+           arguments.workers, arguments.capacity )
@@ -0,0 +1,313 @@
+import numpy as np
+from . import Graph
+StrutGraph = Graph.StrutGraph
+from . import Mesh
+segment_point_distances = Mesh.segment_point_distances
+segment_segment_distances = Mesh.segment_segment_distances
+
+_OFFSET = 1 << 20
+_BITS = 21
+
+
+def _segment_box_distances( starts: np.ndarray, ends: np.ndarray,
+                            lower: np.ndarray, upper: np.ndarray, iterations: int = 40 ) -> np.ndarray:
+    """
+    Berechnet die Abstände zwischen Strecken und einem achsparallelen Quader. Da der Abstand entlang der Strecke
+    konvex ist, wird sein Minimum durch ternäre Suche ermittelt.
+
+    :param starts: Startpunkte der Strecken, Form (n, 3)
+    :param ends: Endpunkte der Strecken, Form (n, 3)
+    :param lower: kleinste Koordinaten des Quaders
+    :param upper: größte Koordinaten des Quaders
+    :param iterations: Anzahl der Iterationen der ternären Suche
+    :return: Abstände, Form (n,)
+    """
+    direction = ends - starts
+
+    def _distance( t: np.ndarray ) -> np.ndarray:
+        points = starts + t[ :, None ] * direction
+        return np.linalg.norm( points - np.clip( points, lower, upper ), axis = 1 )
+
+    left, right = np.zeros( len( starts ) ), np.ones( len( starts ) )
+    for _ in range( iterations ):
+        first, second = left + ( right - left ) / 3., right - ( right - left ) / 3.
+        smaller = _distance( first ) < _distance( second )
+        right = np.where( smaller, second, right )
+        left = np.where( smaller, left, first )
+
+    return _distance( ( left + right ) / 2. )
+
+
+class SpatialIndex:
+    """
+    Räumlicher Index über die Streben eines Gitters in Form eines gleichmäßigen Hash-Gitters. Jede Strebe wird in
+    allen Gitterzellen eingetragen, welche ihr um den Radius erweiterter Begrenzungsquader überdeckt. Die Einträge
+    werden als nach Zellschlüsseln sortierte Felder gehalten.
+    """
+    def __init__( self, spacing: float ) -> None:
+        """
+        Initialisierung eines leeren Index
+
+        :param spacing: Kantenlänge der Gitterzellen des Index
+        """
+        if spacing <= 0.:
+            raise ValueError( "Die Kantenlänge der Gitterzellen muss größer als 0 sein." )
+
+        self.spacing: float = float( spacing )
+        self.starts: np.ndarray = np.zeros( ( 0, 3 ) )
+        self.ends: np.ndarray = np.zeros( ( 0, 3 ) )
+        self.radii: np.ndarray = np.zeros( 0 )
+        self.cells: np.ndarray = np.zeros( 0, dtype = np.int64 )
+        self.alive: np.ndarray = np.zeros( 0, dtype = bool )
+        self.keys: np.ndarray = np.zeros( 0, dtype = np.int64 )
+        self.items: np.ndarray = np.zeros( 0, dtype = np.int64 )
+
+    @classmethod
+    def from_graph( cls, graph: StrutGraph, spacing: float | None = None ) -> "SpatialIndex":
+        """
+        Erstellt den Index über alle Streben eines Graphen. Die Indizes der Streben im Index entsprechen denen im
+        Graphen.
+
+        :param graph: Graph des Gitters
+        :param spacing: Kantenlänge der Gitterzellen, standardmäßig die mittlere Strebenlänge
+        :return: räumlicher Index
+        """
+        if spacing is None:
+            spacing = float( np.median( graph.lengths() ) ) if not graph.empty() else 1.
+        index = cls( spacing )
+        index.insert( graph.starts(), graph.ends(), graph.diameters / 2., graph.cells )
+        return index
+
+    def __len__( self ) -> int:
+        """
+        :return: Anzahl der eingetragenen Streben
+        """
+        return int( np.count_nonzero( self.alive ) )
+
+    def _key( self, coordinates: np.ndarray ) -> np.ndarray:
+        """
+        Bildet aus ganzzahligen Zellkoordinaten einen eindeutigen Schlüssel
+
+        :param coordinates: Zellkoordinaten, Form (n, 3)
+        :return: Schlüssel, Form (n,)
+        """
+        shifted = coordinates.astype( np.int64 ) + _OFFSET
+        return ( shifted[ :, 0 ] << ( 2 * _BITS ) ) | ( shifted[ :, 1 ] << _BITS ) | shifted[ :, 2 ]
+
+    def _range( self, lower: np.ndarray, upper: np.ndarray ) -> tuple[ np.ndarray, np.ndarray ]:
+        """
+        Bestimmt die kleinsten und größten Zellkoordinaten, welche von Quadern überdeckt werden
+
+        :param lower: kleinste Koordinaten der Quader, Form (n, 3)
+        :param upper: größte Koordinaten der Quader, Form (n, 3)
+        :return: kleinste und größte Zellkoordinaten (inklusiv)
+        """
+        return np.floor( lower / self.spacing ).astype( np.int64 ), np.floor( upper / self.spacing ).astype( np.int64 )
+
+    def _expand( self, first: np.ndarray, last: np.ndarray ) -> tuple[ np.ndarray, np.ndarray ]:
+        """
+        Zählt alle Zellkoordinaten der gegebenen Bereiche auf
+
+        :param first: kleinste Zellkoordinaten je Bereich, Form (n, 3)
+        :param last: größte Zellkoordinaten je Bereich (inklusiv), Form (n, 3)
+        :return: Index des Bereichs und Schlüssel je überdeckter Zelle
+        """
+        extent = last - first + 1
+        counts = np.prod( extent, axis = 1 )
+        owner = np.repeat( np.arange( len( first ) ), counts )
+        local = np.arange( counts.sum() ) - np.repeat( np.cumsum( counts ) - counts, counts )
+
+        ny, nz = extent[ owner, 1 ], extent[ owner, 2 ]
+        offsets = np.stack( [ local // ( ny * nz ), ( local // nz ) % ny, local % nz ], axis = 1 )
+        return owner, self._key( first[ owner ] + offsets )
+
+    def _candidates( self, lower: np.ndarray, upper: np.ndarray ) -> np.ndarray:
+        """
+        Ermittelt alle eingetragenen Streben in den Zellen, welche ein Quader überdeckt
+
+        :param lower: kleinste Koordinaten des Quaders
+        :param upper: größte Koordinaten des Quaders
+        :return: Indizes der Streben
+        """
+        first, last = self._range( np.asarray( lower, dtype = float )[ None ], np.asarray( upper, dtype = float )[ None ] )
+        _, keys = self._expand( first, last )
+        begin = np.searchsorted( self.keys, keys, side = 'left' )
+        end = np.searchsorted( self.keys, keys, side = 'right' )
+        counts = end - begin
+        positions = np.repeat( begin, counts ) + np.arange( counts.sum() ) - np.repeat( np.cumsum( counts ) - counts,
+                                                                                       counts )
+        return np.unique( self.items[ positions ] )
+
+    def insert( self,
+                starts: np.ndarray,
+                ends: np.ndarray,
+                radii: np.ndarray,
+                cells: np.ndarray | None = None ) -> np.ndarray:
+        """
+        Fügt Streben in den Index ein
+
+        :param starts: Startpunkte der Streben, Form (n, 3)
+        :param ends: Endpunkte der Streben, Form (n, 3)
+        :param radii: Radien der Streben, Form (n,)
+        :param cells: Index der Zelle je Strebe, Form (n,)
+        :return: Indizes der eingefügten Streben
+        """
+        starts = np.asarray( starts, dtype = float ).reshape( -1, 3 )
+        ends = np.asarray( ends, dtype = float ).reshape( -1, 3 )
+        radii = np.broadcast_to( np.asarray( radii, dtype = float ), ( len( starts ), ) )
+        cells = np.full( len( starts ), -1, dtype = np.int64 ) if cells is None else np.asarray( cells, dtype = np.int64 )
+
+        ids = np.arange( len( self.starts ), len( self.starts ) + len( starts ) )
+        self.starts = np.concatenate( [ self.starts, starts ] )
+        self.ends = np.concatenate( [ self.ends, ends ] )
+        self.radii = np.concatenate( [ self.radii, radii ] )
+        self.cells = np.concatenate( [ self.cells, cells ] )
+        self.alive = np.concatenate( [ self.alive, np.ones( len( starts ), dtype = bool ) ] )
+
+        first, last = self._range( np.minimum( starts, ends ) - radii[ :, None ],
+                                   np.maximum( starts, ends ) + radii[ :, None ] )
+        owner, keys = self._expand( first, last )
+
+        keys = np.concatenate( [ self.keys, keys ] )
+        items = np.concatenate( [ self.items, ids[ owner ] ] )
+        order = np.argsort( keys, kind = 'stable' )
+        self.keys, self.items = keys[ order ], items[ order ]
+
+        return ids
+
+    def remove( self, ids: np.ndarray ) -> None:
+        """
+        Entfernt Streben aus dem Index. Die Indizes der übrigen Streben bleiben erhalten.
+
+        :param ids: Indizes der zu entfernenden Streben
+        """
+        ids = np.asarray( ids, dtype = np.int64 ).reshape( -1 )
+        self.alive[ ids ] = False
+        keep = self.alive[ self.items ]
+        self.keys, self.items = self.keys[ keep ], self.items[ keep ]
+
+    def update( self, ids: np.ndarray, starts: np.ndarray, ends: np.ndarray, radii: np.ndarray ) -> np.ndarray:
+        """
+        Ersetzt die Geometrie der gegebenen Streben. Die ersetzten Streben erhalten neue Indizes.
+
+        :param ids: Indizes der zu ersetzenden Streben
+        :param starts: neue Startpunkte, Form (n, 3)
+        :param ends: neue Endpunkte, Form (n, 3)
+        :param radii: neue Radien, Form (n,)
+        :return: neue Indizes der Streben
+        """
+        ids = np.asarray( ids, dtype = np.int64 ).reshape( -1 )
+        cells = self.cells[ ids ]
+        self.remove( ids )
+        return self.insert( starts, ends, radii, cells )
+
+    def box( self, lower: tuple | np.ndarray, upper: tuple | np.ndarray ) -> np.ndarray:
+        """
+        Sucht alle Streben, welche einen achsparallelen Quader berühren
+
+        :param lower: kleinste Koordinaten des Quaders
+        :param upper: größte Koordinaten des Quaders
+        :return: Indizes der Streben
+        """
+        lower, upper = np.asarray( lower, dtype = float ), np.asarray( upper, dtype = float )
+        candidates = self._candidates( lower, upper )
+        distances = _segment_box_distances( self.starts[ candidates ], self.ends[ candidates ], lower, upper )
+        return candidates[ distances <= self.radii[ candidates ] ]
+
+    def sphere( self, center: tuple | np.ndarray, radius: float ) -> np.ndarray:
+        """
+        Sucht alle Streben, welche eine Kugel berühren
+
+        :param center: Mittelpunkt der Kugel
+        :param radius: Radius der Kugel
+        :return: Indizes der Streben
+        """
+        center = np.asarray( center, dtype = float )
+        candidates = self._candidates( center - radius, center + radius )
+        distances = segment_point_distances( self.starts[ candidates ], self.ends[ candidates ],
+                                              np.broadcast_to( center, ( len( candidates ), 3 ) ) )
+        return candidates[ distances <= radius + self.radii[ candidates ] ]
+
+    def segment( self, start: tuple | np.ndarray, end: tuple | np.ndarray, radius: float = 0. ) -> np.ndarray:
+        """
+        Sucht alle Streben, welche eine Strecke oder einen Zylinder mit halbkugelförmigen Enden schneiden
+
+        :param start: Startpunkt der Strecke
+        :param end: Endpunkt der Strecke
+        :param radius: Radius um die Strecke
+        :return: Indizes der Streben
+        """
+        start, end = np.asarray( start, dtype = float ), np.asarray( end, dtype = float )
+        candidates = self._candidates( np.minimum( start, end ) - radius, np.maximum( start, end ) + radius )
+        count = len( candidates )
+        distances = segment_segment_distances( self.starts[ candidates ], self.ends[ candidates ],
+                                                np.broadcast_to( start, ( count, 3 ) ),
+                                                np.broadcast_to( end, ( count, 3 ) ) )
+        return candidates[ distances <= radius + self.radii[ candidates ] ]
+
+    def nearest( self, point: tuple | np.ndarray, count: int = 1 ) -> tuple[ np.ndarray, np.ndarray ]:
+        """
+        Sucht die nächstgelegenen Streben zu einem Punkt. Der Suchbereich wird so lange verdoppelt, bis alle
+        gefundenen Streben näher liegen als der Rand des Suchbereichs. Er beginnt beim Abstand des Punktes zu den
+        eingetragenen Streben und wird auf deren Begrenzungsquader beschränkt, sodass auch für weit entfernte Punkte
+        nur belegte Zellen aufgezählt werden.
+
+        :param point: Punkt
+        :param count: Anzahl der gesuchten Streben
+        :return: Indizes der Streben und Abstände zu deren Oberfläche
+        """
+        point = np.asarray( point, dtype = float )
+        if len( self ) == 0:
+            return np.zeros( 0, dtype = np.int64 ), np.zeros( 0 )
+
+        alive = np.flatnonzero( self.alive )
+        radii = self.radii[ alive ][ :, None ]
+        lower = np.minimum( self.starts[ alive ], self.ends[ alive ] ) - radii
+        upper = np.maximum( self.starts[ alive ], self.ends[ alive ] ) + radii
+        lower, upper = lower.min( axis = 0 ), upper.max( axis = 0 )
+        reach = np.max( np.maximum( np.abs( lower - point ), np.abs( upper - point ) ) )
+        half = max( self.spacing, float( np.max( np.maximum( lower - point, point - upper ) ) ) )
+
+        while True:
+            candidates = self._candidates( np.clip( point - half, lower, upper ),
+                                           np.clip( point + half, lower, upper ) )
+            distances = segment_point_distances( self.starts[ candidates ], self.ends[ candidates ],
+                                                  np.broadcast_to( point, ( len( candidates ), 3 ) ) ) - \
+                self.radii[ candidates ]
+            order = np.argsort( distances )[ :count ]
+            if ( len( order ) == min( count, len( self ) ) and distances[ order[ -1 ] ] <= half ) or half > reach:
+                return candidates[ order ], distances[ order ]
+            half *= 2.
+
+    def cells_in( self, lower: tuple | np.ndarray, upper: tuple | np.ndarray ) -> np.ndarray:
+        """
+        Sucht die Zellen des Gitters, deren Streben einen achsparallelen Quader berühren
+
+        :param lower: kleinste Koordinaten des Quaders
+        :param upper: größte Koordinaten des Quaders
+        :return: Zellindizes
+        """
+        cells = self.cells[ self.box( lower, upper ) ]
+        return np.unique( cells[ cells >= 0 ] )
+
+    def arrays( self ) -> dict[ str, np.ndarray ]:
+        """
+        Gibt den Index als Felder für die Speicherung aus
+
+        :return: Felder des Index
+        """
+        return { "spacing": np.array( self.spacing ), "starts": self.starts, "ends": self.ends, "radii": self.radii,
+                 "cells": self.cells, "alive": self.alive, "keys": self.keys, "items": self.items }
+
+    @classmethod
+    def from_arrays( cls, arrays: dict[ str, np.ndarray ] ) -> "SpatialIndex":
+        """
+        Stellt einen gespeicherten Index wieder her
+
+        :param arrays: Felder des Index
+        :return: räumlicher Index
+        """
+        index = cls( float( arrays[ "spacing" ] ) )
+        for name in ( "starts", "ends", "radii", "cells", "alive", "keys", "items" ):
+            setattr( index, name, np.asarray( arrays[ name ] ) )
+        return index
@@ -0,0 +1,101 @@
+import os
+import tempfile
+from cadquery import Workplane, Shape, Compound
+
+
+def resident_memory() -> int | None:
+    """
+    Gibt den aktuell belegten physischen Arbeitsspeicher des Prozesses aus. Unter Linux wird /proc/self/statm
+    gelesen, auf anderen Systemen wird das Paket psutil verwendet, sofern es installiert ist.
+
+    :return: belegter Arbeitsspeicher in Byte oder None, wenn dieser auf dem System nicht bestimmt werden kann
+    """
+    try:
+        with open( "/proc/self/statm", mode = 'r' ) as statm:
+            return int( statm.read().split()[ 1 ] ) * os.sysconf( "SC_PAGE_SIZE" )
+    except ( OSError, ValueError, IndexError ):
+        pass
+
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return int( psutil.Process().memory_info().rss )
+
+
+class SpillStore:
+    """
+    Auslagerung abgeschlossener Zwischenergebnisse als binäre BREP-Dateien. Ausgelagerte Ergebnisse werden aus dem
+    Arbeitsspeicher entfernt und bei Bedarf wieder geladen.
+    """
+    def __init__( self, directory: str | None = None, budget: int | None = None ) -> None:
+        """
+        Initialisierung der Auslagerung
+
+        :param directory: Verzeichnis für die ausgelagerten Ergebnisse, standardmäßig ein temporäres Verzeichnis
+        :param budget: Arbeitsspeicher des Prozesses in Byte, ab welchem ausgelagert wird. Ohne Angabe oder bei 0
+                       werden nicht benötigte Ergebnisse stets ausgelagert.
+        """
+        self.temporary: tempfile.TemporaryDirectory | None = None
+        if directory is None:
+            self.temporary = tempfile.TemporaryDirectory( prefix = "lattice-" )
+            directory = self.temporary.name
+
+        self.directory: str = directory
+        self.budget: int | None = budget
+        self.files: dict[ str, str ] = {}
+
+        os.makedirs( directory, exist_ok = True )
+
+    def exceeded( self ) -> bool:
+        """
+        Prüft, ob der belegte Arbeitsspeicher das Budget überschreitet
+
+        :return: True, wenn ausgelagert werden soll. Kann der Arbeitsspeicher nicht bestimmt werden, gilt das Budget
+                 als eingehalten.
+        """
+        if not self.budget:
+            return True
+        memory = resident_memory()
+        return memory is not None and memory > self.budget
+
+    def __contains__( self, name: str ) -> bool:
+        """
+        :param name: Bezeichnung des Ergebnisses
+        :return: True, wenn das Ergebnis ausgelagert ist
+        """
+        return name in self.files
+
+    def spill( self, name: str, model: Workplane ) -> None:
+        """
+        Schreibt ein Ergebnis als binäre BREP-Datei
+
+        :param name: Bezeichnung des Ergebnisses
+        :param model: Ergebnis als CADQuery Workplane
+        """
+        shapes = model.vals()
+        shape = shapes[ 0 ] if len( shapes ) == 1 else Compound.makeCompound( shapes )
+        filepath = os.path.join( self.directory, f"{ name }-{ os.getpid() }-{ id( self ) }.bin" )
+        shape.exportBin( filepath )
+        self.files[ name ] = filepath
+
+    def restore( self, name: str ) -> Workplane:
+        """
+        Lädt ein ausgelagertes Ergebnis. Die Datei bleibt erhalten, sodass das Ergebnis erneut freigegeben werden
+        kann, ohne es neu zu schreiben.
+
+        :param name: Bezeichnung des Ergebnisses
+        :return: Ergebnis als CADQuery Workplane
+        """
+        return Workplane( obj = Shape.importBin( self.files[ name ] ) )
+
+    def discard( self, name: str ) -> None:
+        """
+        Entfernt ein ausgelagertes Ergebnis, etwa wenn dieses neu berechnet wurde
+
+        :param name: Bezeichnung des Ergebnisses
+        """
+        if name in self.files:
+            filepath = self.files.pop( name )
+            if os.path.exists( filepath ):
+                os.remove( filepath )
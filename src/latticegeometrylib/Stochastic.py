@@ -0,0 +1,221 @@
+from typing import Any, Callable
+import numpy as np
+from . import Graph
+StrutGraph = Graph.StrutGraph
+
+KINDS: tuple[ str, ... ] = ( "voronoi", "delaunay" )
+
+
+def _spatial() -> Any:
+    """
+    :return: Modul scipy.spatial
+    """
+    try:
+        from scipy import spatial
+    except ImportError as error:
+        raise ImportError( "Für stochastische Gitter wird das Paket scipy benötigt." ) from error
+    return spatial
+
+
+def poisson_disk( lower: np.ndarray,
+                  upper: np.ndarray,
+                  spacing: float,
+                  contains: Callable[ [ np.ndarray ], np.ndarray ] | None = None,
+                  grading: Callable[ [ np.ndarray ], np.ndarray ] | None = None,
+                  count: int | None = None,
+                  seed: int | None = None,
+                  rounds: int = 32,
+                  batch: int | None = None ) -> np.ndarray:
+    """
+    Verteilt Punkte mit einem Mindestabstand zufällig in einem Quader (Poisson-Disk-Verteilung). Die Punkte werden
+    blockweise gewürfelt, Kandidaten mit zu geringem Abstand zu bereits angenommenen Punkten über einen KD-Baum
+    verworfen und Konflikte innerhalb eines Blocks zugunsten des jeweils ersten Kandidaten aufgelöst. Mit einer
+    Gradierung wird der Mindestabstand örtlich so skaliert, dass die Punktdichte der gegebenen relativen Dichte folgt.
+
+    :param lower: kleinste Koordinaten des Quaders
+    :param upper: größte Koordinaten des Quaders
+    :param spacing: Mindestabstand zweier Punkte bei einer relativen Dichte von 1
+    :param contains: Funktion, welche für Punkte der Form (n, 3) ausgibt, ob diese innerhalb der Geometrie liegen
+    :param grading: Funktion, welche für Punkte der Form (n, 3) die relative Punktdichte in (0, 1] ausgibt
+    :param count: größte Anzahl an Punkten
+    :param seed: Startwert des Zufallszahlengenerators
+    :param rounds: größte Anzahl an Blöcken
+    :param batch: Anzahl der Kandidaten je Block, standardmäßig die bei dichtester Packung erwartete Punktanzahl
+    :return: Punkte, Form (n, 3)
+    """
+    spatial = _spatial()
+    lower, upper = np.asarray( lower, dtype = float ), np.asarray( upper, dtype = float )
+    if spacing <= 0.:
+        raise ValueError( "Der Mindestabstand muss größer als 0 sein." )
+
+    generator = np.random.default_rng( seed )
+    if batch is None:
+        batch = int( min( 1 << 22, max( 1024, np.prod( upper - lower ) / spacing ** 3 ) ) )
+
+    def _spacings( points: np.ndarray ) -> np.ndarray:
+        """
+        Örtlicher Mindestabstand der Punkte
+        """
+        if grading is None:
+            return np.full( len( points ), spacing )
+        density = np.clip( np.asarray( grading( points ), dtype = float ).reshape( -1 ), 1e-6, 1. )
+        return spacing / np.cbrt( density )
+
+    points = np.zeros( ( 0, 3 ) )
+    radii = np.zeros( 0 )
+
+    for _ in range( rounds ):
+        candidates = generator.uniform( lower, upper, ( batch, 3 ) )
+        if contains is not None:
+            candidates = candidates[ np.asarray( contains( candidates ), dtype = bool ) ]
+        distances = _spacings( candidates )
+
+        # Abstand zu bereits angenommenen Punkten über deren nächste Nachbarn, bei konstantem Abstand genügt einer
+        if len( points ) > 0 and len( candidates ) > 0:
+            tree = spatial.cKDTree( points, balanced_tree = False, compact_nodes = False )
+            reach = ( float( distances.max() ) + float( radii.max() ) ) / 2.
+            gaps, indices = tree.query( candidates, k = 1 if grading is None else min( 8, len( points ) ),
+                                        distance_upper_bound = reach )
+            gaps, indices = gaps.reshape( len( candidates ), -1 ), indices.reshape( len( candidates ), -1 )
+            limits = ( distances[ :, None ] + np.append( radii, 0. )[ indices ] ) / 2.
+            free = ~ np.any( gaps < limits, axis = 1 )
+            candidates, distances = candidates[ free ], distances[ free ]
+
+        # Konflikte innerhalb des Blocks zugunsten des Kandidaten mit kleinerem Index
+        if len( candidates ) > 1:
+            pairs = spatial.cKDTree( candidates ).query_pairs( float( distances.max() ), output_type = 'ndarray' )
+            gaps = np.linalg.norm( candidates[ pairs[ :, 0 ] ] - candidates[ pairs[ :, 1 ] ], axis = 1 )
+            pairs = pairs[ gaps < ( distances[ pairs[ :, 0 ] ] + distances[ pairs[ :, 1 ] ] ) / 2. ]
+            keep = np.ones( len( candidates ), dtype = bool )
+            keep[ np.max( pairs, axis = 1 ) ] = False
+            candidates, distances = candidates[ keep ], distances[ keep ]
+
+        points, radii = np.concatenate( ( points, candidates ) ), np.concatenate( ( radii, distances ) )
+        if count is not None and len( points ) >= count:
+            return points[ :count ]
+        if len( candidates ) < batch // 100:
+            break
+
+    return points
+
+
+def delaunay( points: np.ndarray ) -> tuple[ np.ndarray, np.ndarray ]:
+    """
+    Kanten der Delaunay-Tetraedrisierung der Punkte
+
+    :param points: Punkte, Form (n, 3)
+    :return: Knoten, Form (n, 3), und Indizes der Knotenpaare der Kanten, Form (m, 2)
+    """
+    simplices = _spatial().Delaunay( points ).simplices
+    first, second = np.triu_indices( 4, 1 )
+    edges = np.sort( np.stack( ( simplices[ :, first ], simplices[ :, second ] ), axis = 2 ).reshape( -1, 2 ), axis = 1 )
+    keys = np.unique( edges[ :, 0 ].astype( np.int64 ) * len( points ) + edges[ :, 1 ] )
+    return np.asarray( points, dtype = float ), np.stack( ( keys // len( points ), keys % len( points ) ), axis = 1 )
+
+
+def voronoi( points: np.ndarray ) -> tuple[ np.ndarray, np.ndarray ]:
+    """
+    Kanten des Voronoi-Diagramms der Punkte. Die Knoten sind die Umkugelmittelpunkte der Delaunay-Tetraeder, die
+    Kanten verbinden die Mittelpunkte benachbarter Tetraeder. Unbeschränkte Kanten am Rand entfallen.
+
+    :param points: Punkte, Form (n, 3)
+    :return: Knoten, Form (t, 3), und Indizes der Knotenpaare der Kanten, Form (m, 2)
+    """
+    triangulation = _spatial().Delaunay( points )
+    corners = triangulation.points[ triangulation.simplices ]
+
+    # Umkugelmittelpunkt relativ zur ersten Ecke, für entartete Tetraeder unendlich
+    a, b, c = ( corners[ :, i ] - corners[ :, 0 ] for i in range( 1, 4 ) )
+    squared = [ np.einsum( 'ij,ij->i', v, v )[ :, None ] for v in ( a, b, c ) ]
+    with np.errstate( divide = 'ignore', invalid = 'ignore' ):
+        centers = corners[ :, 0 ] + ( squared[ 0 ] * np.cross( b, c ) + squared[ 1 ] * np.cross( c, a ) +
+                                      squared[ 2 ] * np.cross( a, b ) ) / \
+            ( 2. * np.einsum( 'ij,ij->i', a, np.cross( b, c ) ) )[ :, None ]
+
+    neighbours = triangulation.neighbors
+    tetrahedra = np.repeat( np.arange( len( neighbours ) ), 4 )
+    adjacent = neighbours.reshape( -1 )
+    valid = ( adjacent > tetrahedra ) & np.all( np.isfinite( centers ), axis = 1 )[ tetrahedra ]
+    valid[ valid ] &= np.all( np.isfinite( centers ), axis = 1 )[ adjacent[ valid ] ]
+    return centers, np.stack( ( tetrahedra[ valid ], adjacent[ valid ] ), axis = 1 )
+
+
+def graph( nodes: np.ndarray,
+           edges: np.ndarray,
+           diameter: float,
+           minimum_length: float = 0.,
+           maximum_length: float = np.inf ) -> StrutGraph:
+    """
+    Erstellt den Graphen eines stochastischen Gitters. Kanten unterhalb der kleinsten Länge werden zusammengezogen,
+    ihre Knoten durch deren Schwerpunkt ersetzt. Kanten oberhalb der größten Länge werden entfernt.
+
+    :param nodes: Knoten, Form (n, 3)
+    :param edges: Indizes der Knotenpaare der Kanten, Form (m, 2)
+    :param diameter: Durchmesser der Streben
+    :param minimum_length: kleinste Länge einer Strebe
+    :param maximum_length: größte Länge einer Strebe
+    :return: Graph mit einer Strebe je verbleibender Kante
+    """
+    nodes = np.asarray( nodes, dtype = float ).reshape( -1, 3 )
+    edges = np.asarray( edges, dtype = np.int64 ).reshape( -1, 2 )
+    lengths = np.linalg.norm( nodes[ edges[ :, 1 ] ] - nodes[ edges[ :, 0 ] ], axis = 1 )
+    edges = edges[ lengths <= maximum_length ]
+    lengths = lengths[ lengths <= maximum_length ]
+
+    if minimum_length > 0.:
+        labels = Graph.components( len( nodes ), edges[ lengths < minimum_length ] )
+        _, inverse, counts = np.unique( labels, return_inverse = True, return_counts = True )
+        nodes = np.stack( [ np.bincount( inverse, weights = nodes[ :, axis ] ) for axis in range( 3 ) ],
+                          axis = 1 ) / counts[ :, None ]
+        edges = inverse[ edges ]
+
+    # doppelte und zusammengezogene Kanten über einen ganzzahligen Schlüssel je Knotenpaar entfernen
+    edges = np.sort( edges, axis = 1 )
+    edges = edges[ edges[ :, 0 ] != edges[ :, 1 ] ]
+    keys = np.unique( edges[ :, 0 ] * len( nodes ) + edges[ :, 1 ] )
+    used, inverse = np.unique( np.stack( ( keys // len( nodes ), keys % len( nodes ) ), axis = 1 ),
+                               return_inverse = True )
+    return StrutGraph( nodes[ used ], inverse.reshape( -1, 2 ), np.full( len( keys ), float( diameter ) ) )
+
+
+def create( lower: np.ndarray,
+            upper: np.ndarray,
+            spacing: float,
+            diameter: float,
+            kind: str = "voronoi",
+            contains: Callable[ [ np.ndarray ], np.ndarray ] | None = None,
+            grading: Callable[ [ np.ndarray ], np.ndarray ] | None = None,
+            minimum_length: float = 0.,
+            maximum_length: float | None = None,
+            count: int | None = None,
+            seed: int | None = None ) -> StrutGraph:
+    """
+    Erstellt den Graphen eines stochastischen, schaumartigen Gitters aus zufällig verteilten Saatpunkten
+
+    :param lower: kleinste Koordinaten des Quaders der Saatpunkte
+    :param upper: größte Koordinaten des Quaders der Saatpunkte
+    :param spacing: Mindestabstand der Saatpunkte bei einer relativen Dichte von 1
+    :param diameter: Durchmesser der Streben
+    :param kind: voronoi für Kanten des Voronoi-Diagramms oder delaunay für Kanten der Delaunay-Tetraedrisierung
+    :param contains: Funktion, welche für Punkte ausgibt, ob diese innerhalb der Geometrie liegen
+    :param grading: Funktion, welche für Punkte die relative Dichte der Saatpunkte in (0, 1] ausgibt
+    :param minimum_length: kleinste Länge einer Strebe, kürzere Kanten werden zusammengezogen
+    :param maximum_length: größte Länge einer Strebe, standardmäßig das Dreifache des größten örtlichen
+                           Mindestabstands
+    :param count: größte Anzahl an Saatpunkten
+    :param seed: Startwert des Zufallszahlengenerators
+    :return: Graph des Gitters
+    """
+    if kind not in KINDS:
+        raise ValueError( f"Unbekannte Art des stochastischen Gitters: { kind }" )
+
+    points = poisson_disk( lower, upper, spacing, contains, grading, count, seed )
+    if len( points ) < 5:
+        raise ValueError( "Für ein stochastisches Gitter werden mindestens fünf Saatpunkte benötigt." )
+
+    if maximum_length is None:
+        density = 1. if grading is None else float( np.clip( np.min( grading( points ) ), 1e-6, 1. ) )
+        maximum_length = 3. * spacing / np.cbrt( density )
+
+    nodes, edges = voronoi( points ) if kind == "voronoi" else delaunay( points )
+    return graph( nodes, edges, diameter, minimum_length, maximum_length )
@@ -1,9 +1,45 @@
 from . import Miscellaneous
 Size = Miscellaneous.Size
 from . import CellConfiguration
+Entity = CellConfiguration.Entity
 CellConfiguration = CellConfiguration.CellConfiguration
-from cadquery import Workplane, Plane, Location, Vector
+from cadquery import Workplane, Plane, Location, Vector, Wire, Face, Solid, Shape
 from cadquery.selectors import BoxSelector
+import numpy as np
+
+
+def _plates( entities: list[ Entity ] ) -> Shape | None:
+    """
+    Erstellt die Prismen aller gegebenen Flächenentitäten in einem Durchgang. Die Normalen und die Eckpunkte der
+    Grund- und Deckflächen werden für alle Flächen gemeinsam vektorisiert berechnet, die Prismen direkt
+    als OCC-Körper erzeugt und in einer einzigen booleschen Operation vereinigt. Koplanare, aneinandergrenzende
+    Flächen werden anschließend zu einzelnen Flächen zusammengefasst.
+
+    :param entities: Entitäten der Dimension 2
+    :return: vereinigte Prismen oder None, falls keine Entitäten gegeben sind
+    """
+    if len( entities ) == 0:
+        return None
+
+    points = np.array( [ [ p.toTuple() for p in entity.geometry ] for entity in entities ] )
+    thickness = np.array( [ entity.get( "thickness" ) for entity in entities ] )
+
+    normals = np.cross( points[ :, 1 ] - points[ :, 0 ], points[ :, 2 ] - points[ :, 1 ] )
+    normals /= np.linalg.norm( normals, axis = 1 )[ :, None ]
+
+    bottom = points - ( normals * thickness[ :, None ] / 2. )[ :, None, : ]
+    extrusion = normals * thickness[ :, None ]
+
+    solids: list[ Shape ] = []
+    for polygon, direction in zip( bottom, extrusion ):
+        outline = [ Vector( *p ) for p in polygon ]
+        face = Face.makeFromWires( Wire.makePolygon( outline + [ outline[ 0 ] ] ) )
+        solids.append( Solid.extrudeLinear( face, Vector( *direction ) ) )
+
+    if len( solids ) == 1:
+        return solids[ 0 ]
+
+    return solids[ 0 ].fuse( *solids[ 1: ] ).clean()
 
 
 class UnitaryCell:
@@ -17,20 +53,12 @@ class UnitaryCell:
         :parameter size: Abmaße der Elementarzelle
         """
         def _vertices( measures: Size ) -> dict[ int, Vector ]:
-            return {
-                1: Vector( ( - measures.dx / 2., - measures.dy / 2., - measures.dz / 2.) ),
-                2: Vector( ( - measures.dx / 2., measures.dy / 2., - measures.dz / 2.) ),
-                3: Vector( ( measures.dx / 2., measures.dy / 2., - measures.dz / 2.) ),
-                4: Vector( ( measures.dx / 2., - measures.dy / 2., - measures.dz / 2.) ),
-                5: Vector( ( - measures.dx / 2., - measures.dy / 2., measures.dz / 2.) ),
-                6: Vector( ( measures.dx / 2., - measures.dy / 2., measures.dz / 2.) ),
-                7: Vector( ( measures.dx / 2., measures.dy / 2., measures.dz / 2.) ),
-                8: Vector( ( - measures.dx / 2., measures.dy / 2., measures.dz / 2.) )
-            }
+            return { index: Vector( *point ) for index, point in Miscellaneous.vertices( measures ).items() }
         self.size: Size | None = size
         self.vertices: dict[ int, Vector ] | None = None
         self.initialized: bool = False
         self.geometry: Workplane = Workplane()
+        self.config: CellConfiguration | None = None
 
         if size is not None:
             self.vertices = _vertices( size )
@@ -49,10 +77,22 @@ class UnitaryCell:
         if not self.initialized:
             raise ValueError( "Die Elementarzelle wurde noch nicht initialisiert." )
 
+        pending: list[ Entity ] = []
+
+        def _flush() -> None:
+            """
+            Vereinigt die gesammelten Flächenentitäten mit der bisherigen Geometrie
+            """
+            prisms = _plates( pending )
+            if prisms is not None:
+                self.geometry = self.geometry.union( prisms )
+            pending.clear()
+
         for entity in config:
             dimension = entity.dimension()
 
             if dimension == -1:
+                _flush()
                 selection: BoxSelector = BoxSelector(
                     self.vertices[ 1 ], self.vertices[ 7 ] )
                 self.geometry = self.geometry.edges( selection ).fillet( entity.get( "radius" ) )
@@ -71,21 +111,15 @@ class UnitaryCell:
                     Workplane( plane ).cylinder( height = ( first - last ).Length, radius = radius ) )
 
             if dimension == 2:
-                first, second, third = tuple( entity.geometry )
-                normal = ( second - first ).cross( third - second ).normalized()
-                plane = Plane( origin = first, normal = normal,
-                               xDir = ( second - first ).normalized() )
-                plane_points = [ ( ( p - first ).dot( plane.xDir ), ( p - first ).dot( plane.yDir ) )
-                                 for p in entity.geometry ]
-                thickness: float = entity.get( "thickness" )
-                self.geometry = self.geometry.union(
-                    Workplane( plane ).polyline( plane_points ).close().extrude(
-                        thickness / 2., both=True ) )
+                pending.append( entity )
+
+        _flush()
 
         if box_intersect:
             self.geometry = self.geometry.intersect(
                 Workplane().box( self.size.dx, self.size.dy, self.size.dz ) )
 
+        self.config = config
         self.has_cell = True
 
     def reset( self ) -> None:
@@ -93,6 +127,7 @@ class UnitaryCell:
         Entfernt die Geometrie der Elementarzelle
         """
         self.geometry = Workplane()
+        self.config = None
         self.has_cell = False
         self.vertices = {}
         self.initialized = False
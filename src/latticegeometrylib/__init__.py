@@ -1,8 +1,24 @@
-from . import Generator
-from . import UnitaryCell
-from . import Miscellaneous
-from . import Lattice
-from . import CellConfiguration
-from . import Geometry
-import OCP
+from importlib import import_module
 
+__all__ = [ "Generator", "UnitaryCell", "Miscellaneous", "Lattice", "CellConfiguration", "Geometry", "Graph", "Mesh",
+            "SpatialIndex", "Pipeline", "Service", "Command", "Checkpoint", "Spill", "Importer",
+            "Export", "Homogenization",
+            "Manufacturability", "Preview", "Hybrid",
+            "Stochastic", "Boolean", "Fingerprint", "Mass" ]
+
+
+def __getattr__( name: str ):
+    """
+    Lädt die Module des Pakets erst beim ersten Zugriff, sodass CADQuery und OCP nur importiert werden, wenn ein Modul
+    mit B-Rep-Operationen verwendet wird. Der bisherige Verweis latticegeometrylib.OCP bleibt auf dieselbe Weise
+    erhalten.
+    """
+    if name in __all__ or name == "OCP":
+        module = import_module( "OCP" ) if name == "OCP" else import_module( f".{ name }", __name__ )
+        globals()[ name ] = module
+        return module
+    raise AttributeError( f"module { __name__ !r} has no attribute { name !r}" )
+
+
+def __dir__() -> list[ str ]:
+    return sorted( set( globals() ) | set( __all__ ) | { "OCP" } )
@@ -11,8 +11,12 @@ setup(
     description=DESCRIPTION,
     long_description=open('README.rst').read(),
     packages=find_packages(),
-    install_requires=[],  # add any additional packages that
+    install_requires=[ 'tomli; python_version < "3.11"' ],  # add any additional packages that
     # needs to be installed along with your package. Eg: 'caer'
+    extras_require={ "hdf5": [ "h5py" ], "stochastic": [ "scipy" ], "spill": [ "psutil" ] },
+    entry_points={
+        "console_scripts": [ "latticegen = latticegeometrylib.Command:main" ]
+    },
 
     keywords=['python', 'cadquery'],
     classifiers=[
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from cadquery import Workplane
+from latticegeometrylib.Generator import LatticeGenerator
+
+
+def _generator( size: float ) -> LatticeGenerator:
+    generator = LatticeGenerator()
+    generator.set_initial_model( Workplane().box( size, size, size ) )
+    generator.init_unitary_cell( ( 5., 5., 5. ), ( True, True, True ) )
+    generator.add_entities( [ [ 1, 7, { "diameter": 1. } ], [ 2, 6, { "diameter": 1. } ],
+                              [ 3, 5, { "diameter": 1. } ], [ 4, 8, { "diameter": 1. } ] ] )
+    generator.create_unitary_cell()
+    generator.create_lattice()
+    return generator
+
+
+@pytest.mark.parametrize( "size", [ 10., 9. ] )
+@pytest.mark.parametrize( "exact", [ False, True ] )
+def test_clipped_struts_stay_inside( size: float, exact: bool ):
+    generator = _generator( size )
+    generator.intersect_lattice( clip = True, exact = exact )
+    model = generator.get_initial_model().val()
+    solids = generator.get_intersected_lattice().solids().vals()
+
+    assert len( solids ) > 0
+    if exact:
+        assert sum( solid.cut( model ).Volume() for solid in solids ) < 1e-6
+    else:
+        box = generator.get_intersected_lattice().val().BoundingBox()
+        assert np.all( np.abs( [ box.xmin, box.ymin, box.zmin, box.xmax, box.ymax, box.zmax ] ) <= size / 2. + 1e-6 )
+
+
+def test_struts_ending_on_the_surface_are_trimmed():
+    generator = _generator( 10. )
+    generator.intersect_lattice( clip = True )
+    graph = generator.geometry.lattice_graph
+    on_surface = np.isclose( np.abs( graph.nodes[ graph.struts ] ).max( axis = 2 ), 5. )
+
+    assert np.any( on_surface )
+    assert np.array_equal( graph.trimmed, on_surface )
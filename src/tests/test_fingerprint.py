@@ -0,0 +1,56 @@
+import numpy as np
+from cadquery import Workplane
+from latticegeometrylib.Graph import StrutGraph
+from latticegeometrylib import Fingerprint
+
+
+def _graph( count: int = 50 ) -> StrutGraph:
+    rng = np.random.default_rng( 3 )
+    nodes = rng.uniform( -10., 10., ( count, 3 ) )
+    struts = np.stack( ( np.arange( count - 1 ), np.arange( 1, count ) ), axis = 1 )
+    trimmed = rng.random( ( count - 1, 2 ) ) < .2
+    return StrutGraph( nodes, struts, rng.uniform( .5, 1., count - 1 ), np.arange( count - 1 ), trimmed )
+
+
+def test_digest_ignores_order_and_direction():
+    graph = _graph()
+    rng = np.random.default_rng( 4 )
+    order, strut_order = rng.permutation( len( graph.nodes ) ), rng.permutation( len( graph ) )
+    inverse = np.argsort( order )
+    permuted = StrutGraph( graph.nodes[ order ], inverse[ graph.struts[ strut_order, :: -1 ] ],
+                           graph.diameters[ strut_order ], graph.cells[ strut_order ],
+                           graph.trimmed[ strut_order, :: -1 ] )
+
+    assert Fingerprint.digest( graph ) == Fingerprint.digest( permuted )
+    assert Fingerprint.digest( graph ) == Fingerprint.digest( StrutGraph(
+        graph.nodes + 1e-9, graph.struts, graph.diameters, graph.cells, graph.trimmed ) )
+
+
+def test_digest_detects_changes():
+    graph = _graph()
+    reference = Fingerprint.digest( graph )
+    diameters = graph.diameters.copy()
+    diameters[ 0 ] += 1e-3
+    trimmed = graph.trimmed.copy()
+    trimmed[ 0, 0 ] = not trimmed[ 0, 0 ]
+
+    assert Fingerprint.digest( graph.subset( np.arange( len( graph ) ) > 0 ) ) != reference
+    assert Fingerprint.digest( StrutGraph( graph.nodes, graph.struts, diameters, graph.cells,
+                                           graph.trimmed ) ) != reference
+    assert Fingerprint.digest( StrutGraph( graph.nodes, graph.struts, graph.diameters, graph.cells,
+                                           trimmed ) ) != reference
+    assert Fingerprint.digest( None ) == ""
+
+
+def test_fingerprint_of_box():
+    fingerprint = Fingerprint.Fingerprint.create( Workplane().box( 2., 3., 4. ), _graph() )
+    restored = Fingerprint.Fingerprint.from_dict( fingerprint.to_dict() )
+
+    assert np.isclose( fingerprint.volume, 24. ) and np.isclose( fingerprint.area, 52. )
+    assert np.allclose( fingerprint.centroid, 0., atol = 1e-9 )
+    assert np.allclose( np.diag( fingerprint.inertia ), 24. / 12. * np.array( [ 25., 20., 13. ] ) )
+    assert fingerprint.faces == 6 and fingerprint.solids == 1 and fingerprint.struts == 49
+    assert restored.close( fingerprint ) and restored.key() == fingerprint.key()
+
+    restored.volume *= 1. + 1e-4
+    assert restored.differences( fingerprint ) == [ "volume" ]
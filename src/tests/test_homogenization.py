@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from latticegeometrylib.Graph import StrutGraph
+from latticegeometrylib import Homogenization
+
+
+def _simple_cubic( diameter: float = 1. ) -> StrutGraph:
+    nodes = np.array( [ [ -5., 0., 0. ], [ 5., 0., 0. ], [ 0., -5., 0. ], [ 0., 5., 0. ], [ 0., 0., -5. ],
+                        [ 0., 0., 5. ], [ 0., 0., 0. ] ] )
+    struts = np.array( [ [ 0, 6 ], [ 6, 1 ], [ 2, 6 ], [ 6, 3 ], [ 4, 6 ], [ 6, 5 ] ] )
+    return StrutGraph( nodes, struts, np.full( 6, diameter ) )
+
+
+def _body_centered( diameter: float = 1. ) -> StrutGraph:
+    corners = np.array( [ [ x, y, z ] for x in ( -5., 5. ) for y in ( -5., 5. ) for z in ( -5., 5. ) ] )
+    nodes = np.concatenate( ( corners, np.zeros( ( 1, 3 ) ) ) )
+    struts = np.stack( ( np.arange( 8 ), np.full( 8, 8 ) ), axis = 1 )
+    return StrutGraph( nodes, struts, np.full( 8, diameter ) )
+
+
+def test_simple_cubic_is_stretch_dominated():
+    tensor = Homogenization.elasticity_tensor( _simple_cubic(), ( 10., 10., 10. ), 1., .3 )
+
+    assert np.allclose( np.diag( tensor )[ :3 ], np.pi / 4. / 100. )
+    assert np.allclose( tensor[ :3, :3 ] - np.diag( np.diag( tensor )[ :3 ] ), 0., atol = 1e-12 )
+
+
+@pytest.mark.parametrize( "theory", [ "euler", "timoshenko" ] )
+def test_body_centered_has_cubic_symmetry( theory: str ):
+    tensor = Homogenization.elasticity_tensor( _body_centered(), ( 10., 10., 10. ), 1., .3, theory )
+    diagonal = np.diag( tensor )
+
+    assert np.allclose( tensor, tensor.T, atol = 1e-12 )
+    assert np.all( np.linalg.eigvalsh( tensor ) > 0. )
+    assert np.allclose( diagonal[ :3 ], diagonal[ 0 ] ) and np.allclose( diagonal[ 3: ], diagonal[ 3 ] )
+    assert np.allclose( Homogenization.moduli( tensor )[ "youngs" ], Homogenization.moduli( tensor )[ "youngs" ][ 0 ] )
+
+
+def test_sweep_matches_single_cells():
+    graph = _simple_cubic()
+    results = Homogenization.sweep( graph, ( 10., 10., 10. ), ( .5, 1. ), ( 1., 2. ) )
+
+    assert len( results ) == 4
+    for result in results:
+        scale = result[ "size" ][ 0 ] / 10.
+        scaled = StrutGraph( graph.nodes * scale, graph.struts, np.full( len( graph ), result[ "diameter" ] ) )
+        single = Homogenization.elasticity_tensor( scaled, result[ "size" ] )
+        assert np.allclose( result[ "tensor" ], single )
+        expected = 3. * np.pi / 4. * result[ "diameter" ] ** 2 / result[ "size" ][ 0 ] ** 2
+        assert np.isclose( result[ "density" ], expected )
+
+
+def test_unknown_theory():
+    with pytest.raises( ValueError ):
+        Homogenization.elasticity_tensor( _simple_cubic(), ( 10., 10., 10. ), theory = "plate" )
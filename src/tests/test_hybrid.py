@@ -0,0 +1,48 @@
+import numpy as np
+from cadquery import Workplane
+from latticegeometrylib.Generator import LatticeGenerator
+from latticegeometrylib import Hybrid
+
+
+def _cubic( diameter: float ) -> list:
+    edges = ( ( 1, 2 ), ( 2, 3 ), ( 3, 4 ), ( 4, 1 ), ( 5, 6 ), ( 6, 7 ), ( 7, 8 ), ( 8, 5 ),
+              ( 1, 5 ), ( 4, 6 ), ( 3, 7 ), ( 2, 8 ) )
+    return [ [ first, second, { "diameter": diameter } ] for first, second in edges ]
+
+
+def _generator() -> LatticeGenerator:
+    generator = LatticeGenerator()
+    generator.set_initial_model( Workplane().box( 10., 10., 10. ) )
+    generator.add_region( "core", _cubic( .6 ), ( 3.3, 3.3, 3.3 ), ( True, True, True ),
+                          box = ( ( -5., -5., -5. ), ( 5., 5., .3 ) ) )
+    generator.add_region( "rest", _cubic( .4 ), ( 2.5, 2.5, 2.5 ) )
+    generator.create_lattice()
+    return generator
+
+
+def test_interface_is_connected():
+    generator = _generator()
+    graph = generator.lattice.graph
+    labels = graph.components()
+    regions = Hybrid.labels( generator.regions, graph.cells )
+
+    assert set( np.unique( regions ) ) == { 0, 1 }
+    assert len( np.unique( labels ) ) == 1
+
+
+def test_interface_ends_are_bridged():
+    graph = _generator().lattice.graph
+    degrees = np.bincount( graph.struts.reshape( -1 ), minlength = len( graph.nodes ) )
+    interface = np.abs( graph.nodes[ :, 2 ] - .3 ) < 1e-6
+
+    assert np.count_nonzero( interface ) > 0
+    assert np.all( degrees[ interface ] >= 2 )
+
+
+def test_lattice_has_space_and_cells():
+    generator = _generator()
+    lattice = generator.lattice
+
+    assert lattice.space is not None
+    assert len( lattice.cells ) == sum( len( region.lattice.cells ) for region in generator.regions )
+    assert np.all( ( lattice.graph.cells >= 0 ) & ( lattice.graph.cells < len( lattice.cells ) ) )
@@ -0,0 +1,50 @@
+import numpy as np
+from cadquery import Workplane
+from latticegeometrylib.Graph import StrutGraph
+from latticegeometrylib.Mesh import TriangleMesh
+from latticegeometrylib import Mass
+
+
+def test_single_cylinder():
+    volume, area, centroid, covered = Mass.union( np.array( [ [ 1., 2., -5. ] ] ), np.array( [ [ 1., 2., 5. ] ] ),
+                                                  np.array( [ .5 ] ) )
+
+    assert np.isclose( volume, np.pi * .25 * 10. )
+    assert np.isclose( area, 2. * np.pi * .5 * 10. + 2. * np.pi * .25 )
+    assert np.allclose( centroid, [ 1., 2., 0. ] ) and covered == 0.
+
+
+def test_crossing_cylinders():
+    radius, length = .5, 10.
+    starts = np.array( [ [ 0., 0., -5. ], [ -5., 0., 0. ] ] )
+    ends = np.array( [ [ 0., 0., 5. ], [ 5., 0., 0. ] ] )
+    volume, area, centroid, _ = Mass.union( starts, ends, np.full( 2, radius ) )
+
+    # Überschneidung nach Steinmetz mit Volumen 16 r³ / 3 und Mantelfläche 8 r² je Zylinder
+    single = 2. * np.pi * radius * length + 2. * np.pi * radius ** 2
+    assert np.isclose( volume, 2. * np.pi * radius ** 2 * length - 16. / 3. * radius ** 3, rtol = 1e-2 )
+    assert np.isclose( area, 2. * single - 16. * radius ** 2, rtol = 1e-2 )
+    assert np.allclose( centroid, 0., atol = 1e-2 )
+
+
+def test_cylinder_half_in_solid():
+    solid = TriangleMesh.from_workplane( Workplane().box( 20., 20., 10. ).translate( ( 0., 0., 5. ) ) )
+    volume, area, centroid, covered = Mass.union( np.array( [ [ 0., 3., -5. ] ] ), np.array( [ [ 0., 3., 5. ] ] ),
+                                                  np.array( [ .5 ] ), solid )
+
+    assert np.isclose( volume, np.pi * .25 * 5. )
+    assert np.isclose( area, 2. * np.pi * .5 * 5. + np.pi * .25 )
+    assert np.isclose( covered, np.pi * .25 )
+    assert np.isclose( centroid[ 2 ], -2.5 )
+
+
+def test_struts_follow_clipped_ends():
+    graph = StrutGraph( np.array( [ [ 0., 0., 0. ], [ 0., 0., 5. ], [ 0., 0., 0. ], [ 5., 0., 5. ] ] ),
+                        np.array( [ [ 0, 1 ], [ 2, 3 ] ] ), np.full( 2, 1. ),
+                        trimmed = np.array( [ [ False, True ], [ False, True ] ] ) )
+    mesh = TriangleMesh.from_workplane( Workplane().box( 20., 20., 10. ) )
+
+    lengths = Mass.struts( graph, mesh = mesh ).lengths()
+    assert np.allclose( lengths, [ 5., 5. * np.sqrt( 2. ) - .5 ] )
+    assert np.allclose( Mass.struts( graph ).lengths(), [ 4.5, 5. * np.sqrt( 2. ) - .5 ] )
+    assert np.allclose( Mass.struts( graph, False ).lengths(), [ 5., 5. * np.sqrt( 2. ) ] )
@@ -0,0 +1,58 @@
+import numpy as np
+from cadquery import Workplane
+from latticegeometrylib.Generator import LatticeGenerator
+from latticegeometrylib.Mesh import TriangleMesh
+
+
+def _box() -> TriangleMesh:
+    return TriangleMesh.from_workplane( Workplane().box( 10., 10., 10. ) )
+
+
+def test_empty_queries():
+    mesh = _box()
+    empty = np.zeros( ( 0, 3 ) )
+
+    assert mesh.contains( empty ).shape == ( 0, )
+    assert mesh.distance( empty ).shape == ( 0, )
+    assert mesh.signed_distance( empty ).shape == ( 0, )
+    for found in mesh.hierarchy.segments( empty, empty ) + mesh.hierarchy.boxes( empty, empty ):
+        assert found.dtype == np.int64 and len( found ) == 0
+
+
+def test_queries_without_hits():
+    mesh = _box()
+    far = np.array( [ [ 100., 100., 100. ] ] )
+
+    segment, triangle = mesh.hierarchy.boxes( far, far + 1. )
+    assert len( segment ) == 0 and len( triangle ) == 0
+    assert not mesh.contains( far )[ 0 ]
+
+
+def test_contains_grid():
+    # Gitterpunkte liegen in den Ebenen der Kanten und Diagonalen der Seitenflächen
+    mesh = _box()
+    axis = np.linspace( -6., 6., 25 )
+    points = np.stack( np.meshgrid( axis, axis, axis, indexing = 'ij' ), axis = -1 ).reshape( -1, 3 )
+    inside = np.all( np.abs( points ) < 5. - 1e-9, axis = 1 )
+    outside = np.any( np.abs( points ) > 5. + 1e-9, axis = 1 )
+    contained = mesh.contains( points )
+
+    assert np.all( contained[ inside ] )
+    assert not np.any( contained[ outside ] )
+
+
+def test_signed_distance():
+    mesh = _box()
+    points = np.array( [ [ 0., 0., 0. ], [ 0., 0., 7. ], [ 4., 4., 4. ], [ 6., 6., 5. ] ] )
+
+    assert np.allclose( mesh.signed_distance( points ), [ -5., 2., -1., np.sqrt( 2. ) ] )
+
+
+def test_preview_with_mesh_keeps_all_boundary_cells():
+    generator = LatticeGenerator()
+    generator.set_initial_model( Workplane().box( 150., 150., 150. ) )
+    generator.init_unitary_cell( ( 5., 5., 5. ), ( True, True, True ) )
+    generator.add_entities( [ [ 1, 7, { "diameter": .5 } ], [ 2, 6, { "diameter": .5 } ] ] )
+    preview = generator.preview( clip = "mesh" )
+
+    assert len( preview.centers ) == 30 ** 3
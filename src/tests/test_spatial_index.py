@@ -0,0 +1,66 @@
+import numpy as np
+from latticegeometrylib.Mesh import segment_point_distances, segment_segment_distances
+from latticegeometrylib.SpatialIndex import SpatialIndex
+
+
+def _struts( count: int = 2000 ) -> tuple[ np.ndarray, np.ndarray ]:
+    generator = np.random.default_rng( 0 )
+    starts = generator.uniform( -20., 20., ( count, 3 ) )
+    return starts, starts + generator.normal( 0., 2., ( count, 3 ) )
+
+
+def _index() -> SpatialIndex:
+    starts, ends = _struts()
+    index = SpatialIndex( 2. )
+    index.insert( starts, ends, .25 )
+    return index
+
+
+def test_sphere_matches_brute_force():
+    starts, ends = _struts()
+    center = np.array( [ 1., -2., 3. ] )
+    distances = segment_point_distances( starts, ends, np.broadcast_to( center, starts.shape ) )
+
+    assert np.array_equal( np.sort( _index().sphere( center, 4. ) ), np.flatnonzero( distances <= 4.25 ) )
+
+
+def test_segment_matches_brute_force():
+    starts, ends = _struts()
+    start, end = np.array( [ -10., 0., 0. ] ), np.array( [ 10., 5., 0. ] )
+    distances = segment_segment_distances( starts, ends, np.broadcast_to( start, starts.shape ),
+                                           np.broadcast_to( end, starts.shape ) )
+
+    assert np.array_equal( np.sort( _index().segment( start, end, .5 ) ), np.flatnonzero( distances <= .75 ) )
+
+
+def test_nearest_far_away():
+    starts, ends = _struts()
+    index = _index()
+    for point in ( [ 0., 0., 0. ], [ 400., 0., 0. ], [ 400., -400., 400. ] ):
+        point = np.array( point )
+        distances = segment_point_distances( starts, ends, np.broadcast_to( point, starts.shape ) ) - .25
+        found, nearest = index.nearest( point, 3 )
+
+        assert np.allclose( nearest, np.sort( distances )[ :3 ] )
+        assert np.allclose( distances[ found ], nearest )
+
+
+def test_remove_and_update():
+    index = _index()
+    found = index.sphere( ( 0., 0., 0. ), 3. )
+    index.remove( found[ :1 ] )
+    moved = index.update( found[ 1: ], np.full( ( len( found ) - 1, 3 ), 100. ),
+                          np.full( ( len( found ) - 1, 3 ), 101. ), .25 )
+
+    assert len( index.sphere( ( 0., 0., 0. ), 3. ) ) == 0
+    assert np.array_equal( np.sort( index.box( ( 99., 99., 99. ), ( 102., 102., 102. ) ) ), moved )
+
+
+def test_arrays_round_trip():
+    index = _index()
+    index.remove( [ 0, 1, 2 ] )
+    restored = SpatialIndex.from_arrays( index.arrays() )
+
+    assert len( restored ) == len( index )
+    lower, upper = ( -5., -5., -5. ), ( 5., 5., 5. )
+    assert np.array_equal( restored.box( lower, upper ), index.box( lower, upper ) )